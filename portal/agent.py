@@ -1,26 +1,51 @@
 """
 nano ISAAC - AI Chat Agent for querying the ISAAC database.
 
-ReAct-style loop: user question -> LLM generates SQL -> execute read-only
--> feed results back to LLM -> LLM summarises -> user.
+ReAct-style loop: user question -> LLM calls a query tool (agent_tools.py)
+or generates SQL -> execute read-only -> feed results back to LLM -> LLM
+summarises -> user.
+
+Replies are streamed: run_agent_turn_stream() yields tokens as they arrive
+and starts each ```sql / ```tool block on the query pool as soon as its
+closing fence is seen, while the rest of the reply is still streaming.
 """
 
 import json
 import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 
 import requests as http_requests
 
+import agent_tools
 import database
 import ontology
+import query_cache
 
 # Stanford AI API Gateway (same config as ontology.py)
-LLM_API_URL = "https://aiapi-prod.stanford.edu/v1/chat/completions"
+LLM_API_URL = os.environ.get("ISAAC_LLM_API_URL", "https://aiapi-prod.stanford.edu/v1/chat/completions")
 LLM_MODEL = "gemini-2.5-pro"
 
 MAX_TOOL_ROUNDS = 3
 RESULT_TRUNCATION_BYTES = 8192
 
+# Request size bounds. The system prompt lists every vocabulary category but
+# only inlines short value lists; the full lists of the categories a question
+# mentions are attached per turn. Older query results are summarised, then
+# whole turns dropped, to keep the history within the token budget.
+VOCAB_INLINE_VALUES = 8
+MAX_RELEVANT_CATEGORIES = 6
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("ISAAC_AGENT_CONTEXT_TOKENS", 12000))
+
+# SQL blocks from one LLM reply run concurrently on this many connections,
+# each under its own statement timeout, all within the round's budget. Each
+# round gets its own pool, so one chat's slow queries never queue another
+# chat's blocks against that chat's budget.
+SQL_WORKERS = int(os.environ.get("ISAAC_AGENT_SQL_WORKERS", 4))
+QUERY_TIMEOUT_MS = int(os.environ.get("ISAAC_AGENT_QUERY_TIMEOUT_MS", 5000))
+ROUND_BUDGET_SECONDS = float(os.environ.get("ISAAC_AGENT_ROUND_BUDGET", 15))
+
 SYSTEM_PROMPT = """\
 You are **nano ISAAC**, a helpful AI assistant for querying the ISAAC \
 AI-Ready Record database. You answer researchers' questions about the \
@@ -83,38 +108,50 @@ FROM records,
      jsonb_array_elements(s->'channels') AS ch;
 ```
 
+## Query tools (preferred)
+
+For the common questions below, call a tool instead of writing SQL. Tools \
+run on indexed, precomputed paths and are much faster than JSONB scans. \
+Write one JSON object per ```tool fenced code block:
+
+```tool
+{"tool": "facet_counts", "args": {"facet": "system.technique"}}
+```
+
+{tool_block}
+
 ## ISAAC Living Ontology (Controlled Vocabulary)
 
 The vocabulary below is synced from the ISAAC GitHub wiki. It defines every \
 controlled field, its description, and all allowed values. Use this to \
 understand the scientific meaning of fields and to write correct queries \
 (e.g., filtering by exact vocabulary terms). The vocabulary is organised by \
-section > category > allowed values.
+section > category > allowed values. Long value lists are abbreviated here; \
+the full lists for the categories a question mentions are given in a \
+separate system message.
 
 {vocabulary_block}
 
 ## Rules
 
-1. When you need data from the database, write SQL inside a ```sql fenced \
-code block. The system will execute it and show you the results.
-2. You may make up to 3 SQL queries per user question.
+1. When you need data from the database, call a tool in a ```tool block, or \
+write SQL inside a ```sql fenced code block when no tool fits. The system \
+will execute it and show you the results.
+2. You may make up to 3 rounds of tool calls / SQL queries per user question.
 3. Only SELECT / WITH (CTE) queries are allowed. No mutations.
 4. Keep queries efficient. Use LIMIT when exploring.
-5. After receiving query results, summarise them clearly for the researcher.
+5. After receiving query results, summarise them clearly for the researcher. \
+If a query is rejected as too expensive, rewrite it to touch fewer rows \
+(filter first, avoid cross joins of JSONB arrays) instead of retrying it.
 6. If a question cannot be answered from the database, say so.
 7. Always be concise and scientifically precise.
 8. Use vocabulary knowledge to interpret results and suggest follow-up queries.
 """
 
 
-def _extract_sql_blocks(text: str) -> list[str]:
-    """Extract all ```sql ... ``` fenced code blocks from LLM output."""
-    return re.findall(r"```sql\s*\n(.*?)```", text, re.DOTALL)
-
-
 def _call_llm(messages: list[dict]) -> str:
     """
-    Call the Stanford AI API Gateway.
+    Call the Stanford AI API Gateway and return the whole reply.
 
     Args:
         messages: OpenAI-compatible message list
@@ -122,6 +159,17 @@ def _call_llm(messages: list[dict]) -> str:
     Returns:
         The assistant's response text
 
+    Raises:
+        RuntimeError: If the API call fails
+    """
+    return "".join(_stream_llm(messages))
+
+
+def _stream_llm(messages: list[dict]):
+    """
+    Call the gateway with "stream": true and yield content deltas as they
+    arrive (OpenAI-compatible server-sent events).
+
     Raises:
         RuntimeError: If the API call fails
     """
@@ -129,26 +177,59 @@ def _call_llm(messages: list[dict]) -> str:
     if not api_key:
         raise RuntimeError("ISAAC_LLM_API_KEY not configured")
 
-    resp = http_requests.post(
+    with http_requests.post(
         LLM_API_URL,
         headers={
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
+            "Accept": "text/event-stream",
         },
         json={
             "model": LLM_MODEL,
-            "stream": False,
+            "stream": True,
             "temperature": 0.2,
             "messages": messages,
         },
-        timeout=60,
-    )
+        stream=True,
+        timeout=(10, 60),  # connect, then max wait between chunks
+    ) as resp:
+        if resp.status_code != 200:
+            raise RuntimeError(f"LLM API returned {resp.status_code}: {resp.text[:300]}")
+
+        for line in resp.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            payload = line[5:].strip()
+            if payload == "[DONE]":
+                return
+            try:
+                choice = json.loads(payload)["choices"][0]
+            except (ValueError, KeyError, IndexError):
+                continue
+            delta = (choice.get("delta") or choice.get("message") or {}).get("content")
+            if delta:
+                yield delta
+
 
-    if resp.status_code != 200:
-        raise RuntimeError(f"LLM API returned {resp.status_code}: {resp.text[:300]}")
+class _FenceScanner:
+    """Finds complete ```sql and ```tool blocks in a reply that is still arriving."""
 
-    data = resp.json()
-    return data["choices"][0]["message"]["content"]
+    _FENCE = re.compile(r"```(sql|tool)\s*\n(.*?)```", re.DOTALL)
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+
+    def feed(self, delta: str) -> list[tuple[str, str]]:
+        """Append *delta*; return (kind, body) for blocks whose closing fence just arrived."""
+        self._text += delta
+        blocks = []
+        while True:
+            match = self._FENCE.search(self._text, self._pos)
+            if match is None:
+                return blocks
+            blocks.append((match.group(1), match.group(2).strip()))
+            self._pos = match.end()
 
 
 def _format_query_results(rows: list[dict], sql: str) -> str:
@@ -177,76 +258,349 @@ def _format_query_results(rows: list[dict], sql: str) -> str:
     return "\n".join(lines)
 
 
-def _build_vocabulary_block() -> str:
+def _run_sql(sql: str, deadline: float) -> tuple[str, int]:
+    """
+    Execute one block with whatever is left of the round budget.
+
+    Returns:
+        (result text for the LLM, rows returned or None on error)
+    """
+    remaining_ms = int((deadline - time.monotonic()) * 1000)
+    if remaining_ms <= 0:
+        return f"Query error:\n{sql}\n\nError: round time budget exhausted before the query started", None
+    try:
+        rows = query_cache.execute(sql, timeout_ms=min(QUERY_TIMEOUT_MS, remaining_ms))
+        return _format_query_results(rows, sql), len(rows)
+    except database.QueryCostError as exc:
+        # Structured so the model can see why and write a cheaper query
+        return (f"Query rejected (too expensive, not executed):\n{sql}\n\n"
+                f"Plan estimate: {json.dumps(exc.details)}\n\n{exc}"), None
+    except Exception as exc:
+        return f"Query error:\n{sql}\n\nError: {exc}", None
+
+
+def _run_tool(spec: str, deadline: float) -> tuple[str, int]:
+    """
+    Run one ```tool call.
+
+    Returns:
+        (result text for the LLM, result items or None on error)
     """
-    Load the living ontology from the wiki-synced vocabulary cache and
-    format it as a compact text block for the system prompt.
+    if deadline - time.monotonic() <= 0:
+        return f"Tool error:\n{spec}\n\nError: round time budget exhausted before the tool started", None
+    try:
+        name, args = agent_tools.parse(spec)
+        result = agent_tools.run(name, args)
+    except Exception as exc:
+        return f"Tool error:\n{spec}\n\nError: {exc}", None
+
+    header = f"Tool: {name} {json.dumps(args, default=str)}\n\nResult:\n"
+    body = json.dumps(result, default=str)
+    budget = RESULT_TRUNCATION_BYTES - len(header)
+    if len(body) > budget:
+        body = body[:budget] + f"... truncated ({len(body) - budget} more bytes)"
+    return header + body, len(result) if isinstance(result, list) else 1
+
+
+def _run_block(kind: str, body: str, deadline: float) -> tuple[str, dict]:
+    """Run a ```sql or ```tool block; return (result text, timing/size stats)."""
+    start = time.perf_counter()
+    text, rows = (_run_tool if kind == "tool" else _run_sql)(body, deadline)
+    return text, {
+        "kind": kind,
+        "seconds": time.perf_counter() - start,
+        "rows": rows,
+        "truncated": "... truncated (" in text,
+        "error": rows is None,
+        "detail": text.strip().splitlines()[-1][:300] if rows is None else None,
+    }
+
+
+def _collect_block_results(blocks: list[tuple[str, str]], futures: list,
+                           deadline: float) -> tuple[list[str], list[dict]]:
     """
+    Wait for one round's blocks until *deadline*.
+
+    Returns:
+        (result texts, stats dicts), both in the original block order. A
+        block still queued or running when the round budget runs out is
+        reported as a timeout (running queries are also bounded by their
+        statement timeout).
+    """
+    wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+
+    texts, stats = [], []
+    for (kind, body), future in zip(blocks, futures):
+        if future.done():
+            text, info = future.result()
+        else:
+            future.cancel()
+            label = "Tool error" if kind == "tool" else "Query error"
+            text = (f"{label}:\n{body}\n\nError: exceeded the "
+                    f"{ROUND_BUDGET_SECONDS:g}s time budget for this round")
+            info = {"kind": kind, "seconds": None, "rows": None,
+                    "truncated": False, "error": True, "timed_out": True,
+                    "detail": text.splitlines()[-1]}
+        texts.append(text)
+        stats.append(info)
+    return texts, stats
+
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# (vocabulary version, compact block, {word: {category keys}}, {category: full entry})
+_vocab_prompt_cache = (None, None, {}, {})
+
+
+def _vocabulary_prompt_parts() -> tuple:
+    """
+    Compact vocabulary block for the system prompt, plus the word index and
+    full per-category entries used by _relevant_vocabulary(). Cached per
+    ontology.get_vocabulary_version().
+    """
+    global _vocab_prompt_cache
+    vocab_version = ontology.get_vocabulary_version()
+    cached_for, block, words, entries = _vocab_prompt_cache
+    if cached_for == vocab_version and block is not None:
+        return block, words, entries
+
     try:
         vocab = ontology.load_vocabulary()
     except Exception:
         vocab = {}
 
     if not vocab:
-        return "(Vocabulary not available — answer based on raw database values.)"
+        # Not cached: the next turn retries the load
+        return "(Vocabulary not available — answer based on raw database values.)", {}, {}
 
     lines = []
+    words = {}
+    entries = {}
     for section, categories in vocab.items():
         lines.append(f"### {section}")
         for cat_key, cat_data in categories.items():
+            if not isinstance(cat_data, dict):
+                continue
             desc = cat_data.get("description", "")
             values = cat_data.get("values", [])
-            values_str = ", ".join(values) if values else "(no values)"
-            lines.append(f"- **{cat_key}**: {desc}")
-            lines.append(f"  Values: [{values_str}]")
-    return "\n".join(lines)
+            if len(values) <= VOCAB_INLINE_VALUES:
+                values_str = f"[{', '.join(values)}]" if values else "(no values)"
+            else:
+                values_str = f"{len(values)} values, e.g. {', '.join(values[:3])}, …"
+            short = desc.split(". ", 1)[0].rstrip(".")
+            if len(short) > 120:
+                short = short[:117] + "…"
+            lines.append(f"- **{cat_key}**: {short}. Values: {values_str}")
+
+            entries[cat_key] = (f"- **{cat_key}**: {desc}\n"
+                                f"  Values: [{', '.join(values) if values else '(no values)'}]")
+            for text in (cat_key, *values):
+                for word in _WORD.findall(str(text).lower()):
+                    if len(word) >= 3:
+                        words.setdefault(word, set()).add(cat_key)
+
+    block = "\n".join(lines)
+    _vocab_prompt_cache = (vocab_version, block, words, entries)
+    return block, words, entries
+
+
+def _build_vocabulary_block() -> str:
+    """
+    Compact vocabulary block for the system prompt (cached per vocabulary):
+    every category with the first sentence of its description, full value
+    lists only when short.
+    """
+    return _vocabulary_prompt_parts()[0]
+
+
+def _relevant_vocabulary(question: str) -> str:
+    """
+    Full value lists of the categories *question* mentions (by category key
+    words or allowed values), best matches first; "" if none.
+    """
+    _block, words, entries = _vocabulary_prompt_parts()
+    scores = {}
+    for word in set(_WORD.findall(question.lower())):
+        for cat_key in words.get(word, ()):
+            scores[cat_key] = scores.get(cat_key, 0) + 1
+    if not scores:
+        return ""
+    ranked = sorted(scores, key=lambda k: (-scores[k], k))[:MAX_RELEVANT_CATEGORIES]
+    return ("Vocabulary categories relevant to this question (full allowed values):\n"
+            + "\n".join(entries[k] for k in ranked))
 
 
 def build_initial_messages() -> list[dict]:
     """Create the initial conversation with the system prompt + live vocabulary."""
     vocab_block = _build_vocabulary_block()
-    prompt = SYSTEM_PROMPT.replace("{vocabulary_block}", vocab_block)
+    prompt = (SYSTEM_PROMPT.replace("{tool_block}", agent_tools.describe())
+              .replace("{vocabulary_block}", vocab_block))
     return [{"role": "system", "content": prompt}]
 
 
-def run_agent_turn(conversation_history: list[dict]) -> tuple[str, list[dict]]:
+# Fed-back results start with one of these (see _run_sql / _run_tool), or
+# with _SUMMARY_MARK once _fit_history has summarised them
+_SUMMARY_MARK = "[Earlier results, rows omitted]"
+_RESULT_PREFIXES = ("Query:", "Query error:", "Query rejected", "Tool:", "Tool error:",
+                    _SUMMARY_MARK)
+
+
+def _estimate_tokens(messages: list[dict]) -> int:
+    """Rough token count (about 4 characters per token, plus per-message overhead)."""
+    return sum(len(m.get("content") or "") // 4 + 4 for m in messages)
+
+
+def _is_result(message: dict) -> bool:
+    return message["role"] == "user" and (message.get("content") or "").startswith(_RESULT_PREFIXES)
+
+
+def _summarize_results(content: str) -> str:
+    """Keep each fed-back block's query / tool call and row count, drop the rows."""
+    kept = []
+    for block in content.split("\n\n---\n\n"):
+        head = block.split("\n\n", 1)[0]
+        counts = re.search(r"^Results \((\d+) rows?\)", block, re.MULTILINE)
+        kept.append(head + (f"\n({counts.group(1)} rows)" if counts else ""))
+    return _SUMMARY_MARK + "\n" + "\n\n".join(kept)
+
+
+def _fit_history(messages: list[dict], budget: int = None) -> list[dict]:
     """
-    Run one agent turn: call LLM, extract SQL, execute, feed back.
+    Bound a conversation to *budget* estimated tokens (default
+    CONTEXT_TOKEN_BUDGET).
 
-    Implements a ReAct loop with up to MAX_TOOL_ROUNDS iterations.
+    The system prompt and the current turn (from the latest question on)
+    are never touched. Older fed-back results are first replaced by
+    summaries, oldest first; if that is not enough, whole earlier turns
+    are dropped, oldest first.
+    """
+    budget = CONTEXT_TOKEN_BUDGET if budget is None else budget
+    if _estimate_tokens(messages) <= budget:
+        return messages
+
+    head = [m for m in messages[:1] if m["role"] == "system"]
+    body = messages[len(head):]
+    current = len(body)
+    for i in range(len(body) - 1, -1, -1):
+        if body[i]["role"] == "user" and not _is_result(body[i]):
+            current = i
+            break
+    earlier, turn = list(body[:current]), body[current:]
 
-    Args:
-        conversation_history: Full message list (system + user + assistant messages)
+    for i, message in enumerate(earlier):
+        if _estimate_tokens(head + earlier + turn) <= budget:
+            break
+        if _is_result(message) and not message["content"].startswith(_SUMMARY_MARK):
+            earlier[i] = {"role": "user", "content": _summarize_results(message["content"])}
 
-    Returns:
-        (final_assistant_text, updated_conversation_history)
+    while earlier and _estimate_tokens(head + earlier + turn) > budget:
+        # Drop the oldest turn: its question and everything up to the next one
+        end = 1
+        while end < len(earlier) and (earlier[end]["role"] != "user" or _is_result(earlier[end])):
+            end += 1
+        del earlier[:end]
+
+    return head + earlier + turn
+
+
+def _request_messages(messages: list[dict], relevant: str) -> list[dict]:
+    """Messages actually sent: history plus this turn's relevant vocabulary note."""
+    if not relevant or not messages or messages[0]["role"] != "system":
+        return messages
+    return [messages[0], {"role": "system", "content": relevant}, *messages[1:]]
+
+
+def run_agent_turn_stream(conversation_history: list[dict]):
     """
-    messages = list(conversation_history)
+    Run one agent turn, streaming.
 
-    for _round in range(MAX_TOOL_ROUNDS):
-        assistant_text = _call_llm(messages)
-        messages.append({"role": "assistant", "content": assistant_text})
+    Implements a ReAct loop with up to MAX_TOOL_ROUNDS rounds of tool calls
+    / SQL, then one final summarising call. Blocks run concurrently on the
+    round's own pool (SQL_WORKERS), each one starting as soon as its
+    closing fence has streamed in; the round's time budget starts with its
+    first block.
 
-        sql_blocks = _extract_sql_blocks(assistant_text)
-        if not sql_blocks:
-            # No SQL to execute — the LLM is done
-            return assistant_text, messages
+    Args:
+        conversation_history: Full message list (system + user + assistant messages)
 
-        # Execute each SQL block and feed results back
-        tool_results = []
-        for sql in sql_blocks:
-            try:
-                rows = database.execute_readonly_query(sql.strip())
-                result_text = _format_query_results(rows, sql.strip())
-            except (ValueError, Exception) as exc:
-                result_text = f"Query error:\n{sql}\n\nError: {exc}"
-            tool_results.append(result_text)
+    Yields:
+        Event dicts:
+          {"type": "round", "index": n}       a new LLM reply begins
+          {"type": "token", "text": str}      reply text as it arrives
+          {"type": "query", "sql": str}       a query was started
+          {"type": "tool", "call": str}       a tool call was started
+          {"type": "results", "count": n, "blocks": [...]}
+                                              the round's queries finished;
+                                              per block: kind, seconds, rows,
+                                              truncated, error (+ detail)
+          {"type": "done", "reply": str, "messages": [...]}   last event
+    """
+    messages = _fit_history(list(conversation_history))
+    question = next((m["content"] for m in reversed(messages)
+                     if m["role"] == "user" and not _is_result(m)), "")
+    relevant = _relevant_vocabulary(question)
+
+    for round_index in range(MAX_TOOL_ROUNDS + 1):
+        final = round_index == MAX_TOOL_ROUNDS
+        yield {"type": "round", "index": round_index}
+        if round_index:
+            messages = _fit_history(messages)
+
+        scanner = _FenceScanner()
+        parts, blocks, futures = [], [], []
+        deadline = None
+        pool = None
+        try:
+            for delta in _stream_llm(_request_messages(messages, relevant)):
+                parts.append(delta)
+                yield {"type": "token", "text": delta}
+                if final:
+                    continue
+                for kind, body in scanner.feed(delta):
+                    if deadline is None:
+                        deadline = time.monotonic() + ROUND_BUDGET_SECONDS
+                        pool = ThreadPoolExecutor(max_workers=SQL_WORKERS,
+                                                  thread_name_prefix="isaac-agent-sql")
+                    blocks.append((kind, body))
+                    futures.append(pool.submit(_run_block, kind, body, deadline))
+                    if kind == "tool":
+                        yield {"type": "tool", "call": body}
+                    else:
+                        yield {"type": "query", "sql": body}
+
+            assistant_text = "".join(parts)
+            messages.append({"role": "assistant", "content": assistant_text})
+
+            if not futures:
+                # No SQL to execute (or rounds exhausted) — the LLM is done
+                yield {"type": "done", "reply": assistant_text, "messages": messages}
+                return
+
+            tool_results, block_stats = _collect_block_results(blocks, futures, deadline)
+        finally:
+            if pool is not None:
+                # Blocks past the budget are abandoned; running queries end
+                # at their statement timeout
+                pool.shutdown(wait=False, cancel_futures=True)
+        yield {"type": "results", "count": len(tool_results), "blocks": block_stats}
 
         # Feed results back as a user message (tool-result pattern)
         feedback = "\n\n---\n\n".join(tool_results)
         messages.append({"role": "user", "content": feedback})
 
-    # If we exhausted rounds, do one final LLM call to summarise
-    assistant_text = _call_llm(messages)
-    messages.append({"role": "assistant", "content": assistant_text})
-    return assistant_text, messages
+
+def run_agent_turn(conversation_history: list[dict]) -> tuple[str, list[dict]]:
+    """
+    Run one agent turn to completion (non-streaming wrapper around
+    run_agent_turn_stream()).
+
+    Args:
+        conversation_history: Full message list (system + user + assistant messages)
+
+    Returns:
+        (final_assistant_text, updated_conversation_history)
+    """
+    for event in run_agent_turn_stream(conversation_history):
+        if event["type"] == "done":
+            return event["reply"], event["messages"]
+    raise RuntimeError("Agent turn ended without a reply")
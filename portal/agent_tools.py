@@ -0,0 +1,124 @@
+"""
+nano ISAAC - structured query tools.
+
+Function-style alternatives to raw SQL for the questions researchers ask
+most. The LLM writes a ```tool fenced JSON object naming a tool and its
+arguments; the agent runs it here against precomputed / indexed paths in
+database.py instead of ad-hoc JSONB scans:
+
+    search_records   records columns, record_terms, GIN containment,
+                     record_descriptors
+    descriptor_stats record_descriptors (name index)
+    facet_counts     record_stats / vocabulary_term_usage / descriptor_usage
+    follow_links     primary key lookup + GIN containment on links[]
+    overview         record_rollups / record_rollup_descriptors (precomputed
+                     per material, technique, facility and reaction)
+"""
+
+import json
+
+import database
+
+MAX_SEARCH_LIMIT = 50
+
+TOOLS = {
+    "search_records": {
+        "args": '{"record_type"?, "record_domain"?, "terms"?: {"<category>": "<term>"}, '
+                '"material"?: "<exact sample.material.name>", "descriptor"?: "<name or class.>", '
+                '"created_after"?, "created_before"?, "limit"?: <=50}',
+        "description": "Records matching all given filters, newest first "
+                       "(record_id, type, domain, material, technique, created_at).",
+    },
+    "descriptor_stats": {
+        "args": '{"name": "<descriptor name, or class prefix ending in a dot>"}',
+        "description": "Count, record count, min, max, mean and median of a "
+                       "descriptor's numeric values across all records, per unit.",
+    },
+    "facet_counts": {
+        "args": '{"facet": "record_type" | "record_domain" | "descriptor" | "<vocabulary category>", '
+                '"limit"?: <=50}',
+        "description": "Number of records per value of a field, most frequent first.",
+    },
+    "overview": {
+        "args": '{"dimension": "material" | "technique" | "facility" | "reaction", '
+                '"key"?: "<one value>", "limit"?: <=50}',
+        "description": "Precomputed per-value summary: record count, counts per domain, "
+                       "first/last record time and count/mean/stddev/min/max of the "
+                       "most reported descriptors. Use first for overview questions.",
+    },
+    "follow_links": {
+        "args": '{"record_id": "<ULID>"}',
+        "description": "The record's outgoing links and the records linking to it, "
+                       "with rel, basis and a summary of each linked record.",
+    },
+}
+
+
+def describe() -> str:
+    """Tool reference for the system prompt."""
+    return "\n".join(
+        f"- `{name}` {spec['args']}\n  {spec['description']}"
+        for name, spec in TOOLS.items()
+    )
+
+
+def parse(spec: str) -> tuple:
+    """
+    Parse a ```tool block body into (name, args).
+
+    Raises:
+        ValueError: If the body is not {"tool": <known name>, "args": {...}}
+    """
+    try:
+        call = json.loads(spec)
+    except ValueError as exc:
+        raise ValueError(f"Tool call is not valid JSON: {exc}")
+    if not isinstance(call, dict) or call.get("tool") not in TOOLS:
+        raise ValueError(f"Unknown tool; available: {', '.join(TOOLS)}")
+    args = call.get("args") or {}
+    if not isinstance(args, dict):
+        raise ValueError("Tool 'args' must be an object")
+    return call["tool"], args
+
+
+def _limit(args: dict) -> int:
+    try:
+        return max(1, min(int(args.get("limit", 20)), MAX_SEARCH_LIMIT))
+    except (TypeError, ValueError):
+        raise ValueError("'limit' must be an integer")
+
+
+def run(name: str, args: dict):
+    """
+    Execute tool *name* with *args*.
+
+    Returns:
+        JSON-serialisable result (list or dict)
+
+    Raises:
+        ValueError: On missing or invalid arguments
+    """
+    if name == "search_records":
+        filters = {k: v for k, v in args.items() if k != "limit"}
+        if not isinstance(filters.get("terms") or {}, dict):
+            raise ValueError("'terms' must be an object of {category: term}")
+        return database.search_records(filters, limit=_limit(args))
+    if name == "descriptor_stats":
+        if not args.get("name"):
+            raise ValueError("descriptor_stats needs 'name'")
+        return database.get_descriptor_stats(str(args["name"]))
+    if name == "facet_counts":
+        if not args.get("facet"):
+            raise ValueError("facet_counts needs 'facet'")
+        return database.get_facet_counts(str(args["facet"]), limit=_limit(args))
+    if name == "overview":
+        if args.get("dimension") not in database.ROLLUP_DIMENSIONS:
+            raise ValueError(f"overview needs 'dimension', one of {', '.join(database.ROLLUP_DIMENSIONS)}")
+        key = args.get("key")
+        return database.get_rollups(args["dimension"], key=str(key) if key else None,
+                                    limit=_limit(args), descriptors=5 if key else 3)
+    if name == "follow_links":
+        if not args.get("record_id"):
+            raise ValueError("follow_links needs 'record_id'")
+        return database.get_record_links(str(args["record_id"]).strip())
+    raise ValueError(f"Unknown tool '{name}'")
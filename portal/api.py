@@ -18,8 +18,7 @@ import logging
 import functools
 from pathlib import Path
 
-import requests as http_requests
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
 from jsonschema import Draft202012Validator
 
@@ -31,8 +30,14 @@ _portal_dir = Path(__file__).resolve().parent
 if str(_portal_dir) not in sys.path:
     sys.path.insert(0, str(_portal_dir))
 
+import audit  # noqa: E402
+import bootstrap  # noqa: E402
 import database  # noqa: E402  (same import style as app.py)
+import metrics  # noqa: E402
 import ontology  # noqa: E402
+import revalidation  # noqa: E402
+import rollups  # noqa: E402
+import sync_worker  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # Flask app setup
@@ -58,17 +63,57 @@ ALLOWED_GROUPS = {"admin", "researcher"}
 ADMIN_GROUPS = {"admin"}
 
 # ---------------------------------------------------------------------------
-# Startup: ensure DB tables exist and vocabulary cache is current
+# Startup: lightweight per-worker init. Schema DDL and the vocabulary seed
+# run once per deploy under an advisory lock (see portal/bootstrap.py).
 # ---------------------------------------------------------------------------
-if database.is_db_configured():
-    database.init_tables()
-    _ok, _msg = ontology.sync_file_to_db()
-    logger.info("Vocabulary sync on import: %s — %s", _ok, _msg)
+if bootstrap.ensure_ready():
+    logger.info("Database ready (schema version %d)", database.SCHEMA_VERSION)
+    sync_worker.start()
+    revalidation.start()
+    rollups.start()
 
 # In-memory token cache: token -> {"user": str, "groups": list, "expires": float}
 _token_cache: dict = {}
 _TOKEN_CACHE_TTL = 300  # 5 minutes
 
+# ---------------------------------------------------------------------------
+# Metrics (exposed at /portal/api/metrics; see portal/metrics.py)
+# ---------------------------------------------------------------------------
+REQUEST_SECONDS = metrics.REGISTRY.histogram(
+    "isaac_api_request_seconds", "API request latency by route.", ("method", "route"),
+)
+RESPONSES = metrics.REGISTRY.counter(
+    "isaac_api_responses_total", "API responses by route and status code.",
+    ("method", "route", "status"),
+)
+IN_FLIGHT = metrics.REGISTRY.gauge(
+    "isaac_api_requests_in_flight", "API requests currently being served.",
+)
+REQUEST_BYTES = metrics.REGISTRY.histogram(
+    "isaac_api_request_bytes", "API request body size by route.", ("route",),
+    buckets=metrics.SIZE_BUCKETS,
+)
+RESPONSE_BYTES = metrics.REGISTRY.histogram(
+    "isaac_api_response_bytes", "API response body size by route.", ("route",),
+    buckets=metrics.SIZE_BUCKETS,
+)
+AUTHENTIK_SECONDS = metrics.REGISTRY.histogram(
+    "isaac_authentik_request_seconds", "Authentik token validation call latency.", ("outcome",),
+)
+TOKEN_CACHE_LOOKUPS = metrics.REGISTRY.counter(
+    "isaac_token_cache_lookups_total", "Bearer token cache lookups by result (hit/miss).",
+    ("result",),
+)
+AUDIT_BUFFER = metrics.REGISTRY.gauge(
+    "isaac_audit_buffer_events", "Audit buffer counters by buffer and state.",
+    ("buffer", "state"),
+)
+AUDIT_BUFFER.set_function(lambda: {
+    (name, state): value
+    for name, stats in audit.get_buffer_stats().items()
+    for state, value in stats.items()
+})
+
 # ---------------------------------------------------------------------------
 # Validation: delegated to the shared portal/validation.py module — the
 # single source of truth used by ALL ingestion paths (API + Streamlit UI).
@@ -99,13 +144,18 @@ def _validate_bearer_token(token: str) -> dict | None:
     # Check cache
     cached = _token_cache.get(token)
     if cached and cached["expires"] > now:
+        TOKEN_CACHE_LOOKUPS.inc(result="hit")
         return {"user": cached["user"], "groups": cached["groups"]}
+    TOKEN_CACHE_LOOKUPS.inc(result="miss")
 
     # Evict expired entries (cheap linear scan — cache is small)
     expired_keys = [k for k, v in _token_cache.items() if v["expires"] <= now]
     for k in expired_keys:
         del _token_cache[k]
 
+    import requests as http_requests  # deferred: only needed on a token-cache miss
+
+    started = time.perf_counter()
     try:
         resp = http_requests.get(
             f"{AUTHENTIK_INTERNAL_URL}/api/v3/core/users/me/",
@@ -113,8 +163,10 @@ def _validate_bearer_token(token: str) -> dict | None:
             timeout=5,
         )
     except Exception as exc:
+        AUTHENTIK_SECONDS.observe(time.perf_counter() - started, outcome="error")
         logger.error("Authentik token validation request failed: %s", exc)
         return None
+    AUTHENTIK_SECONDS.observe(time.perf_counter() - started, outcome=str(resp.status_code))
 
     if resp.status_code != 200:
         logger.info("Authentik rejected token (HTTP %d)", resp.status_code)
@@ -161,7 +213,8 @@ def _get_auth_info():
 
 
 def _log_request(auth_info):
-    """Log incoming request with auth context."""
+    """Log incoming request with auth context (also kept for the audit trail)."""
+    g.audit_auth = auth_info
     if auth_info:
         logger.info(
             "%s %s [auth=%s user=%s]",
@@ -227,6 +280,67 @@ def _require_admin(fn):
     return wrapper
 
 
+# ---------------------------------------------------------------------------
+# Audit trail: every request (except probes) is buffered by portal/audit.py
+# and written to api_audit_log in batches, off the request path.
+# ---------------------------------------------------------------------------
+_AUDIT_SKIP_PATHS = {"/portal/api/health", "/portal/api/metrics"}
+
+
+def _route_label() -> str:
+    """Route template (e.g. /portal/api/records/<record_id>) to bound label cardinality."""
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    g.in_flight = True
+    IN_FLIGHT.inc()
+
+
+@app.teardown_request
+def _end_request(exc):
+    if g.pop("in_flight", False):
+        IN_FLIGHT.dec()
+
+
+@app.after_request
+def _observe_request(response):
+    route = _route_label()
+    started = getattr(g, "request_started", None)
+    if started is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - started, method=request.method, route=route)
+    RESPONSES.inc(method=request.method, route=route, status=response.status_code)
+    REQUEST_BYTES.observe(request.content_length or 0, route=route)
+    if not response.is_streamed:
+        RESPONSE_BYTES.observe(response.calculate_content_length() or 0, route=route)
+    return response
+
+
+@app.after_request
+def _audit_request(response):
+    if request.path in _AUDIT_SKIP_PATHS:
+        return response
+    auth_info = getattr(g, "audit_auth", None) or {}
+    started = getattr(g, "request_started", None)
+    try:
+        audit.log_api_request(
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+            username=auth_info.get("user"),
+            auth_method=auth_info.get("method"),
+            duration_ms=(time.perf_counter() - started) * 1000 if started else None,
+            # Client address: first hop of a proxy chain
+            remote_addr=(request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
+                         or request.remote_addr),
+        )
+    except Exception as exc:  # auditing must never fail a request
+        logger.warning("Audit logging failed: %s", exc)
+    return response
+
+
 # ---------------------------------------------------------------------------
 # Validation helper
 # ---------------------------------------------------------------------------
@@ -261,6 +375,14 @@ def health():
     return jsonify({"status": "healthy", "service": "isaac-portal-api"})
 
 
+# --- Metrics ---------------------------------------------------------------
+
+@app.route("/portal/api/metrics", methods=["GET"])
+def get_metrics():
+    """Prometheus text exposition of this worker's request, DB and validation metrics."""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
 # --- Combined schema (base + vocabulary enums) ----------------------------
 
 @app.route("/portal/api/schema", methods=["GET"])
@@ -302,6 +424,34 @@ def get_ontology():
     return jsonify(vocab), 200
 
 
+@app.route("/portal/api/ontology/usage", methods=["GET"])
+@_require_auth
+def get_ontology_usage():
+    """
+    Return how often each vocabulary term is used by stored records.
+
+    Read from the incrementally maintained usage rollup, so the cost does
+    not depend on the number of records.
+
+    Structure: { category_key: { section, records_using,
+                 terms: [{term, record_count, sample_record_ids, in_vocabulary}],
+                 unused_terms: [...] } }
+
+    Optional query param:
+      ?category=system.technique — return only the named category.
+    """
+    category = request.args.get("category")
+    try:
+        usage = ontology.get_vocabulary_usage(category)
+    except Exception as exc:
+        logger.exception("Error reading vocabulary usage")
+        return jsonify({"error": "database_error", "message": str(exc)}), 500
+
+    if category and category not in usage:
+        return jsonify({"error": f"Unknown category: {category}"}), 404
+    return jsonify(usage), 200
+
+
 # --- Validate (dry-run, no DB write) --------------------------------------
 
 @app.route("/portal/api/validate", methods=["POST"])
@@ -387,8 +537,10 @@ def create_record():
 @_require_auth
 def list_records():
     """
-    List records (metadata only) with optional pagination.
-    Query params: ?limit=100&offset=0
+    List records (metadata and stored validation status) with optional
+    pagination.
+    Query params: ?limit=100&offset=0&validation_status=invalid
+    (valid | invalid | unknown)
     """
 
     try:
@@ -397,14 +549,81 @@ def list_records():
     except (ValueError, TypeError):
         return jsonify({"error": "limit and offset must be integers"}), 400
 
+    validation_status = request.args.get("validation_status")
+    if validation_status not in (None, "valid", "invalid", "unknown"):
+        return jsonify({"error": "validation_status must be valid, invalid or unknown"}), 400
+
     try:
-        records = database.list_records(limit=limit, offset=offset)
+        records = database.list_records(limit=limit, offset=offset,
+                                        validation_status=validation_status)
         return jsonify(records), 200
     except Exception as exc:
         logger.exception("Database error listing records")
         return jsonify({"error": str(exc)}), 500
 
 
+# --- Validation compliance -------------------------------------------------
+
+@app.route("/portal/api/records/validation", methods=["GET"])
+@_require_auth
+def get_validation_summary():
+    """
+    Compliance of stored records with the current validation rules.
+
+    Read from trigger-maintained counters, so the cost does not depend on
+    the number of records. Records validated under an older rules version
+    are counted as 'stale' until the background sweep re-checks them.
+
+    Structure: { rules_version, total, valid, invalid, stale,
+                 by_version: [{rules_version, validation_status, record_count}],
+                 last_sweep }
+    """
+    try:
+        summary = database.get_validation_summary(validation.rules_version())
+    except Exception as exc:
+        logger.exception("Error reading validation summary")
+        return jsonify({"error": "database_error", "message": str(exc)}), 500
+
+    summary["last_sweep"] = revalidation.last_result
+    return jsonify(summary), 200
+
+
+# --- Overview rollups -------------------------------------------------------
+
+@app.route("/portal/api/rollups/<dimension>", methods=["GET"])
+@_require_auth
+def get_rollups(dimension):
+    """
+    Precomputed overview of the records per material, technique, facility
+    or reaction, largest first.
+
+    Read from the trigger-maintained rollup tables, so the cost does not
+    depend on the number of records.
+
+    Structure: [{ key, record_count, domains: {domain: count},
+                  first_created, last_created,
+                  descriptors: [{descriptor, unit, count, mean, stddev, min, max}] }]
+
+    Optional query params:
+      ?key=CO2RR   — only this key
+      ?limit=50    — maximum keys (default 50, max 500)
+    """
+    if dimension not in database.ROLLUP_DIMENSIONS:
+        return jsonify({"error": f"Unknown dimension: {dimension}",
+                        "dimensions": list(database.ROLLUP_DIMENSIONS)}), 404
+    try:
+        limit = max(1, min(int(request.args.get("limit", 50)), 500))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    try:
+        result = database.get_rollups(dimension, key=request.args.get("key"), limit=limit)
+    except Exception as exc:
+        logger.exception("Error reading rollups")
+        return jsonify({"error": "database_error", "message": str(exc)}), 500
+    return jsonify(result), 200
+
+
 # --- Get single record -----------------------------------------------------
 
 @app.route("/portal/api/records/<record_id>", methods=["GET"])
@@ -1,18 +1,24 @@
 import streamlit as st
 import pandas as pd
 import json
-import requests
 import ontology
 import database
 import branding
-import agent
+import audit
+import bootstrap
+import drafts
+import portal_cache
+import revalidation
+import rollups
+import sync_worker
 import os
 import re
-import importlib
 import streamlit.components.v1 as components
 from datetime import datetime, timezone
 
-importlib.reload(ontology)
+# Page-specific modules (agent, form, validation, requests) are imported
+# inside the page branch that uses them, so a rerun only pays for the page
+# being shown.
 
 # Page Config — hide the default sidebar entirely
 st.set_page_config(page_title="ISAAC Portal", layout="wide", initial_sidebar_state="collapsed")
@@ -28,13 +34,11 @@ st.markdown("""
 # ISAAC logo at the top of every page
 branding.render_header()
 
-# Initialize database tables on startup (if configured)
-if database.is_db_configured():
-    database.init_tables()
-    ontology.sync_file_to_db()
+# Bootstrap the database once per process (no-op on every later rerun)
+bootstrap.ensure_ready()
 
-# Check database status
-db_connected = database.test_db_connection()
+# Check database status (cached process-wide; see portal/portal_cache.py)
+db_connected = portal_cache.db_online()
 
 # Extract current user from Authentik headers
 try:
@@ -45,28 +49,21 @@ except Exception:
 
 user_is_admin = ontology.is_admin(current_username)
 
-# Log portal access (once per session)
+# Log portal access (once per session; buffered and written in batches)
 if "access_logged" not in st.session_state:
     st.session_state.access_logged = True
     if db_connected:
         try:
-            database.log_access(current_username)
+            audit.log_access(current_username)
         except Exception:
             pass
 
-# Auto-sync from wiki on every page load if cache is stale (>5 min)
-if db_connected and os.environ.get("WIKI_REPO_URL"):
-    try:
-        last_sync = database.get_last_sync()
-        need_sync = True
-        if last_sync and last_sync.get('synced_at'):
-            age = datetime.now(timezone.utc) - last_sync['synced_at']
-            if age.total_seconds() < 300:
-                need_sync = False
-        if need_sync:
-            ontology.sync_from_wiki(synced_by="auto")
-    except Exception:
-        pass
+# Keep the vocabulary in sync with the wiki from a background thread
+# (idempotent per process; never blocks the page on wiki I/O)
+if db_connected:
+    sync_worker.start()
+    revalidation.start()
+    rollups.start()
 
 # Initialize page state
 if "current_page" not in st.session_state:
@@ -86,7 +83,7 @@ with nav_col:
             # Show pending count badge for Admin Review
             if p == "Admin Review" and db_connected:
                 try:
-                    pending = database.count_pending_proposals()
+                    pending = portal_cache.pending_proposal_count()
                     if pending > 0:
                         label = f"{p} ({pending})"
                 except Exception:
@@ -175,10 +172,14 @@ SECTION_ORDER = [
     "Measurement", "Assets", "Links", "Descriptors",
 ]
 
-def generate_mermaid_code(active_section=None, active_category=None):
+@st.cache_data(ttl=portal_cache.STATS_TTL * 10, show_spinner=False)
+def generate_mermaid_code(active_section=None, active_category=None, vocab_version=0):
     """
     Generates Mermaid JS syntax for the ontology tree.
     Includes click events to open Wiki pages in new tab.
+
+    Cached per (section, category, vocab_version); pass
+    ontology.get_vocabulary_version() so vocabulary changes rebuild it.
     """
     all_sections = ontology.get_sections()
     # Canonical order first, then any extras not in the predefined list
@@ -299,8 +300,9 @@ if page == "Dashboard":
         st.info("Database not connected. Configure PGHOST, PGUSER, PGPASSWORD, PGDATABASE environment variables.")
     else:
         try:
-            stats = database.get_dashboard_stats()
-            access = database.get_access_stats()
+            cached = portal_cache.dashboard()
+            stats = cached['stats']
+            access = cached['access']
 
             # --- Row 1: Status Cards ---
             c1, c2, c3, c4 = st.columns(4)
@@ -333,7 +335,20 @@ if page == "Dashboard":
                 visit_help = ""
             c4.metric("Portal Visits", f"{access['total_visits']:,}", help=visit_help)
 
-            # --- Row 2: Records by Type ---
+            # --- Row 2: Validation compliance (stored status, counter table) ---
+            compliance = cached['compliance']
+            if compliance['total']:
+                st.subheader("Validation Compliance")
+                v1, v2, v3 = st.columns(3)
+                v1.metric("Valid", f"{compliance['valid']:,}")
+                v2.metric("Invalid", f"{compliance['invalid']:,}",
+                          help="Failed the current rules; list them via "
+                               "GET /portal/api/records?validation_status=invalid")
+                v3.metric("Awaiting Re-check", f"{compliance['stale']:,}",
+                          help=f"Validated under older rules (current: {compliance['rules_version']}); "
+                               "the background sweep re-checks them")
+
+            # --- Row 3: Records by Type ---
             by_type = stats.get('by_type', {})
             if by_type:
                 st.subheader("Records by Type")
@@ -345,6 +360,22 @@ if page == "Dashboard":
             else:
                 st.info("No records yet. Use the Record Validator or Record Form to add data.")
 
+            # --- Row 4: Top materials / techniques (precomputed rollups) ---
+            top_materials = cached['top_materials']
+            top_techniques = cached['top_techniques']
+            if top_materials or top_techniques:
+                r1, r2 = st.columns(2)
+                for col, title, rows in ((r1, "Top Materials", top_materials),
+                                         (r2, "Top Techniques", top_techniques)):
+                    with col:
+                        st.subheader(title)
+                        st.dataframe(pd.DataFrame([{
+                            "Name": r['key'],
+                            "Records": r['record_count'],
+                            "Domains": ", ".join(sorted(r['domains'])),
+                            "Last Added": (r['last_created'] or "")[:10],
+                        } for r in rows]), hide_index=True, use_container_width=True)
+
         except Exception as e:
             st.error(f"Error loading dashboard: {e}")
 
@@ -382,12 +413,14 @@ elif page == "Ontology Editor":
                 with admin_cols[1]:
                     if st.button("Sync from Wiki", type="secondary"):
                         with st.spinner("Syncing from wiki..."):
-                            ok, msg = ontology.sync_from_wiki(synced_by=current_username)
-                        if ok:
-                            st.success(msg)
+                            result = sync_worker.run_once(synced_by=current_username, min_age=0)
+                        if result is None:
+                            st.info("A wiki sync is already running — try again in a moment.")
+                        elif result[0]:
+                            st.success(result[1])
                             st.rerun()
                         else:
-                            st.error(msg)
+                            st.error(result[1])
                 st.divider()
 
         st.subheader("1. Browse")
@@ -408,8 +441,22 @@ elif page == "Ontology Editor":
             st.subheader(f"2. Details: {selected_category}")
             st.write(f"*{categories_dict[selected_category]['description']}*")
             values = categories_dict[selected_category]['values']
-            df_vals = pd.DataFrame(values, columns=["Allowed Terms"])
+            counts = {}
+            if db_connected:
+                try:
+                    usage = ontology.get_vocabulary_usage(selected_category).get(selected_category, {})
+                    counts = {t['term']: t['record_count'] for t in usage.get('terms', [])}
+                except Exception:
+                    counts = {}
+            df_vals = pd.DataFrame({
+                "Allowed Terms": values,
+                "Records": [counts.get(v, 0) for v in values],
+            })
             st.dataframe(df_vals, use_container_width=True, height=200)
+            if db_connected and values:
+                unused = sum(1 for v in values if not counts.get(v))
+                st.caption(f"{len(values) - unused} of {len(values)} terms in use"
+                           + (" — category unused" if unused == len(values) else ""))
 
         st.divider()
 
@@ -440,6 +487,12 @@ elif page == "Ontology Editor":
                             description=prop_term_desc.strip(),
                             proposed_by=current_username
                         )
+                        portal_cache.invalidate_proposals()
+                        drafts.submit({
+                            "id": pid, "proposal_type": "add_term", "section": prop_section,
+                            "category": prop_category, "term": prop_term,
+                            "description": prop_term_desc.strip(),
+                        })
                         st.success(f"Proposal #{pid} submitted! An admin will review it.")
                     except Exception as e:
                         st.error(f"Failed to submit: {e}")
@@ -462,6 +515,11 @@ elif page == "Ontology Editor":
                             description=prop_desc,
                             proposed_by=current_username
                         )
+                        portal_cache.invalidate_proposals()
+                        drafts.submit({
+                            "id": pid, "proposal_type": "add_category", "section": prop_section,
+                            "category": prop_new_cat, "term": None, "description": prop_desc,
+                        })
                         st.success(f"Proposal #{pid} submitted! An admin will review it.")
                     except Exception as e:
                         st.error(f"Failed to submit: {e}")
@@ -492,7 +550,8 @@ elif page == "Ontology Editor":
         st.subheader("Concept Map")
         st.caption("Visualizing: " + get_display_name(selected_section))
 
-        mermaid_code = generate_mermaid_code(selected_section, selected_category)
+        mermaid_code = generate_mermaid_code(selected_section, selected_category,
+                                             ontology.get_vocabulary_version())
         render_mermaid(mermaid_code, height=600)
 
 
@@ -513,6 +572,9 @@ elif page == "Admin Review":
             pending = database.list_proposals(status="pending")
             if not pending:
                 st.info("No pending proposals.")
+            else:
+                # Drafts normally start at submission; catch up on any missed
+                drafts.submit_missing(pending)
 
             # Session state to track which proposal is in the "review draft" step
             if "reviewing_proposal_id" not in st.session_state:
@@ -522,6 +584,57 @@ elif page == "Admin Review":
             if "draft_yaml_desc" not in st.session_state:
                 st.session_state.draft_yaml_desc = ""
 
+            # Batch approval: one cache write and one wiki commit per page
+            for level, text in st.session_state.pop("batch_results", []):
+                getattr(st, level)(text)
+            if len(pending) > 1:
+                with st.expander(f"Batch approve ({len(pending)} pending)"):
+                    labels = {
+                        p['id']: f"#{p['id']} {p['proposal_type']} — {p['section']} / "
+                                 f"{p.get('category') or ''} {p.get('term') or ''}".rstrip()
+                        for p in pending
+                    }
+                    batch_ids = st.multiselect(
+                        "Proposals to approve",
+                        list(labels), format_func=labels.get, key="batch_approve_ids",
+                    )
+                    batch_comment = st.text_input("Review comment (optional)", key="batch_comment")
+                    if st.button("Approve selected", type="primary", disabled=not batch_ids):
+                        claimed = database.review_proposals(
+                            batch_ids, "approved", current_username, batch_comment
+                        )
+                        portal_cache.invalidate_proposals()
+                        messages = []
+                        if claimed:
+                            # Use each proposal's ready background draft, as
+                            # "Review Wiki Draft" would have pre-filled it
+                            batch = []
+                            for p in claimed:
+                                prose = ""
+                                if p.get('draft_status') == 'ready':
+                                    prose = p.get('draft_wiki_prose') or ""
+                                    if p.get('draft_yaml_description'):
+                                        p['_yaml_description'] = p['draft_yaml_description']
+                                batch.append((p, prose))
+                            with st.spinner(f"Applying {len(claimed)} proposals..."):
+                                results = ontology.apply_approved_proposals(
+                                    batch, reviewed_by=current_username
+                                )
+                            for p, (apply_ok, apply_msg, wiki_ok) in zip(claimed, results):
+                                if apply_ok and wiki_ok:
+                                    messages.append(("success", f"#{p['id']}: {apply_msg}"))
+                                elif apply_ok:
+                                    messages.append(("warning", f"#{p['id']}: {apply_msg}"))
+                                else:
+                                    messages.append(("error", f"#{p['id']}: approved but failed to apply: {apply_msg}"))
+                        skipped = set(batch_ids) - {p['id'] for p in claimed}
+                        if skipped:
+                            messages.append(("info", "Already reviewed elsewhere: "
+                                             + ", ".join(f"#{i}" for i in sorted(skipped))))
+                        st.session_state.batch_results = messages
+                        st.session_state.pop("batch_approve_ids", None)
+                        st.rerun()
+
             for prop in pending:
                 with st.container(border=True):
                     pid = prop['id']
@@ -531,6 +644,18 @@ elif page == "Admin Review":
                         st.write(f"**Category:** {prop['category']}")
                     if prop.get('term'):
                         st.write(f"**Term:** {prop['term']}")
+                    if prop['proposal_type'] == 'add_term' and prop.get('category'):
+                        try:
+                            cat_usage = ontology.get_vocabulary_usage(prop['category']).get(prop['category'])
+                        except Exception:
+                            cat_usage = None
+                        if cat_usage:
+                            top = ", ".join(f"`{t['term']}` ({t['record_count']})" for t in cat_usage['terms'][:5])
+                            st.caption(
+                                f"Category usage: {cat_usage['records_using']} term uses across records"
+                                + (f" — top: {top}" if top else "")
+                                + f"; {len(cat_usage['unused_terms'])} existing terms unused"
+                            )
                     if prop.get('description'):
                         st.info(f"**Proposer's description:** {prop['description']}")
                     else:
@@ -543,26 +668,27 @@ elif page == "Admin Review":
                         # Step 1: Generate draft or quick actions
                         btn_cols = st.columns(3)
                         with btn_cols[0]:
-                            if st.button("Generate Wiki Text", key=f"gen_{pid}", type="primary"):
-                                with st.spinner("Generating wiki prose with AI..."):
-                                    result = ontology.generate_wiki_description(
-                                        section=prop['section'],
-                                        category=prop.get('category', ''),
-                                        term=prop.get('term', ''),
-                                        proposal_type=prop['proposal_type'],
-                                        user_description=prop.get('description', '')
-                                    )
-                                if result['success']:
+                            if prop.get('draft_status') == 'ready':
+                                if st.button("Review Wiki Draft", key=f"gen_{pid}", type="primary"):
                                     st.session_state.reviewing_proposal_id = pid
-                                    st.session_state.draft_wiki_prose = result['wiki_prose']
-                                    st.session_state.draft_yaml_desc = result['yaml_description']
+                                    st.session_state.draft_wiki_prose = prop.get('draft_wiki_prose') or ""
+                                    st.session_state.draft_yaml_desc = prop.get('draft_yaml_description') or ""
+                                    st.rerun()
+                            elif drafts.is_drafting(prop):
+                                st.caption("AI wiki draft in progress…")
+                                if st.button("Refresh", key=f"refresh_{pid}"):
+                                    st.rerun()
+                            else:
+                                if prop.get('draft_status') == 'failed':
+                                    st.caption(f"Draft failed: {prop.get('draft_error') or 'unknown error'}")
+                                if st.button("Generate Wiki Text", key=f"gen_{pid}", type="primary"):
+                                    drafts.submit(prop, force=True)
                                     st.rerun()
-                                else:
-                                    st.error(f"LLM error: {result['error']}")
                         with btn_cols[1]:
                             if st.button("Approve (no prose)", key=f"quick_approve_{pid}"):
                                 comment = ""
                                 ok, msg = database.review_proposal(pid, "approved", current_username, comment)
+                                portal_cache.invalidate_proposals()
                                 if ok:
                                     apply_ok, apply_msg, wiki_ok = ontology.apply_approved_proposal(prop)
                                     if apply_ok:
@@ -575,6 +701,7 @@ elif page == "Admin Review":
                         with btn_cols[2]:
                             if st.button("Reject", key=f"reject_{pid}"):
                                 ok, msg = database.review_proposal(pid, "rejected", current_username, "")
+                                portal_cache.invalidate_proposals()
                                 if ok:
                                     st.success("Proposal rejected.")
                                     st.rerun()
@@ -601,6 +728,7 @@ elif page == "Admin Review":
                         with confirm_cols[0]:
                             if st.button("Approve & Push to Wiki", key=f"confirm_{pid}", type="primary"):
                                 ok, msg = database.review_proposal(pid, "approved", current_username, review_comment)
+                                portal_cache.invalidate_proposals()
                                 if ok:
                                     # Update proposal description with the yaml_desc if provided
                                     enriched_prop = dict(prop)
@@ -623,20 +751,13 @@ elif page == "Admin Review":
                                     st.error(msg)
                         with confirm_cols[1]:
                             if st.button("Regenerate", key=f"regen_{pid}"):
-                                with st.spinner("Regenerating..."):
-                                    result = ontology.generate_wiki_description(
-                                        section=prop['section'],
-                                        category=prop.get('category', ''),
-                                        term=prop.get('term', ''),
-                                        proposal_type=prop['proposal_type'],
-                                        user_description=prop.get('description', '')
-                                    )
-                                if result['success']:
-                                    st.session_state.draft_wiki_prose = result['wiki_prose']
-                                    st.session_state.draft_yaml_desc = result['yaml_description']
-                                    st.rerun()
-                                else:
-                                    st.error(f"LLM error: {result['error']}")
+                                # Runs in the background; the new draft shows
+                                # up on the proposal when it is ready
+                                drafts.submit(prop, force=True)
+                                st.session_state.reviewing_proposal_id = None
+                                st.session_state.draft_wiki_prose = ""
+                                st.session_state.draft_yaml_desc = ""
+                                st.rerun()
                         with confirm_cols[2]:
                             if st.button("Cancel", key=f"cancel_{pid}"):
                                 st.session_state.reviewing_proposal_id = None
@@ -757,6 +878,7 @@ elif page == "Record Validator":
                                 # shared chokepoint), so a record that changed since
                                 # the displayed PASS cannot slip through.
                                 saved_id = database.save_record(record_data)
+                                portal_cache.invalidate_records()
                                 st.success(f"Record saved! ID: `{saved_id}`")
                             except Exception as exc:
                                 import validation
@@ -846,6 +968,7 @@ elif page == "Saved Records":
                             st.warning("This action cannot be undone!")
                             if st.button(f"Delete Record {selected_id}", type="secondary"):
                                 if database.delete_record(selected_id):
+                                    portal_cache.invalidate_records()
                                     st.success("Record deleted.")
                                     st.rerun()
                                 else:
@@ -870,6 +993,8 @@ elif page == "nano ISAAC":
         st.markdown("")  # vertical spacing
         clear_chat = st.button("Clear Chat", use_container_width=True)
 
+    import agent
+
     # Check prerequisites
     if not db_connected:
         st.warning("Database not connected. nano ISAAC requires a live database.")
@@ -919,14 +1044,31 @@ elif page == "nano ISAAC":
             st.session_state.agent_display.append({"role": "user", "content": prompt})
             st.session_state.agent_messages.append({"role": "user", "content": prompt})
 
-            # Run agent and append reply
-            try:
-                reply, updated = agent.run_agent_turn(st.session_state.agent_messages)
-                st.session_state.agent_messages = updated
-                st.session_state.agent_display.append({"role": "assistant", "content": reply})
-            except Exception as exc:
-                err = f"Agent error: {exc}"
-                st.session_state.agent_display.append({"role": "assistant", "content": err})
+            # Stream the agent's reply into the chat box as it arrives
+            with chat_box:
+                with st.chat_message("user"):
+                    st.markdown(prompt)
+                with st.chat_message("assistant"):
+                    status = st.empty()
+                    reply_box = st.empty()
+                    shown = ""
+                    try:
+                        for event in agent.run_agent_turn_stream(st.session_state.agent_messages):
+                            if event["type"] == "round":
+                                shown = ""
+                                status.caption("Thinking…" if event["index"] else "")
+                            elif event["type"] == "token":
+                                shown += event["text"]
+                                reply_box.markdown(shown + "▌")
+                            elif event["type"] in ("query", "tool"):
+                                status.caption("Running query…")
+                            elif event["type"] == "done":
+                                st.session_state.agent_messages = event["messages"]
+                                st.session_state.agent_display.append(
+                                    {"role": "assistant", "content": event["reply"]})
+                    except Exception as exc:
+                        err = f"Agent error: {exc}"
+                        st.session_state.agent_display.append({"role": "assistant", "content": err})
 
             st.rerun()
 
@@ -938,6 +1080,8 @@ elif page == "nano ISAAC":
 # PAGE: API Keys
 # =============================================================================
 elif page == "API Keys":
+    import requests
+
     st.header("API Keys")
     st.markdown("Generate and manage API keys for programmatic access to the ISAAC Portal API.")
 
@@ -1094,6 +1238,10 @@ elif page == "API Documentation":
     st.code("GET /portal/api/health", language="text")
     st.markdown("Returns `200` with `{\"status\": \"healthy\"}`. Use for connectivity checks.")
 
+    st.markdown("#### Metrics")
+    st.code("GET /portal/api/metrics", language="text")
+    st.markdown("Prometheus text exposition of request latency, status codes, DB and validation timings (no auth).")
+
     st.divider()
 
     # --- Validate ---
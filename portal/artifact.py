@@ -0,0 +1,257 @@
+"""
+ISAAC AI-Ready Record - Compiled Schema/Vocabulary Artifact
+One versioned binary snapshot of everything the validators derive from the
+repo's source files:
+
+    schema/isaac_record_v1.json   → JSON Schema
+    data/vocabulary.json          → seed vocabulary, unit/product alias maps,
+                                    per-category lookup tables and
+                                    suggestion indexes
+
+Built by `python tools/build_artifact.py` (run in the Docker image build)
+into build/isaac_snapshot.json. load() reads it with a single JSON parse
+(plain data only: the file is writable at runtime, so it must never be
+able to run code when loaded); if a source file changed since the build (size/mtime fingerprint,
+then content hash) the snapshot is rebuilt in memory and rewritten when the
+location is writable. Every module in a process shares the same Snapshot,
+so validation, ontology and bootstrap all see one consistent version.
+
+The artifact is a cache: deleting it is always safe.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import suggest
+
+logger = logging.getLogger("isaac-artifact")
+
+# Bump when the Snapshot layout or the derived structures change
+ARTIFACT_FORMAT = 3
+
+_root_dir = Path(__file__).resolve().parent.parent
+SOURCES = {
+    "schema": _root_dir / "schema" / "isaac_record_v1.json",
+    "vocabulary": _root_dir / "data" / "vocabulary.json",
+}
+ARTIFACT_PATH = Path(os.environ.get(
+    "ISAAC_ARTIFACT_PATH", _root_dir / "build" / "isaac_snapshot.json"
+))
+
+# Category keys that are namespaces (not enum fields in the record)
+SKIP_CATEGORIES = frozenset({"descriptors.theoretical_metric"})
+
+
+class Snapshot:
+    """
+    Immutable-by-convention bundle of compiled sources. Callers must not
+    mutate the contained dicts.
+
+    Attributes:
+        format: ARTIFACT_FORMAT it was built with
+        content_hash: sha256 over the format and every source's bytes
+        version: short form of content_hash for logs and cache keys
+        source_hashes: {source name: sha256 of the file ('' if missing)}
+        fingerprint: {source name: (size, mtime_ns)} at build time
+        schema: parsed JSON Schema
+        vocabulary: parsed seed vocabulary {section: {category: {...}}}
+        unit_aliases, product_aliases: deprecated → canonical maps
+        term_aliases: term_aliases(vocabulary), for suggestions
+        vocabulary_lookups: compile_vocabulary_lookups(vocabulary)
+    """
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+    @property
+    def version(self) -> str:
+        return self.content_hash[:12]
+
+
+def compile_vocabulary_lookups(vocab: dict) -> tuple:
+    """
+    Flatten a vocabulary into the structure record validation walks:
+    a tuple of (category key, path parts, allowed values list, allowed set,
+    suggest.TermIndex) for every enumerated category, skipping namespaces
+    and empty ones.
+    """
+    lookups = []
+    for categories in vocab.values():
+        for cat_key, cat_data in categories.items():
+            if cat_key in SKIP_CATEGORIES or not isinstance(cat_data, dict):
+                continue
+            allowed = cat_data.get("values") or []
+            if not allowed:
+                continue
+            lookups.append((cat_key, tuple(cat_key.split(".")), list(allowed),
+                            frozenset(allowed), suggest.TermIndex(allowed)))
+    return tuple(lookups)
+
+
+def term_aliases(vocab: dict) -> dict:
+    """Combined deprecated → canonical map (units.aliases + descriptors.product_aliases)."""
+    return {
+        **vocab.get("Descriptors", {}).get("descriptors.product_aliases", {}).get("map", {}),
+        **vocab.get("Units", {}).get("units.aliases", {}).get("map", {}),
+    }
+
+
+def _fingerprint() -> dict:
+    result = {}
+    for name, path in SOURCES.items():
+        try:
+            st = path.stat()
+            result[name] = (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            result[name] = None
+    return result
+
+
+def _read_sources() -> dict:
+    data = {}
+    for name, path in SOURCES.items():
+        try:
+            data[name] = path.read_bytes()
+        except FileNotFoundError:
+            data[name] = b""
+    return data
+
+
+def _content_hash(raw: dict) -> str:
+    h = hashlib.sha256(f"isaac-artifact-{ARTIFACT_FORMAT}".encode("utf-8"))
+    for name in sorted(raw):
+        h.update(name.encode("utf-8") + b"\0" + hashlib.sha256(raw[name]).digest())
+    return h.hexdigest()
+
+
+def build() -> Snapshot:
+    """Compile a Snapshot from the source files."""
+    fingerprint = _fingerprint()
+    raw = _read_sources()
+
+    if not raw["schema"]:
+        # An empty schema would accept every document: refuse to start
+        raise FileNotFoundError(f"JSON Schema not found: {SOURCES['schema']}")
+    schema = json.loads(raw["schema"])
+    try:
+        vocabulary = json.loads(raw["vocabulary"]) if raw["vocabulary"] else {}
+    except ValueError as exc:  # degrade gracefully; canonical checks become no-ops
+        logger.warning("Could not parse %s: %s", SOURCES["vocabulary"], exc)
+        vocabulary = {}
+
+    return Snapshot(
+        format=ARTIFACT_FORMAT,
+        content_hash=_content_hash(raw),
+        source_hashes={name: hashlib.sha256(data).hexdigest() if data else ""
+                       for name, data in raw.items()},
+        fingerprint=fingerprint,
+        schema=schema,
+        vocabulary=vocabulary,
+        unit_aliases=vocabulary.get("Units", {}).get("units.aliases", {}).get("map", {}),
+        product_aliases=vocabulary.get("Descriptors", {}).get("descriptors.product_aliases", {}).get("map", {}),
+        term_aliases=term_aliases(vocabulary),
+        vocabulary_lookups=compile_vocabulary_lookups(vocabulary),
+    )
+
+
+def _to_plain(fields: dict) -> dict:
+    """Snapshot fields as JSON-serializable data."""
+    return {
+        **fields,
+        "vocabulary_lookups": [
+            [cat_key, list(parts), allowed, index.__getstate__()]
+            for cat_key, parts, allowed, _, index in fields["vocabulary_lookups"]
+        ],
+    }
+
+
+def _from_plain(fields: dict) -> dict:
+    """Inverse of _to_plain(): restore tuples, sets and TermIndex objects."""
+    return {
+        **fields,
+        "fingerprint": {name: tuple(fp) if fp is not None else None
+                        for name, fp in fields["fingerprint"].items()},
+        "vocabulary_lookups": tuple(
+            (cat_key, tuple(parts), allowed, frozenset(allowed), suggest.TermIndex.from_state(state))
+            for cat_key, parts, allowed, state in fields["vocabulary_lookups"]
+        ),
+    }
+
+
+def write(snapshot: Snapshot, path: Path = None) -> Path:
+    """Atomically write *snapshot* to *path* (default ARTIFACT_PATH)."""
+    path = Path(path or ARTIFACT_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(_to_plain(snapshot.__dict__), f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    return path
+
+
+def _read(path: Path):
+    try:
+        with open(path, "rb") as f:
+            fields = json.load(f)
+        if not isinstance(fields, dict) or fields.get("format") != ARTIFACT_FORMAT:
+            return None
+        return Snapshot(**_from_plain(fields))
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.warning("Ignoring unreadable artifact %s: %s", path, exc)
+        return None
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def load(path: Path = None) -> Snapshot:
+    """
+    Return the process-wide Snapshot, loading the artifact on first use and
+    rebuilding it if the sources changed since it was written.
+    """
+    global _snapshot
+    if _snapshot is not None:
+        return _snapshot
+    with _snapshot_lock:
+        if _snapshot is not None:
+            return _snapshot
+
+        path = Path(path or ARTIFACT_PATH)
+        snapshot = _read(path)
+        fingerprint = _fingerprint()
+        if snapshot is not None and snapshot.fingerprint != fingerprint:
+            # Touched (checkout, COPY) but maybe not changed: compare content
+            if snapshot.content_hash != _content_hash(_read_sources()):
+                snapshot = None
+            else:
+                snapshot.fingerprint = fingerprint
+                try:
+                    write(snapshot, path)
+                except OSError:
+                    pass
+
+        if snapshot is None:
+            snapshot = build()
+            try:
+                write(snapshot, path)
+                logger.info("Rebuilt artifact %s (version %s)", path, snapshot.version)
+            except OSError as exc:
+                logger.info("Using in-memory artifact (cannot write %s: %s)", path, exc)
+
+        _snapshot = snapshot
+        return _snapshot
@@ -0,0 +1,256 @@
+"""
+ISAAC AI-Ready Record - Buffered Access / Audit Logging
+Collects portal access events and API audit events in memory and writes
+them to PostgreSQL in batches, off the request path.
+
+Data flow:
+  log_access() / log_api_request() → in-process buffer → flusher thread
+  → database.log_access_batch() / database.log_api_audit_batch()
+
+A flush happens every ISAAC_AUDIT_FLUSH_INTERVAL seconds, as soon as a
+buffer holds ISAAC_AUDIT_BATCH_SIZE events, and once more at interpreter
+shutdown. When the database is slow or down the buffer fills up to
+ISAAC_AUDIT_MAX_BUFFERED events; producers then wait briefly for space
+(ISAAC_AUDIT_ENQUEUE_TIMEOUT) and the event is dropped and counted if none
+frees up, so a database outage can never stall a page load or API call.
+
+Only connection-level failures put a batch back for retry. If the database
+rejects the batch itself (bad value, constraint), its events are retried one
+at a time and those still rejected are logged and counted as 'rejected', so
+one bad event can never block the rest of the trail.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+import psycopg2
+
+import database
+
+logger = logging.getLogger("isaac-audit")
+
+FLUSH_INTERVAL = float(os.environ.get("ISAAC_AUDIT_FLUSH_INTERVAL", 5))
+FLUSH_BATCH_SIZE = int(os.environ.get("ISAAC_AUDIT_BATCH_SIZE", 200))
+MAX_BUFFERED = int(os.environ.get("ISAAC_AUDIT_MAX_BUFFERED", 10000))
+ENQUEUE_TIMEOUT = float(os.environ.get("ISAAC_AUDIT_ENQUEUE_TIMEOUT", 0.05))
+
+
+class AuditBuffer:
+    """
+    Bounded in-memory event buffer with a background batch writer.
+
+    Args:
+        name: label used in log messages
+        writer: callable taking a list of event tuples and persisting them
+            in one round trip; a connection error leaves the batch buffered
+            for retry, any other error rejects the offending events
+        flush_interval: seconds between timed flushes
+        batch_size: buffered events that trigger an immediate flush
+        max_buffered: capacity; beyond it producers block, then drop
+    """
+
+    def __init__(self, name: str, writer, flush_interval: float = FLUSH_INTERVAL,
+                 batch_size: int = FLUSH_BATCH_SIZE, max_buffered: int = MAX_BUFFERED):
+        self.name = name
+        self._writer = writer
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffered = max_buffered
+
+        self._events = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+
+        self.written = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.failed_flushes = 0
+
+    def __len__(self):
+        return len(self._events)
+
+    def record(self, event: tuple) -> bool:
+        """
+        Buffer one event. Returns False if it was dropped because the
+        buffer stayed full for ENQUEUE_TIMEOUT seconds.
+        """
+        self._ensure_started()
+        with self._cond:
+            deadline = time.monotonic() + ENQUEUE_TIMEOUT
+            while len(self._events) >= self.max_buffered and not self._stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.dropped += 1
+                    if self.dropped == 1 or self.dropped % 1000 == 0:
+                        logger.warning("%s buffer full: %d event(s) dropped so far",
+                                       self.name, self.dropped)
+                    return False
+                self._cond.wait(remaining)
+            self._events.append(event)
+            if len(self._events) >= self.batch_size:
+                self._cond.notify_all()
+        return True
+
+    def flush(self) -> int:
+        """
+        Write everything currently buffered, in chunks of batch_size.
+
+        Returns:
+            Number of events written. On a write error the unwritten
+            events go back to the front of the buffer.
+        """
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    if not self._events:
+                        break
+                    batch = [self._events.popleft()
+                             for _ in range(min(self.batch_size, len(self._events)))]
+                    self._cond.notify_all()  # space freed for blocked producers
+                try:
+                    self._writer(batch)
+                except Exception as exc:
+                    self.failed_flushes += 1
+                    logger.warning("%s flush of %d event(s) failed: %s",
+                                   self.name, len(batch), exc)
+                    if _is_transient(exc):
+                        self._requeue(batch)
+                        break
+                    count, unwritten = self._write_each(batch)
+                    written += count
+                    if unwritten:
+                        self._requeue(unwritten)
+                        break
+                    continue
+                written += len(batch)
+                self.written += len(batch)
+        return written
+
+    def _write_each(self, batch: list) -> tuple:
+        """
+        Write a rejected batch one event at a time, dropping (and logging)
+        the events the database still rejects.
+
+        Returns:
+            (events written, events left unwritten by a connection error)
+        """
+        written = 0
+        for i, event in enumerate(batch):
+            try:
+                self._writer([event])
+            except Exception as exc:
+                if _is_transient(exc):
+                    return written, batch[i:]
+                self.rejected += 1
+                logger.warning("%s event rejected and dropped: %r (%s)", self.name, event, exc)
+                continue
+            written += 1
+            self.written += 1
+        return written, []
+
+    def _requeue(self, batch: list):
+        """Put unwritten events back at the front of the buffer."""
+        with self._cond:
+            overflow = len(self._events) + len(batch) - self.max_buffered
+            if overflow > 0:
+                # Keep the newest events; count the oldest as lost
+                batch = batch[overflow:]
+                self.dropped += overflow
+            self._events.extendleft(reversed(batch))
+
+    def close(self):
+        """Stop the flusher thread and flush whatever is left."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is None and not self._stopping:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"isaac-audit-{self.name}", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._events) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            if self.flush() == 0 and len(self._events):
+                # Writer is failing — back off instead of spinning
+                time.sleep(self.flush_interval)
+
+
+def _is_transient(exc: Exception) -> bool:
+    """True for errors worth retrying the same batch on (connection trouble)."""
+    return isinstance(exc, (psycopg2.OperationalError, psycopg2.InterfaceError))
+
+
+# =============================================================================
+# Process-wide buffers
+# =============================================================================
+
+access_buffer = AuditBuffer("access", database.log_access_batch)
+api_buffer = AuditBuffer("api", database.log_api_audit_batch)
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+def log_access(username: str = "anonymous") -> bool:
+    """Buffer a portal visit (replaces the synchronous database.log_access)."""
+    if not database.is_db_configured():
+        return False
+    return access_buffer.record((username, _utcnow()))
+
+
+def log_api_request(method: str, path: str, status: int, username: str = None,
+                    auth_method: str = None, duration_ms: float = None,
+                    remote_addr: str = None) -> bool:
+    """Buffer one API audit event."""
+    if not database.is_db_configured():
+        return False
+    return api_buffer.record((
+        _utcnow(), method, path, status, username, auth_method, duration_ms, remote_addr,
+    ))
+
+
+def get_buffer_stats() -> dict:
+    """Counters for monitoring: buffered, written, dropped and rejected per buffer."""
+    return {
+        buf.name: {
+            "buffered": len(buf),
+            "written": buf.written,
+            "dropped": buf.dropped,
+            "rejected": buf.rejected,
+            "failed_flushes": buf.failed_flushes,
+        }
+        for buf in (access_buffer, api_buffer)
+    }
+
+
+@atexit.register
+def shutdown():
+    """Flush both buffers on interpreter exit (gunicorn worker / Streamlit stop)."""
+    for buf in (access_buffer, api_buffer):
+        try:
+            buf.close()
+        except Exception as exc:
+            logger.warning("Final %s audit flush failed: %s", buf.name, exc)
@@ -0,0 +1,179 @@
+"""
+ISAAC AI-Ready Record - Startup Bootstrap
+One-time, cluster-wide schema/vocabulary bootstrap plus a lightweight
+per-process init for API workers and the Streamlit app.
+
+    bootstrap()    — runs database.init_tables() and seeds the vocabulary
+                     cache from data/vocabulary.json, under a Postgres
+                     advisory lock, and only if the stored schema version
+                     or vocabulary file hash is out of date or a one-time
+                     index backfill (BACKFILLS) has not completed yet.
+    ensure_ready() — per-process guard: the first call in a process does
+                     one metadata read (and bootstrap() if needed); every
+                     later call, e.g. each Streamlit rerun, is a no-op.
+
+Run once per deploy (init container / Job, or start.sh):
+    python portal/bootstrap.py [--force]
+"""
+
+import logging
+import sys
+import threading
+from pathlib import Path
+
+_portal_dir = Path(__file__).resolve().parent
+if str(_portal_dir) not in sys.path:
+    sys.path.insert(0, str(_portal_dir))
+
+import artifact  # noqa: E402
+import database  # noqa: E402
+
+logger = logging.getLogger("isaac-bootstrap")
+
+VOCAB_FILE = artifact.SOURCES["vocabulary"]
+
+_ready = False
+_ready_lock = threading.Lock()
+
+
+def _vocabulary_file_hash() -> str:
+    """sha256 of data/vocabulary.json ('' if the file is missing), from the compiled artifact."""
+    return artifact.load().source_hashes["vocabulary"]
+
+
+# One-time backfills of derived indexes for records saved before the index
+# existed: (portal_meta flag, label, rebuild function name, count to store).
+# Each is checked on every bootstrap, independently of the schema version,
+# so one that failed is retried by the next start.
+BACKFILLS = [
+    ("term_usage_built", "Term usage index", "rebuild_term_usage", "records"),
+    ("record_descriptors_built", "Descriptor index", "rebuild_record_descriptors", "records"),
+    ("descriptor_usage_built", "Descriptor usage counters", "rebuild_descriptor_usage", "names"),
+    ("rollups_built", "Overview rollups", "reconcile_rollups", "rollups"),
+]
+
+
+def _pending_work(meta: dict, vocab_hash: str) -> tuple:
+    """(needs_ddl, needs_vocab_seed, missing backfill flags) for the given portal_meta snapshot."""
+    try:
+        stored_version = int(meta.get("schema_version") or 0)
+    except ValueError:
+        stored_version = 0
+    # A newer pod may already have migrated further during a rolling
+    # restart; never re-run older DDL over it.
+    needs_ddl = stored_version < database.SCHEMA_VERSION
+    needs_vocab = bool(vocab_hash) and meta.get("vocabulary_file_hash") != vocab_hash
+    missing = [flag for flag, _, _, _ in BACKFILLS if not meta.get(flag)]
+    return needs_ddl, needs_vocab, missing
+
+
+def bootstrap(force: bool = False) -> dict:
+    """
+    Bring the database schema and vocabulary seed up to date.
+
+    Cheap when nothing changed (one metadata read, no lock, no DDL).
+    Otherwise takes pg_advisory_lock(BOOTSTRAP_LOCK_KEY), re-checks, and
+    does only the outstanding work, so concurrent workers and pods
+    starting together run the DDL exactly once.
+
+    Args:
+        force: re-run the DDL and vocabulary seed regardless of versions
+
+    Returns:
+        Dict with 'schema' and 'vocabulary' actions ('current', 'migrated',
+        'seeded', 'failed') and the 'backfilled' flags run, if any — or
+        {'skipped': reason} if no database.
+    """
+    if not database.is_db_configured():
+        return {"skipped": "database not configured"}
+
+    keys = ["schema_version", "vocabulary_file_hash"] + [flag for flag, _, _, _ in BACKFILLS]
+    vocab_hash = _vocabulary_file_hash()
+
+    needs_ddl, needs_vocab, missing = _pending_work(database.get_meta_many(keys), vocab_hash)
+    if not (force or needs_ddl or needs_vocab or missing):
+        return {"schema": "current", "vocabulary": "current"}
+
+    result = {"schema": "current", "vocabulary": "current"}
+    lock_conn = database.get_db_connection()
+    lock_conn.autocommit = True
+    lock_cur = lock_conn.cursor()
+    try:
+        lock_cur.execute("SELECT pg_advisory_lock(%s)", (database.BOOTSTRAP_LOCK_KEY,))
+        try:
+            # Another process may have finished while we waited for the lock
+            needs_ddl, needs_vocab, missing = _pending_work(database.get_meta_many(keys), vocab_hash)
+
+            if force or needs_ddl:
+                if not database.init_tables():
+                    result["schema"] = "failed"
+                    return result
+
+            for flag, label, rebuild, count_key in BACKFILLS:
+                if flag in missing:
+                    counts = getattr(database, rebuild)()
+                    database.set_meta(flag, counts[count_key])
+                    logger.info("%s built: %s", label, counts)
+                    result.setdefault("backfilled", []).append(flag)
+
+            # Only now: a backfill that raised leaves the version behind, so
+            # the next start re-checks everything instead of skipping it
+            if force or needs_ddl:
+                database.set_meta("schema_version", database.SCHEMA_VERSION)
+                result["schema"] = "migrated"
+
+            if force or needs_vocab:
+                import ontology  # deferred: only needed when the seed changed
+                ok, msg = ontology.sync_file_to_db()
+                logger.info("Vocabulary seed from file: %s — %s", ok, msg)
+                if ok:
+                    database.set_meta("vocabulary_file_hash", vocab_hash)
+                    result["vocabulary"] = "seeded"
+                else:
+                    result["vocabulary"] = "failed"
+        finally:
+            lock_cur.execute("SELECT pg_advisory_unlock(%s)", (database.BOOTSTRAP_LOCK_KEY,))
+    finally:
+        lock_cur.close()
+        lock_conn.close()
+
+    logger.info("Bootstrap: %s", result)
+    return result
+
+
+def ensure_ready() -> bool:
+    """
+    Per-process init. The first call runs bootstrap() (normally a single
+    metadata read); subsequent calls return immediately.
+
+    Returns:
+        True if the database is configured and bootstrapped.
+    """
+    global _ready
+    if _ready:
+        return True
+    with _ready_lock:
+        if _ready:
+            return True
+        if not database.is_db_configured():
+            return False
+        try:
+            result = bootstrap()
+        except Exception as exc:
+            logger.warning("Bootstrap failed (will retry on next call): %s", exc)
+            return False
+        _ready = "failed" not in result.values()
+        return _ready
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Bootstrap the ISAAC portal database")
+    parser.add_argument("--force", action="store_true", help="re-run DDL and vocabulary seed")
+    args = parser.parse_args()
+
+    outcome = bootstrap(force=args.force)
+    print(outcome)
+    sys.exit(1 if "failed" in outcome.values() else 0)
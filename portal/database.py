@@ -4,15 +4,61 @@ PostgreSQL connection for vocabulary, templates, and records storage
 """
 
 import os
+import sys
 import json
 import re
+import select
+import time
+import hashlib
 import logging
 from datetime import datetime
 import psycopg2
-from psycopg2.extras import RealDictCursor
+import psycopg2.errors
+from psycopg2.extras import RealDictCursor, execute_values
+
+import metrics
 
 logger = logging.getLogger("isaac-database")
 
+# Bump whenever init_tables() changes (new table, column, index, trigger or
+# function). bootstrap.py re-runs the DDL only when the stored version is
+# older than this.
+SCHEMA_VERSION = 12
+
+# pg_advisory_lock key serializing schema bootstrap across processes/pods
+BOOTSTRAP_LOCK_KEY = 0x15AAC0001
+# pg_advisory_xact_lock key serializing vocabulary cache writers
+VOCABULARY_LOCK_KEY = 0x15AAC0003
+
+# NOTIFY channel announcing vocabulary_cache changes (payload: content hash)
+VOCABULARY_CHANNEL = "isaac_vocabulary"
+
+# Sample record ids kept per (category, term) in vocabulary_term_usage
+TERM_USAGE_SAMPLES = 5
+
+
+class TimedCursor(RealDictCursor):
+    """
+    RealDictCursor that records each statement's duration in
+    metrics.DB_QUERY_SECONDS, labelled with the database.py function
+    that issued it (or 'other' for callers outside this module).
+    """
+
+    def execute(self, query, vars=None):
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_globals.get('__name__') != __name__:
+            frame = frame.f_back
+        operation = frame.f_code.co_name if frame is not None else 'other'
+
+        start = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        except Exception:
+            metrics.DB_QUERY_ERRORS.inc(operation=operation)
+            raise
+        finally:
+            metrics.DB_QUERY_SECONDS.observe(time.perf_counter() - start, operation=operation)
+
 
 def get_db_connection():
     """Create a database connection using environment variables"""
@@ -22,7 +68,7 @@ def get_db_connection():
         database=os.environ.get('PGDATABASE', 'app'),
         user=os.environ.get('PGUSER', 'postgres'),
         password=os.environ.get('PGPASSWORD', ''),
-        cursor_factory=RealDictCursor
+        cursor_factory=TimedCursor
     )
 
 
@@ -52,6 +98,15 @@ def init_tables():
         conn = get_db_connection()
         cur = conn.cursor()
 
+        # Key/value metadata (schema version, vocabulary file hash, ...)
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS portal_meta (
+                key VARCHAR(100) PRIMARY KEY,
+                value TEXT,
+                updated_at TIMESTAMPTZ DEFAULT NOW()
+            )
+        ''')
+
         # Create templates table
         cur.execute('''
             CREATE TABLE IF NOT EXISTS templates (
@@ -103,6 +158,390 @@ def init_tables():
         cur.execute('CREATE INDEX IF NOT EXISTS idx_records_created ON records(created_at)')
         cur.execute('CREATE INDEX IF NOT EXISTS idx_records_data_gin ON records USING GIN (data)')
 
+        # Summary counters for the dashboard, maintained by trigger so that
+        # reads never scan the records table.
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS record_stats (
+                record_type VARCHAR(50) NOT NULL,
+                record_domain VARCHAR(50) NOT NULL,
+                record_count BIGINT NOT NULL DEFAULT 0,
+                last_indexed TIMESTAMPTZ,
+                PRIMARY KEY (record_type, record_domain)
+            )
+        ''')
+
+        cur.execute('''
+            CREATE OR REPLACE FUNCTION record_stats_maintain()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                IF TG_OP = 'UPDATE'
+                   AND OLD.record_type = NEW.record_type
+                   AND OLD.record_domain = NEW.record_domain THEN
+                    RETURN NULL;
+                END IF;
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    UPDATE record_stats SET record_count = record_count - 1
+                    WHERE record_type = OLD.record_type
+                      AND record_domain = OLD.record_domain;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO record_stats (record_type, record_domain, record_count, last_indexed)
+                    VALUES (NEW.record_type, NEW.record_domain, 1, NEW.created_at)
+                    ON CONFLICT (record_type, record_domain) DO UPDATE SET
+                        record_count = record_stats.record_count + 1,
+                        last_indexed = GREATEST(record_stats.last_indexed, EXCLUDED.last_indexed);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+
+        cur.execute('''
+            CREATE OR REPLACE FUNCTION record_stats_reset()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                DELETE FROM record_stats;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+
+        cur.execute('DROP TRIGGER IF EXISTS records_stats ON records')
+        cur.execute('''
+            CREATE TRIGGER records_stats
+                AFTER INSERT OR UPDATE OF record_type, record_domain OR DELETE ON records
+                FOR EACH ROW
+                EXECUTE FUNCTION record_stats_maintain()
+        ''')
+        cur.execute('DROP TRIGGER IF EXISTS records_stats_truncate ON records')
+        cur.execute('''
+            CREATE TRIGGER records_stats_truncate
+                AFTER TRUNCATE ON records
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION record_stats_reset()
+        ''')
+
+        # Backfill counters once (first deploy onto an existing records table).
+        # The trigger DDL above holds a lock on records until commit, so no
+        # write can slip between the backfill and the trigger taking over.
+        cur.execute('''
+            INSERT INTO record_stats (record_type, record_domain, record_count, last_indexed)
+            SELECT record_type, record_domain, COUNT(*), MAX(created_at)
+            FROM records
+            WHERE NOT EXISTS (SELECT 1 FROM record_stats)
+            GROUP BY record_type, record_domain
+        ''')
+
+        # Write generation for result caches (query_cache.py): bumped once per
+        # statement that touches records. A sequence rather than a counter
+        # row, so concurrent writers never wait on each other; a rolled-back
+        # write only costs a spurious invalidation.
+        cur.execute('CREATE SEQUENCE IF NOT EXISTS records_write_seq')
+        cur.execute('''
+            CREATE OR REPLACE FUNCTION records_write_bump()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                PERFORM nextval('records_write_seq');
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+        cur.execute('DROP TRIGGER IF EXISTS records_write_generation ON records')
+        cur.execute('''
+            CREATE TRIGGER records_write_generation
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON records
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION records_write_bump()
+        ''')
+
+        # Stored validation outcome: stamped by save_record() and refreshed by
+        # the revalidation sweeper whenever validation.rules_version() moves.
+        cur.execute('''
+            ALTER TABLE records
+                ADD COLUMN IF NOT EXISTS validation_status VARCHAR(10),
+                ADD COLUMN IF NOT EXISTS validation_errors JSONB,
+                ADD COLUMN IF NOT EXISTS rules_version VARCHAR(32),
+                ADD COLUMN IF NOT EXISTS validated_at TIMESTAMPTZ
+        ''')
+        cur.execute('''
+            CREATE INDEX IF NOT EXISTS idx_records_invalid
+            ON records(created_at) WHERE validation_status = 'invalid'
+        ''')
+
+        # Compliance counters per (rules_version, status), trigger-maintained
+        # like record_stats so reporting never scans records.
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS record_validation_stats (
+                rules_version VARCHAR(32) NOT NULL,
+                validation_status VARCHAR(10) NOT NULL,
+                record_count BIGINT NOT NULL DEFAULT 0,
+                PRIMARY KEY (rules_version, validation_status)
+            )
+        ''')
+        cur.execute('''
+            CREATE OR REPLACE FUNCTION record_validation_stats_maintain()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                IF TG_OP = 'UPDATE'
+                   AND OLD.rules_version IS NOT DISTINCT FROM NEW.rules_version
+                   AND OLD.validation_status IS NOT DISTINCT FROM NEW.validation_status THEN
+                    RETURN NULL;
+                END IF;
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    UPDATE record_validation_stats SET record_count = record_count - 1
+                    WHERE rules_version = COALESCE(OLD.rules_version, '')
+                      AND validation_status = COALESCE(OLD.validation_status, 'unknown');
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO record_validation_stats (rules_version, validation_status, record_count)
+                    VALUES (COALESCE(NEW.rules_version, ''), COALESCE(NEW.validation_status, 'unknown'), 1)
+                    ON CONFLICT (rules_version, validation_status) DO UPDATE SET
+                        record_count = record_validation_stats.record_count + 1;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+        cur.execute('''
+            CREATE OR REPLACE FUNCTION record_validation_stats_reset()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                DELETE FROM record_validation_stats;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+        cur.execute('DROP TRIGGER IF EXISTS records_validation_stats ON records')
+        cur.execute('''
+            CREATE TRIGGER records_validation_stats
+                AFTER INSERT OR UPDATE OF validation_status, rules_version OR DELETE ON records
+                FOR EACH ROW
+                EXECUTE FUNCTION record_validation_stats_maintain()
+        ''')
+        cur.execute('DROP TRIGGER IF EXISTS records_validation_stats_truncate ON records')
+        cur.execute('''
+            CREATE TRIGGER records_validation_stats_truncate
+                AFTER TRUNCATE ON records
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION record_validation_stats_reset()
+        ''')
+        cur.execute('''
+            INSERT INTO record_validation_stats (rules_version, validation_status, record_count)
+            SELECT COALESCE(rules_version, ''), COALESCE(validation_status, 'unknown'), COUNT(*)
+            FROM records
+            WHERE NOT EXISTS (SELECT 1 FROM record_validation_stats)
+            GROUP BY 1, 2
+        ''')
+
+        # Vocabulary term usage: record_terms is the (record, category, term)
+        # index, vocabulary_term_usage its per-term rollup. Both are kept in
+        # step by save_record()/delete_record(); rebuild_term_usage() repairs.
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS record_terms (
+                record_id CHAR(26) NOT NULL REFERENCES records(record_id) ON DELETE CASCADE,
+                category VARCHAR(255) NOT NULL,
+                term TEXT NOT NULL,
+                PRIMARY KEY (record_id, category, term)
+            )
+        ''')
+        # (category, term, record_id): usage top-ups and keyset scans for term rewrites
+        cur.execute('DROP INDEX IF EXISTS idx_record_terms_category_term')
+        cur.execute('''
+            CREATE INDEX IF NOT EXISTS idx_record_terms_term_record
+            ON record_terms(category, term, record_id)
+        ''')
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS vocabulary_term_usage (
+                category VARCHAR(255) NOT NULL,
+                term TEXT NOT NULL,
+                record_count BIGINT NOT NULL DEFAULT 0,
+                sample_record_ids TEXT[] NOT NULL DEFAULT '{}',
+                updated_at TIMESTAMPTZ DEFAULT NOW(),
+                PRIMARY KEY (category, term)
+            )
+        ''')
+
+        # Flattened descriptors (one row per descriptors[] entry) for the
+        # agent's descriptor_stats / search tools; replaced by save_record().
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS record_descriptors (
+                record_id CHAR(26) NOT NULL REFERENCES records(record_id) ON DELETE CASCADE,
+                name TEXT NOT NULL,
+                kind TEXT,
+                unit TEXT NOT NULL DEFAULT '',
+                value DOUBLE PRECISION
+            )
+        ''')
+        # Unbounded like the record fields they copy; a derived index must
+        # never reject a valid record (schema 10 widened the VARCHARs)
+        cur.execute('''
+            ALTER TABLE record_descriptors
+                ALTER COLUMN name TYPE TEXT,
+                ALTER COLUMN kind TYPE TEXT,
+                ALTER COLUMN unit TYPE TEXT
+        ''')
+        # text_pattern_ops: serves both name = x and name LIKE 'class.%'
+        cur.execute('''
+            CREATE INDEX IF NOT EXISTS idx_record_descriptors_name
+            ON record_descriptors(name text_pattern_ops, unit)
+        ''')
+        cur.execute('''
+            CREATE INDEX IF NOT EXISTS idx_record_descriptors_record
+            ON record_descriptors(record_id)
+        ''')
+        # Records per descriptor name (facet_counts('descriptor')), kept in
+        # step by save_record()/delete_record() like vocabulary_term_usage;
+        # filled by the descriptor_usage_built bootstrap backfill.
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS descriptor_usage (
+                name TEXT PRIMARY KEY,
+                record_count BIGINT NOT NULL DEFAULT 0
+            )
+        ''')
+
+        # Overview rollups per material (formula, else name), technique,
+        # facility and reaction: record counts per domain with time ranges,
+        # and numeric descriptor sums. Trigger-maintained like record_stats;
+        # counts and sums are exact, first/last_created and value_min/max only
+        # widen until reconcile_rollups() recomputes them.
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS record_rollups (
+                dimension VARCHAR(20) NOT NULL,
+                key TEXT NOT NULL,
+                record_domain VARCHAR(50) NOT NULL,
+                record_count BIGINT NOT NULL DEFAULT 0,
+                first_created TIMESTAMPTZ,
+                last_created TIMESTAMPTZ,
+                PRIMARY KEY (dimension, key, record_domain)
+            )
+        ''')
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS record_rollup_descriptors (
+                dimension VARCHAR(20) NOT NULL,
+                key TEXT NOT NULL,
+                descriptor TEXT NOT NULL,
+                unit TEXT NOT NULL,
+                value_count BIGINT NOT NULL DEFAULT 0,
+                value_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+                value_sumsq DOUBLE PRECISION NOT NULL DEFAULT 0,
+                value_min DOUBLE PRECISION,
+                value_max DOUBLE PRECISION,
+                PRIMARY KEY (dimension, key, descriptor, unit)
+            )
+        ''')
+        cur.execute('''
+            ALTER TABLE record_rollup_descriptors
+                ALTER COLUMN descriptor TYPE TEXT,
+                ALTER COLUMN unit TYPE TEXT
+        ''')
+        cur.execute('''
+            CREATE OR REPLACE FUNCTION record_rollup_keys(doc JSONB)
+            RETURNS TABLE (dimension TEXT, key TEXT) AS $$
+                SELECT d, k FROM (VALUES
+                    ('material', COALESCE(NULLIF(doc->'sample'->'material'->>'formula', ''),
+                                          NULLIF(doc->'sample'->'material'->>'name', ''))),
+                    ('technique', NULLIF(doc->'system'->>'technique', '')),
+                    ('facility', NULLIF(doc->'system'->'facility'->>'facility_name', '')),
+                    ('reaction', NULLIF(NULLIF(doc->'context'->'electrochemistry'->>'reaction', ''), 'None'))
+                ) AS v(d, k)
+                WHERE k IS NOT NULL
+            $$ LANGUAGE sql IMMUTABLE
+        ''')
+        cur.execute('''
+            CREATE OR REPLACE FUNCTION record_rollup_values(doc JSONB)
+            RETURNS TABLE (descriptor TEXT, unit TEXT, value_count BIGINT, value_sum DOUBLE PRECISION,
+                           value_sumsq DOUBLE PRECISION, value_min DOUBLE PRECISION,
+                           value_max DOUBLE PRECISION) AS $$
+                SELECT d->>'name', COALESCE(d->>'unit', ''), COUNT(*),
+                       SUM(x), SUM(CASE WHEN abs(x) < 1e-150 THEN 0 ELSE x * x END),
+                       MIN(x), MAX(x)
+                FROM jsonb_array_elements(CASE WHEN jsonb_typeof(doc->'descriptors'->'outputs') = 'array'
+                                               THEN doc->'descriptors'->'outputs' ELSE '[]' END) AS o,
+                     jsonb_array_elements(CASE WHEN jsonb_typeof(o->'descriptors') = 'array'
+                                               THEN o->'descriptors' ELSE '[]' END) AS d,
+                     LATERAL (SELECT CASE WHEN jsonb_typeof(d->'value') = 'number'
+                                          THEN (d->'value')::numeric END AS n) AS num,
+                     -- Derived stats must never reject a valid record: magnitudes
+                     -- whose square or sum could overflow double precision are
+                     -- left out, tiny ones square to 0 instead of underflowing
+                     LATERAL (SELECT CASE WHEN abs(n) < 1e150 AND (n = 0 OR abs(n) > 1e-300)
+                                          THEN n::float8 END AS x) AS v
+                WHERE d ? 'name' AND x IS NOT NULL
+                GROUP BY 1, 2
+            $$ LANGUAGE sql IMMUTABLE
+        ''')
+        cur.execute('''
+            CREATE OR REPLACE FUNCTION record_rollups_apply(doc JSONB, rec_domain TEXT,
+                                                            created TIMESTAMPTZ, sign INT)
+            RETURNS VOID AS $$
+            BEGIN
+                INSERT INTO record_rollups AS r
+                    (dimension, key, record_domain, record_count, first_created, last_created)
+                SELECT k.dimension, k.key, rec_domain, sign, created, created
+                FROM record_rollup_keys(doc) k
+                ON CONFLICT (dimension, key, record_domain) DO UPDATE SET
+                    record_count = r.record_count + sign,
+                    first_created = CASE WHEN sign > 0 THEN LEAST(r.first_created, created)
+                                         ELSE r.first_created END,
+                    last_created = CASE WHEN sign > 0 THEN GREATEST(r.last_created, created)
+                                        ELSE r.last_created END;
+
+                INSERT INTO record_rollup_descriptors AS r
+                    (dimension, key, descriptor, unit, value_count, value_sum, value_sumsq,
+                     value_min, value_max)
+                SELECT k.dimension, k.key, v.descriptor, v.unit, sign * v.value_count,
+                       sign * v.value_sum, sign * v.value_sumsq, v.value_min, v.value_max
+                FROM record_rollup_keys(doc) k, record_rollup_values(doc) v
+                ON CONFLICT (dimension, key, descriptor, unit) DO UPDATE SET
+                    value_count = r.value_count + EXCLUDED.value_count,
+                    value_sum = r.value_sum + EXCLUDED.value_sum,
+                    value_sumsq = r.value_sumsq + EXCLUDED.value_sumsq,
+                    value_min = CASE WHEN sign > 0 THEN LEAST(r.value_min, EXCLUDED.value_min)
+                                     ELSE r.value_min END,
+                    value_max = CASE WHEN sign > 0 THEN GREATEST(r.value_max, EXCLUDED.value_max)
+                                     ELSE r.value_max END;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+        cur.execute('''
+            CREATE OR REPLACE FUNCTION record_rollups_maintain()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    PERFORM record_rollups_apply(OLD.data, OLD.record_domain, OLD.created_at, -1);
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    PERFORM record_rollups_apply(NEW.data, NEW.record_domain, NEW.created_at, 1);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+        cur.execute('''
+            CREATE OR REPLACE FUNCTION record_rollups_reset()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                DELETE FROM record_rollups;
+                DELETE FROM record_rollup_descriptors;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+        cur.execute('DROP TRIGGER IF EXISTS records_rollups ON records')
+        cur.execute('''
+            CREATE TRIGGER records_rollups
+                AFTER INSERT OR UPDATE OF data, record_domain OR DELETE ON records
+                FOR EACH ROW
+                EXECUTE FUNCTION record_rollups_maintain()
+        ''')
+        cur.execute('DROP TRIGGER IF EXISTS records_rollups_truncate ON records')
+        cur.execute('''
+            CREATE TRIGGER records_rollups_truncate
+                AFTER TRUNCATE ON records
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION record_rollups_reset()
+        ''')
+
         # Create portal access log table
         cur.execute('''
             CREATE TABLE IF NOT EXISTS portal_access_log (
@@ -112,6 +551,66 @@ def init_tables():
             )
         ''')
 
+        # API audit trail (written in batches by portal/audit.py)
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS api_audit_log (
+                id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                occurred_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                method VARCHAR(10) NOT NULL,
+                path TEXT NOT NULL,
+                status INT,
+                username TEXT,
+                auth_method VARCHAR(30),
+                duration_ms REAL,
+                remote_addr TEXT
+            )
+        ''')
+        # Widened in schema 11: a value over the limit failed its whole batch
+        cur.execute('''
+            ALTER TABLE api_audit_log
+                ALTER COLUMN username TYPE TEXT,
+                ALTER COLUMN remote_addr TYPE TEXT
+        ''')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_api_audit_occurred ON api_audit_log(occurred_at)')
+
+        # Single-row visit counter, maintained per INSERT statement
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS portal_access_stats (
+                id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+                total_visits BIGINT NOT NULL DEFAULT 0,
+                last_access TIMESTAMPTZ
+            )
+        ''')
+
+        cur.execute('''
+            CREATE OR REPLACE FUNCTION portal_access_stats_maintain()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                INSERT INTO portal_access_stats (id, total_visits, last_access)
+                SELECT TRUE, COUNT(*), MAX(accessed_at) FROM new_rows
+                ON CONFLICT (id) DO UPDATE SET
+                    total_visits = portal_access_stats.total_visits + EXCLUDED.total_visits,
+                    last_access = GREATEST(portal_access_stats.last_access, EXCLUDED.last_access);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+
+        cur.execute('DROP TRIGGER IF EXISTS portal_access_log_stats ON portal_access_log')
+        cur.execute('''
+            CREATE TRIGGER portal_access_log_stats
+                AFTER INSERT ON portal_access_log
+                REFERENCING NEW TABLE AS new_rows
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION portal_access_stats_maintain()
+        ''')
+
+        cur.execute('''
+            INSERT INTO portal_access_stats (id, total_visits, last_access)
+            SELECT TRUE, COUNT(*), MAX(accessed_at) FROM portal_access_log
+            ON CONFLICT (id) DO NOTHING
+        ''')
+
         # Cached vocabulary parsed from wiki
         cur.execute('''
             CREATE TABLE IF NOT EXISTS vocabulary_cache (
@@ -157,6 +656,21 @@ def init_tables():
             )
         ''')
 
+        # Asynchronously drafted wiki prose (see drafts.py)
+        cur.execute('''
+            ALTER TABLE vocabulary_proposals
+                ADD COLUMN IF NOT EXISTS draft_status VARCHAR(20),
+                ADD COLUMN IF NOT EXISTS draft_key VARCHAR(64),
+                ADD COLUMN IF NOT EXISTS draft_yaml_description TEXT,
+                ADD COLUMN IF NOT EXISTS draft_wiki_prose TEXT,
+                ADD COLUMN IF NOT EXISTS draft_error TEXT,
+                ADD COLUMN IF NOT EXISTS drafted_at TIMESTAMPTZ
+        ''')
+        cur.execute('''
+            CREATE INDEX IF NOT EXISTS idx_proposals_draft_key
+            ON vocabulary_proposals (draft_key) WHERE draft_status = 'ready'
+        ''')
+
         conn.commit()
         cur.close()
         conn.close()
@@ -166,6 +680,62 @@ def init_tables():
         return False
 
 
+# =============================================================================
+# Portal Metadata
+# =============================================================================
+
+def get_meta(key: str, default=None):
+    """
+    Read a value from portal_meta.
+
+    Returns *default* if the key is absent or the table does not exist yet.
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('SELECT value FROM portal_meta WHERE key = %s', (key,))
+        row = cur.fetchone()
+        return row['value'] if row else default
+    except psycopg2.errors.UndefinedTable:
+        return default
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_meta_many(keys: list) -> dict:
+    """Read several portal_meta keys in one round trip ({} if the table is missing)."""
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('SELECT key, value FROM portal_meta WHERE key = ANY(%s)', (list(keys),))
+        return {row['key']: row['value'] for row in cur.fetchall()}
+    except psycopg2.errors.UndefinedTable:
+        return {}
+    finally:
+        cur.close()
+        conn.close()
+
+
+def set_meta(key: str, value) -> None:
+    """Upsert a value into portal_meta (stored as text)."""
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('''
+            INSERT INTO portal_meta (key, value, updated_at)
+            VALUES (%s, %s, NOW())
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = NOW()
+        ''', (key, None if value is None else str(value)))
+        conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+
+
 # =============================================================================
 # Record Operations
 # =============================================================================
@@ -202,11 +772,13 @@ def save_record(record_data: dict, *, skip_validation: bool = False) -> str:
             "save_record VALIDATION BYPASS (skip_validation=True) for record_id=%s",
             record_data.get('record_id'),
         )
+        validation_status = rules_version = None
     else:
         import validation  # deferred: validation imports ontology at module load
         result = validation.validate_record_full(record_data)
         if not result["valid"]:
             raise validation.ValidationError(result)
+        validation_status, rules_version = 'valid', validation.rules_version()
 
     record_id = record_data.get('record_id')
     record_type = record_data.get('record_type')
@@ -224,16 +796,24 @@ def save_record(record_data: dict, *, skip_validation: bool = False) -> str:
 
     try:
         cur.execute('''
-            INSERT INTO records (record_id, record_type, record_domain, data)
-            VALUES (%s, %s, %s, %s)
+            INSERT INTO records (record_id, record_type, record_domain, data,
+                                 validation_status, validation_errors, rules_version, validated_at)
+            VALUES (%s, %s, %s, %s, %s, NULL, %s, CASE WHEN %s IS NULL THEN NULL ELSE NOW() END)
             ON CONFLICT (record_id) DO UPDATE SET
                 record_type = EXCLUDED.record_type,
                 record_domain = EXCLUDED.record_domain,
-                data = EXCLUDED.data
+                data = EXCLUDED.data,
+                validation_status = EXCLUDED.validation_status,
+                validation_errors = NULL,
+                rules_version = EXCLUDED.rules_version,
+                validated_at = EXCLUDED.validated_at
             RETURNING record_id
-        ''', (record_id, record_type, record_domain, json.dumps(record_data)))
+        ''', (record_id, record_type, record_domain, json.dumps(record_data),
+              validation_status, rules_version, validation_status))
 
         result = cur.fetchone()
+        _update_record_terms(cur, record_id, _record_terms(record_data))
+        _update_record_descriptors(cur, record_id, record_data)
         conn.commit()
         return result['record_id'].strip()
     finally:
@@ -241,6 +821,121 @@ def save_record(record_data: dict, *, skip_validation: bool = False) -> str:
         conn.close()
 
 
+def _record_terms(record_data: dict) -> set:
+    """{(category, term)} for the vocabulary-controlled values in a record."""
+    import ontology  # deferred: ontology imports this module
+    return ontology.extract_record_terms(record_data)
+
+
+def _record_descriptors(record_id: str, record_data: dict) -> list:
+    """record_descriptors rows (record_id, name, kind, unit, value) for a record."""
+    rows = []
+    for output in (record_data.get('descriptors') or {}).get('outputs') or []:
+        for d in output.get('descriptors') or []:
+            if not isinstance(d, dict) or not d.get('name'):
+                continue
+            value = d.get('value')
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                try:
+                    value = float(value)
+                except OverflowError:  # JSON integers are unbounded
+                    value = None
+            else:
+                value = None
+            rows.append((record_id, str(d['name']), d.get('kind'), d.get('unit') or '', value))
+    return rows
+
+
+def _update_record_descriptors(cur, record_id: str, record_data: dict) -> None:
+    """
+    Replace record_descriptors for *record_id* and apply the change in
+    descriptor names to descriptor_usage, inside the caller's transaction.
+    """
+    cur.execute('DELETE FROM record_descriptors WHERE record_id = %s RETURNING name', (record_id,))
+    old_names = {r['name'] for r in cur.fetchall()}
+    rows = _record_descriptors(record_id, record_data)
+    if rows:
+        execute_values(cur, '''
+            INSERT INTO record_descriptors (record_id, name, kind, unit, value) VALUES %s
+        ''', rows)
+
+    new_names = {r[1] for r in rows}
+    # Sorted so concurrent saves lock usage rows in the same order
+    deltas = sorted([(n, 1) for n in new_names - old_names]
+                    + [(n, -1) for n in old_names - new_names])
+    if deltas:
+        execute_values(cur, '''
+            INSERT INTO descriptor_usage AS u (name, record_count) VALUES %s
+            ON CONFLICT (name) DO UPDATE SET
+                record_count = GREATEST(u.record_count + EXCLUDED.record_count, 0)
+        ''', deltas, template='(%s, GREATEST(%s, 0))', page_size=len(deltas))
+
+
+def _update_record_terms(cur, record_id: str, terms: set) -> None:
+    """
+    Bring record_terms for *record_id* to *terms* and apply the difference
+    to vocabulary_term_usage, inside the caller's transaction.
+    """
+    cur.execute(
+        'SELECT category, term FROM record_terms WHERE record_id = %s FOR UPDATE',
+        (record_id,),
+    )
+    current = {(r['category'], r['term']) for r in cur.fetchall()}
+    # Sorted so concurrent saves lock usage rows in the same order
+    added = sorted(terms - current)
+    removed = sorted(current - terms)
+    sample_id = record_id.strip()
+
+    if removed:
+        categories = [c for c, _ in removed]
+        term_values = [t for _, t in removed]
+        cur.execute('''
+            DELETE FROM record_terms
+            WHERE record_id = %s
+              AND (category, term) IN (SELECT * FROM unnest(%s::text[], %s::text[]))
+        ''', (record_id, categories, term_values))
+        cur.execute('''
+            UPDATE vocabulary_term_usage u
+            SET record_count = GREATEST(u.record_count - 1, 0),
+                sample_record_ids = array_remove(u.sample_record_ids, %s),
+                updated_at = NOW()
+            FROM unnest(%s::text[], %s::text[]) AS gone (category, term)
+            WHERE u.category = gone.category AND u.term = gone.term
+        ''', (sample_id, categories, term_values))
+        # Top up samples that just lost this record from the remaining users
+        cur.execute('''
+            UPDATE vocabulary_term_usage u
+            SET sample_record_ids = ARRAY(
+                SELECT rtrim(rt.record_id) FROM record_terms rt
+                WHERE rt.category = u.category AND rt.term = u.term
+                ORDER BY rt.record_id
+                LIMIT %s
+            )
+            FROM unnest(%s::text[], %s::text[]) AS gone (category, term)
+            WHERE u.category = gone.category AND u.term = gone.term
+              AND cardinality(u.sample_record_ids) < LEAST(u.record_count, %s)
+        ''', (TERM_USAGE_SAMPLES, categories, term_values, TERM_USAGE_SAMPLES))
+
+    if added:
+        execute_values(cur, '''
+            INSERT INTO record_terms (record_id, category, term) VALUES %s
+            ON CONFLICT DO NOTHING
+        ''', [(record_id, c, t) for c, t in added])
+        execute_values(cur, f'''
+            INSERT INTO vocabulary_term_usage AS u (category, term, record_count, sample_record_ids)
+            VALUES %s
+            ON CONFLICT (category, term) DO UPDATE SET
+                record_count = u.record_count + 1,
+                sample_record_ids = CASE
+                    WHEN cardinality(u.sample_record_ids) < {int(TERM_USAGE_SAMPLES)}
+                    THEN u.sample_record_ids || EXCLUDED.sample_record_ids
+                    ELSE u.sample_record_ids
+                END,
+                updated_at = NOW()
+        ''', [(c, t, 1, [sample_id]) for c, t in added],
+            template='(%s, %s, %s, %s::text[])')
+
+
 def get_record(record_id: str) -> dict:
     """
     Retrieve a record by its ID.
@@ -267,34 +962,50 @@ def get_record(record_id: str) -> dict:
         conn.close()
 
 
-def list_records(limit: int = 100, offset: int = 0) -> list:
+def list_records(limit: int = 100, offset: int = 0, validation_status: str = None) -> list:
     """
     List all records with pagination.
 
     Args:
         limit: Maximum number of records to return
         offset: Number of records to skip
+        validation_status: Only records with this stored status
+            ('valid', 'invalid', or 'unknown' for never-validated)
 
     Returns:
-        List of record summaries (record_id, record_type, record_domain, created_at)
+        List of record summaries (record_id, record_type, record_domain,
+        created_at, validation_status, rules_version, validated_at)
     """
     conn = get_db_connection()
     cur = conn.cursor()
 
+    where = ''
+    params = []
+    if validation_status == 'unknown':
+        where = 'WHERE validation_status IS NULL'
+    elif validation_status:
+        where = 'WHERE validation_status = %s'
+        params.append(validation_status)
+
     try:
-        cur.execute('''
-            SELECT record_id, record_type, record_domain, created_at
+        cur.execute(f'''
+            SELECT record_id, record_type, record_domain, created_at,
+                   validation_status, rules_version, validated_at
             FROM records
+            {where}
             ORDER BY created_at DESC
             LIMIT %s OFFSET %s
-        ''', (limit, offset))
+        ''', (*params, limit, offset))
 
         rows = cur.fetchall()
         return [{
             'record_id': row['record_id'].strip(),
             'record_type': row['record_type'],
             'record_domain': row['record_domain'],
-            'created_at': row['created_at'].isoformat() if row['created_at'] else None
+            'created_at': row['created_at'].isoformat() if row['created_at'] else None,
+            'validation_status': row['validation_status'] or 'unknown',
+            'rules_version': row['rules_version'],
+            'validated_at': row['validated_at'].isoformat() if row['validated_at'] else None,
         } for row in rows]
     finally:
         cur.close()
@@ -315,6 +1026,8 @@ def delete_record(record_id: str) -> bool:
     cur = conn.cursor()
 
     try:
+        _update_record_terms(cur, record_id, set())
+        _update_record_descriptors(cur, record_id, {})
         cur.execute('DELETE FROM records WHERE record_id = %s RETURNING record_id', (record_id,))
         deleted = cur.fetchone()
         conn.commit()
@@ -325,20 +1038,105 @@ def delete_record(record_id: str) -> bool:
 
 
 def count_records() -> int:
-    """Return the total number of records in the database."""
+    """
+    Return the total number of records in the database.
+
+    Reads the trigger-maintained record_stats counters (created and
+    backfilled by init_tables()).
+    """
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        cur.execute('SELECT COUNT(*) as count FROM records')
-        row = cur.fetchone()
-        return row['count']
+        cur.execute('SELECT COALESCE(SUM(record_count), 0) AS count FROM record_stats')
+        return int(cur.fetchone()['count'])
     finally:
         cur.close()
         conn.close()
 
 
-def execute_readonly_query(sql: str, max_rows: int = 50, timeout_ms: int = 5000) -> list:
+# Planner estimates above which execute_readonly_query() refuses to run a
+# query (checked with EXPLAIN before execution; 0 disables a limit). The
+# total cost of the (limited) plan is the default gate. The per-step row
+# limit is opt-in: the planner guesses 100 rows per jsonb_array_elements
+# call, so an aggregate over two nested expansions is estimated at 10,000
+# rows per record however small the arrays really are.
+QUERY_MAX_COST = float(os.environ.get('ISAAC_QUERY_MAX_COST', 500_000))
+QUERY_MAX_PLAN_ROWS = int(os.environ.get('ISAAC_QUERY_MAX_PLAN_ROWS', 0))
+
+
+class QueryCostError(ValueError):
+    """
+    A read-only query rejected on its EXPLAIN estimate before running.
+
+    Attributes:
+        details: {'total_cost', 'max_cost', 'plan_rows', 'max_plan_rows',
+            'worst_node'} — structured so the agent can report it to the LLM
+    """
+
+    def __init__(self, details: dict):
+        self.details = details
+        def limit(value):
+            return f"limit {value:,.0f}" if value else "no limit"
+
+        super().__init__(
+            f"Query rejected before execution: estimated cost {details['total_cost']:,.0f} "
+            f"({limit(details['max_cost'])}), up to {details['plan_rows']:,} rows in one "
+            f"plan step ({limit(details['max_plan_rows'])}); largest step: "
+            f"{details['worst_node']}. Narrow the query (filter before expanding JSONB "
+            f"arrays, avoid cross joins) and try again."
+        )
+
+
+# Plan nodes that read their whole input before emitting a row: a LIMIT
+# above them does not shorten the work below them
+_BLOCKING_NODES = {'Sort', 'Incremental Sort', 'Hash', 'Materialize', 'WindowAgg', 'SetOp'}
+
+
+def _plan_estimate(plan: dict) -> dict:
+    """
+    Top-level cost and the largest row estimate anywhere in an EXPLAIN
+    (FORMAT JSON) plan.
+
+    Row estimates are those of the rows actually pulled: under a Limit the
+    planner still reports each streaming node's full output (it guesses 100
+    rows per jsonb_array_elements call), so they are scaled by the fraction
+    the Limit consumes, until a blocking node (sort, hash, aggregate, init
+    plan) that reads its whole input regardless.
+    """
+    worst = {'rows': 0, 'node': plan.get('Node Type', '?')}
+
+    def _walk(node, fraction):
+        rows = node.get('Plan Rows', 0) * fraction
+        if rows > worst['rows']:
+            worst['rows'] = rows
+            worst['node'] = node.get('Node Type', '?')
+            if node.get('Function Name') or node.get('Relation Name'):
+                worst['node'] += f" on {node.get('Function Name') or node.get('Relation Name')}"
+
+        node_type = node.get('Node Type')
+        if node_type == 'Limit':
+            below = max((c.get('Plan Rows', 0) for c in node.get('Plans', ())
+                         if c.get('Parent Relationship') == 'Outer'), default=0)
+            if below:
+                fraction = min(fraction, node.get('Plan Rows', 0) / below)
+        elif node_type in _BLOCKING_NODES or (node_type == 'Aggregate'
+                                                and node.get('Strategy') != 'Sorted'):
+            fraction = 1.0
+
+        for child in node.get('Plans', ()):
+            if child.get('Parent Relationship') in ('InitPlan', 'SubPlan'):
+                _walk(child, 1.0)
+            else:
+                _walk(child, fraction)
+
+    _walk(plan, 1.0)
+    return {'total_cost': plan.get('Total Cost', 0.0), 'plan_rows': int(round(worst['rows'])),
+            'worst_node': worst['node']}
+
+
+def execute_readonly_query(sql: str, max_rows: int = 50, timeout_ms: int = 5000,
+                           max_cost: float = None, max_plan_rows: int = None) -> list:
     """
     Execute a read-only SQL query against the database.
 
@@ -346,43 +1144,654 @@ def execute_readonly_query(sql: str, max_rows: int = 50, timeout_ms: int = 5000)
     - Only SELECT and WITH (CTE) statements are allowed
     - Mutation keywords (INSERT, UPDATE, DELETE, DROP, ALTER, etc.) are rejected
     - A LIMIT clause is enforced (appended if missing)
-    - A statement timeout is set to prevent long-running queries
+    - The query runs in a READ ONLY transaction with a transaction-scoped
+      statement timeout, and is always rolled back
+    - The planner's estimate is checked with EXPLAIN first; queries above
+      the cost / row limits are rejected without running
 
     Args:
         sql: The SQL query string (must be SELECT or WITH)
         max_rows: Maximum rows to return (default 50)
         timeout_ms: Statement timeout in milliseconds (default 5000)
+        max_cost: Planner total cost limit (default QUERY_MAX_COST)
+        max_plan_rows: Row estimate limit for any plan step (default
+            QUERY_MAX_PLAN_ROWS)
+
+    Returns:
+        List of row dicts from the query result
+
+    Raises:
+        ValueError: If the query is not a safe read-only SELECT/WITH
+        QueryCostError: If the plan estimate exceeds a limit
+    """
+    stripped = sql.strip().rstrip(";")
+    upper = stripped.upper()
+
+    # Must start with SELECT or WITH
+    if not (upper.startswith("SELECT") or upper.startswith("WITH")):
+        raise ValueError("Only SELECT or WITH (CTE) queries are allowed.")
+
+    # Reject mutation keywords anywhere in the query
+    forbidden = r'\b(INSERT|UPDATE|DELETE|DROP|ALTER|TRUNCATE|CREATE|GRANT|REVOKE|COPY|EXECUTE|CALL)\b'
+    if re.search(forbidden, upper):
+        raise ValueError("Query contains forbidden mutation keywords.")
+
+    # Enforce LIMIT if not present
+    if "LIMIT" not in upper:
+        stripped += f" LIMIT {max_rows}"
+
+    max_cost = QUERY_MAX_COST if max_cost is None else max_cost
+    max_plan_rows = QUERY_MAX_PLAN_ROWS if max_plan_rows is None else max_plan_rows
+
+    conn = get_db_connection()
+    conn.set_session(readonly=True)
+    cur = conn.cursor()
+
+    try:
+        cur.execute("SELECT set_config('statement_timeout', %s, true)", (str(int(timeout_ms)),))
+
+        if max_cost or max_plan_rows:
+            cur.execute(f"EXPLAIN (FORMAT JSON) {stripped}")
+            plan = cur.fetchone()['QUERY PLAN']
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = _plan_estimate(plan[0]['Plan'])
+            if ((max_cost and estimate['total_cost'] > max_cost)
+                    or (max_plan_rows and estimate['plan_rows'] > max_plan_rows)):
+                raise QueryCostError({**estimate, 'max_cost': max_cost,
+                                      'max_plan_rows': max_plan_rows})
+
+        cur.execute(stripped)
+        rows = cur.fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.rollback()
+        cur.close()
+        conn.close()
+
+
+def get_records_generation():
+    """
+    Current records write generation (records_write_seq), or None if the
+    sequence does not exist yet. Any change means cached query results
+    over records may be stale.
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('SELECT last_value, is_called FROM records_write_seq')
+        row = cur.fetchone()
+        return row['last_value'] if row['is_called'] else 0
+    except psycopg2.errors.UndefinedTable:
+        return None
+    finally:
+        cur.close()
+        conn.close()
+
+
+# =============================================================================
+# Stored Validation Status
+# =============================================================================
+
+def list_stale_records(rules_version: str, after_id: int = 0, limit: int = 200) -> list:
+    """
+    Records not yet validated under *rules_version*, in id order.
+
+    Keyset pagination: pass the last 'id' returned as *after_id*.
+
+    Returns:
+        List of {'id', 'record_id', 'data', 'row_version'}; row_version
+        (the row's xmin) changes whenever the record is written again
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('''
+            SELECT id, rtrim(record_id) AS record_id, data, xmin::text AS row_version
+            FROM records
+            WHERE id > %s AND rules_version IS DISTINCT FROM %s
+            ORDER BY id
+            LIMIT %s
+        ''', (after_id, rules_version, limit))
+        return [dict(row) for row in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+
+def store_validation_results(results: list):
+    """
+    Persist re-validation outcomes in one statement.
+
+    A record saved again since list_stale_records() read it is left alone:
+    that save already stamped its own verdict on the new data.
+
+    Args:
+        results: [(record_id, row_version from list_stale_records,
+            'valid'|'invalid', errors dict or None, rules_version)]
+
+    Returns:
+        Number of records updated
+    """
+    if not results:
+        return 0
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        execute_values(cur, '''
+            UPDATE records AS r SET
+                validation_status = v.status,
+                validation_errors = v.errors::jsonb,
+                rules_version = v.rules_version,
+                validated_at = NOW()
+            FROM (VALUES %s) AS v(record_id, row_version, status, errors, rules_version)
+            WHERE r.record_id = v.record_id AND r.xmin::text = v.row_version
+        ''', [
+            (record_id, row_version, status,
+             json.dumps(errors) if errors is not None else None, version)
+            for record_id, row_version, status, errors, version in results
+        ], page_size=len(results))
+        updated = cur.rowcount
+        conn.commit()
+        return updated
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_validation_summary(rules_version: str = None) -> dict:
+    """
+    Compliance counts from the record_validation_stats counters (no scan).
+
+    Args:
+        rules_version: the current rules version; records stamped with any
+            other version (or never validated) count as 'stale'
+
+    Returns:
+        Dict with 'total', 'valid', 'invalid' (current rules), 'stale',
+        'rules_version' and 'by_version' [{rules_version, validation_status,
+        record_count}]
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('''
+            SELECT rules_version, validation_status, record_count
+            FROM record_validation_stats
+            WHERE record_count > 0
+            ORDER BY rules_version, validation_status
+        ''')
+        rows = [dict(row) for row in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+    total = sum(r['record_count'] for r in rows)
+    current = {r['validation_status']: r['record_count']
+               for r in rows if r['rules_version'] == (rules_version or '')}
+    valid = current.get('valid', 0)
+    invalid = current.get('invalid', 0)
+    return {
+        'rules_version': rules_version,
+        'total': total,
+        'valid': valid,
+        'invalid': invalid,
+        'stale': total - valid - invalid,
+        'by_version': rows,
+    }
+
+
+# =============================================================================
+# Agent Search (indexed paths behind nano ISAAC's tools)
+# =============================================================================
+
+def _record_summary(row: dict) -> dict:
+    return {
+        'record_id': row['record_id'].strip(),
+        'record_type': row['record_type'],
+        'record_domain': row['record_domain'],
+        'material': row.get('material'),
+        'technique': row.get('technique'),
+        'created_at': row['created_at'].isoformat() if row.get('created_at') else None,
+    }
+
+
+_SUMMARY_COLUMNS = '''
+    r.record_id, r.record_type, r.record_domain, r.created_at,
+    r.data->'sample'->'material'->>'name' AS material,
+    r.data->'system'->>'technique' AS technique
+'''
+
+
+def search_records(filters: dict, limit: int = 20) -> list:
+    """
+    Find records by filters, each served by an index.
+
+    Args:
+        filters: any of
+            record_type, record_domain   — records columns (btree)
+            terms: {category: term}      — record_terms (category, term, record_id)
+            material: exact sample.material.name — GIN containment on data
+            descriptor: descriptor name, or 'class.' prefix — record_descriptors
+            created_after, created_before: ISO timestamps — idx_records_created
+        limit: maximum records returned (newest first)
+
+    Returns:
+        List of record summaries (record_id, record_type, record_domain,
+        material, technique, created_at)
+    """
+    where = []
+    params = []
+    if filters.get('record_type'):
+        where.append('r.record_type = %s')
+        params.append(filters['record_type'])
+    if filters.get('record_domain'):
+        where.append('r.record_domain = %s')
+        params.append(filters['record_domain'])
+    for category, term in sorted((filters.get('terms') or {}).items()):
+        where.append('r.record_id IN (SELECT record_id FROM record_terms '
+                     'WHERE category = %s AND term = %s)')
+        params.extend([category, str(term)])
+    if filters.get('material'):
+        where.append('r.data @> %s::jsonb')
+        params.append(json.dumps({'sample': {'material': {'name': filters['material']}}}))
+    if filters.get('descriptor'):
+        name = filters['descriptor']
+        if name.endswith('.'):
+            where.append("r.record_id IN (SELECT record_id FROM record_descriptors WHERE name LIKE %s)")
+            params.append(name.replace('%', r'\%').replace('_', r'\_') + '%')
+        else:
+            where.append('r.record_id IN (SELECT record_id FROM record_descriptors WHERE name = %s)')
+            params.append(name)
+    if filters.get('created_after'):
+        where.append('r.created_at >= %s')
+        params.append(filters['created_after'])
+    if filters.get('created_before'):
+        where.append('r.created_at < %s')
+        params.append(filters['created_before'])
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute(f'''
+            SELECT {_SUMMARY_COLUMNS}
+            FROM records r
+            {'WHERE ' + ' AND '.join(where) if where else ''}
+            ORDER BY r.created_at DESC
+            LIMIT %s
+        ''', (*params, limit))
+        return [_record_summary(row) for row in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_descriptor_stats(name: str) -> list:
+    """
+    Summary statistics of a descriptor across all records, per unit.
+
+    Args:
+        name: descriptor name, or a 'class.' prefix (trailing dot) to cover
+            every product/context of a class
+
+    Returns:
+        List of {name, unit, value_count, record_count, numeric_count, min,
+        max, mean, median} — aggregates cover numeric values only
+    """
+    if name.endswith('.'):
+        condition = 'name LIKE %s'
+        param = name.replace('%', r'\%').replace('_', r'\_') + '%'
+    else:
+        condition = 'name = %s'
+        param = name
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute(f'''
+            SELECT name, unit,
+                   COUNT(*) AS value_count,
+                   COUNT(DISTINCT record_id) AS record_count,
+                   COUNT(value) AS numeric_count,
+                   MIN(value) AS min, MAX(value) AS max, AVG(value) AS mean,
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY value) AS median
+            FROM record_descriptors
+            WHERE {condition}
+            GROUP BY name, unit
+            ORDER BY name, unit
+        ''', (param,))
+        return [dict(row) for row in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_facet_counts(facet: str, limit: int = 50) -> list:
+    """
+    Record counts per value of *facet*, from precomputed rollups.
+
+    Args:
+        facet: 'record_type' or 'record_domain' (record_stats counters),
+            'descriptor' (descriptor_usage counters), or a vocabulary
+            category key such as 'system.technique' (vocabulary_term_usage)
+
+    Returns:
+        List of {value, record_count}, most frequent first
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        if facet in ('record_type', 'record_domain'):
+            cur.execute(f'''
+                SELECT {facet} AS value, SUM(record_count) AS record_count
+                FROM record_stats
+                GROUP BY {facet}
+                HAVING SUM(record_count) > 0
+                ORDER BY record_count DESC, value
+                LIMIT %s
+            ''', (limit,))
+        elif facet == 'descriptor':
+            cur.execute('''
+                SELECT name AS value, record_count
+                FROM descriptor_usage
+                WHERE record_count > 0
+                ORDER BY record_count DESC, value
+                LIMIT %s
+            ''', (limit,))
+        else:
+            cur.execute('''
+                SELECT term AS value, record_count
+                FROM vocabulary_term_usage
+                WHERE category = %s AND record_count > 0
+                ORDER BY record_count DESC, value
+                LIMIT %s
+            ''', (facet, limit))
+        return [{'value': row['value'], 'record_count': int(row['record_count'])}
+                for row in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_record_links(record_id: str) -> dict:
+    """
+    Links of a record in both directions, with summaries of the other end.
+
+    Outgoing links come from the record's own links[] (primary key lookup);
+    incoming ones are found by GIN containment on data.
+
+    Returns:
+        {'record': summary or None, 'outgoing': [{rel, basis, target, record}],
+         'incoming': [{rel, basis, source, record}]}
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute(f'''
+            SELECT {_SUMMARY_COLUMNS}, r.data->'links' AS links
+            FROM records r WHERE r.record_id = %s
+        ''', (record_id,))
+        row = cur.fetchone()
+        if row is None:
+            return {'record': None, 'outgoing': [], 'incoming': []}
+        links = [l for l in (row['links'] or []) if isinstance(l, dict)]
+
+        targets = sorted({l.get('target') for l in links if l.get('target')})
+        summaries = {}
+        if targets:
+            cur.execute(f'''
+                SELECT {_SUMMARY_COLUMNS} FROM records r WHERE r.record_id = ANY(%s)
+            ''', (targets,))
+            summaries = {r['record_id'].strip(): _record_summary(r) for r in cur.fetchall()}
+
+        cur.execute(f'''
+            SELECT {_SUMMARY_COLUMNS}, r.data->'links' AS links
+            FROM records r
+            WHERE r.data @> %s::jsonb
+            LIMIT 100
+        ''', (json.dumps({'links': [{'target': record_id}]}),))
+        incoming = [
+            {'rel': l.get('rel'), 'basis': l.get('basis'),
+             'source': src['record_id'].strip(), 'record': _record_summary(src)}
+            for src in cur.fetchall()
+            for l in (src['links'] or [])
+            if isinstance(l, dict) and l.get('target') == record_id
+        ]
+
+        return {
+            'record': _record_summary(row),
+            'outgoing': [{'rel': l.get('rel'), 'basis': l.get('basis'),
+                          'target': l.get('target'), 'record': summaries.get(l.get('target'))}
+                         for l in links],
+            'incoming': incoming,
+        }
+    finally:
+        cur.close()
+        conn.close()
+
+
+# =============================================================================
+# Overview Rollups
+# =============================================================================
+
+ROLLUP_DIMENSIONS = ('material', 'technique', 'facility', 'reaction')
+
+
+def reconcile_rollups() -> dict:
+    """
+    Recompute record_rollups and record_rollup_descriptors from every record
+    and correct the live tables by the difference.
+
+    The records_rollups trigger keeps counts and sums exact; this tightens
+    the time ranges and min/max that deletes and updates leave wide, and
+    repairs any drift. Record writes are never blocked: the recomputation
+    and a copy of both rollup tables are read from one REPEATABLE READ
+    snapshot, and the difference between the two is then added to the live
+    rows in short statements, so trigger updates from writes committed
+    after the snapshot are kept. A range the trigger widened since the
+    snapshot is merged instead of replaced. Set-based full scan — run
+    periodically (rollups.py does, under an advisory lock).
+
+    Returns:
+        Dict with 'rollups' and 'descriptors' row counts and 'drift' (rows
+        whose record_count changed)
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        # 1. Recomputation and the rollups as they were, at one snapshot
+        cur.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+        cur.execute('''
+            CREATE TEMP TABLE rollups_diff AS
+            SELECT dimension, key, record_domain,
+                   COALESCE(f.record_count, 0) - COALESCE(s.record_count, 0) AS delta,
+                   f.first_created, f.last_created,
+                   s.first_created AS seen_first, s.last_created AS seen_last,
+                   f.record_count IS NOT NULL AS fresh, s.record_count IS NOT NULL AS seen
+            FROM (
+                SELECT k.dimension::varchar AS dimension, k.key, r.record_domain,
+                       COUNT(*) AS record_count,
+                       MIN(r.created_at) AS first_created, MAX(r.created_at) AS last_created
+                FROM records r, record_rollup_keys(r.data) k
+                GROUP BY 1, 2, 3
+            ) f
+            FULL JOIN record_rollups s USING (dimension, key, record_domain)
+        ''')
+        cur.execute('''
+            CREATE TEMP TABLE rollup_descriptors_diff AS
+            SELECT dimension, key, descriptor, unit,
+                   COALESCE(f.value_count, 0) - COALESCE(s.value_count, 0) AS count_delta,
+                   COALESCE(f.value_sum, 0) - COALESCE(s.value_sum, 0) AS sum_delta,
+                   COALESCE(f.value_sumsq, 0) - COALESCE(s.value_sumsq, 0) AS sumsq_delta,
+                   f.value_min, f.value_max,
+                   s.value_min AS seen_min, s.value_max AS seen_max,
+                   f.value_count IS NOT NULL AS fresh, s.value_count IS NOT NULL AS seen
+            FROM (
+                SELECT k.dimension::varchar AS dimension, k.key, v.descriptor, v.unit,
+                       SUM(v.value_count)::bigint AS value_count, SUM(v.value_sum) AS value_sum,
+                       SUM(v.value_sumsq) AS value_sumsq,
+                       MIN(v.value_min) AS value_min, MAX(v.value_max) AS value_max
+                FROM records r, record_rollup_keys(r.data) k, record_rollup_values(r.data) v
+                GROUP BY 1, 2, 3, 4
+            ) f
+            FULL JOIN record_rollup_descriptors s USING (dimension, key, descriptor, unit)
+        ''')
+        cur.execute('''
+            SELECT (SELECT COUNT(*) FILTER (WHERE fresh) FROM rollups_diff) AS rollups,
+                   (SELECT COUNT(*) FILTER (WHERE delta <> 0) FROM rollups_diff) AS drift,
+                   (SELECT COUNT(*) FILTER (WHERE fresh) FROM rollup_descriptors_diff) AS descriptors
+        ''')
+        counts = dict(cur.fetchone())
+        conn.commit()
+
+        # 2. Apply the difference (READ COMMITTED; row locks only)
+        cur.execute('''
+            UPDATE record_rollups r SET
+                record_count = r.record_count + d.delta,
+                first_created = CASE WHEN r.first_created IS DISTINCT FROM d.seen_first
+                                     THEN LEAST(r.first_created, d.first_created)
+                                     ELSE d.first_created END,
+                last_created = CASE WHEN r.last_created IS DISTINCT FROM d.seen_last
+                                    THEN GREATEST(r.last_created, d.last_created)
+                                    ELSE d.last_created END
+            FROM rollups_diff d
+            WHERE d.seen
+              AND (r.dimension, r.key, r.record_domain) = (d.dimension, d.key, d.record_domain)
+              AND (d.delta <> 0 OR d.first_created IS DISTINCT FROM d.seen_first
+                   OR d.last_created IS DISTINCT FROM d.seen_last)
+        ''')
+        cur.execute('''
+            INSERT INTO record_rollups AS r
+                (dimension, key, record_domain, record_count, first_created, last_created)
+            SELECT dimension, key, record_domain, delta, first_created, last_created
+            FROM rollups_diff
+            WHERE NOT seen
+            ON CONFLICT (dimension, key, record_domain) DO UPDATE SET
+                record_count = r.record_count + EXCLUDED.record_count,
+                first_created = LEAST(r.first_created, EXCLUDED.first_created),
+                last_created = GREATEST(r.last_created, EXCLUDED.last_created)
+        ''')
+        cur.execute('DELETE FROM record_rollups WHERE record_count = 0')
+
+        cur.execute('''
+            UPDATE record_rollup_descriptors r SET
+                value_count = r.value_count + d.count_delta,
+                value_sum = r.value_sum + d.sum_delta,
+                value_sumsq = r.value_sumsq + d.sumsq_delta,
+                value_min = CASE WHEN r.value_min IS DISTINCT FROM d.seen_min
+                                 THEN LEAST(r.value_min, d.value_min) ELSE d.value_min END,
+                value_max = CASE WHEN r.value_max IS DISTINCT FROM d.seen_max
+                                 THEN GREATEST(r.value_max, d.value_max) ELSE d.value_max END
+            FROM rollup_descriptors_diff d
+            WHERE d.seen
+              AND (r.dimension, r.key, r.descriptor, r.unit) = (d.dimension, d.key, d.descriptor, d.unit)
+              AND (d.count_delta <> 0 OR d.sum_delta <> 0 OR d.sumsq_delta <> 0
+                   OR d.value_min IS DISTINCT FROM d.seen_min
+                   OR d.value_max IS DISTINCT FROM d.seen_max)
+        ''')
+        cur.execute('''
+            INSERT INTO record_rollup_descriptors AS r
+                (dimension, key, descriptor, unit, value_count, value_sum, value_sumsq,
+                 value_min, value_max)
+            SELECT dimension, key, descriptor, unit, count_delta, sum_delta, sumsq_delta,
+                   value_min, value_max
+            FROM rollup_descriptors_diff
+            WHERE NOT seen
+            ON CONFLICT (dimension, key, descriptor, unit) DO UPDATE SET
+                value_count = r.value_count + EXCLUDED.value_count,
+                value_sum = r.value_sum + EXCLUDED.value_sum,
+                value_sumsq = r.value_sumsq + EXCLUDED.value_sumsq,
+                value_min = LEAST(r.value_min, EXCLUDED.value_min),
+                value_max = GREATEST(r.value_max, EXCLUDED.value_max)
+        ''')
+        cur.execute('DELETE FROM record_rollup_descriptors WHERE value_count = 0')
+        conn.commit()
+        return counts
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_rollups(dimension: str, key: str = None, limit: int = 50,
+                descriptors: int = 10) -> list:
+    """
+    Precomputed overview of one dimension, largest first.
+
+    Args:
+        dimension: one of ROLLUP_DIMENSIONS
+        key: only this material / technique / facility / reaction
+        limit: maximum keys returned
+        descriptors: numeric descriptors summarised per key (most reported
+            first; 0 for none)
 
     Returns:
-        List of row dicts from the query result
+        List of {key, record_count, domains {domain: count}, first_created,
+        last_created, descriptors [{descriptor, unit, count, mean, stddev,
+        min, max}]}
 
     Raises:
-        ValueError: If the query is not a safe read-only SELECT/WITH
+        ValueError: On an unknown dimension
     """
-    stripped = sql.strip().rstrip(";")
-    upper = stripped.upper()
-
-    # Must start with SELECT or WITH
-    if not (upper.startswith("SELECT") or upper.startswith("WITH")):
-        raise ValueError("Only SELECT or WITH (CTE) queries are allowed.")
-
-    # Reject mutation keywords anywhere in the query
-    forbidden = r'\b(INSERT|UPDATE|DELETE|DROP|ALTER|TRUNCATE|CREATE|GRANT|REVOKE|COPY|EXECUTE|CALL)\b'
-    if re.search(forbidden, upper):
-        raise ValueError("Query contains forbidden mutation keywords.")
-
-    # Enforce LIMIT if not present
-    if "LIMIT" not in upper:
-        stripped += f" LIMIT {max_rows}"
+    if dimension not in ROLLUP_DIMENSIONS:
+        raise ValueError(f"Unknown dimension '{dimension}'; expected one of {', '.join(ROLLUP_DIMENSIONS)}")
 
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        cur.execute(f"SET LOCAL statement_timeout = '{timeout_ms}'")
-        cur.execute(stripped)
+        cur.execute(f'''
+            SELECT key, SUM(record_count) AS record_count,
+                   jsonb_object_agg(record_domain, record_count) AS domains,
+                   MIN(first_created) AS first_created, MAX(last_created) AS last_created
+            FROM record_rollups
+            WHERE dimension = %s AND record_count > 0 {'AND key = %s' if key else ''}
+            GROUP BY key
+            ORDER BY record_count DESC, key
+            LIMIT %s
+        ''', (dimension, *([key] if key else []), limit))
         rows = cur.fetchall()
-        return [dict(row) for row in rows]
+
+        stats = {}
+        if rows and descriptors:
+            cur.execute('''
+                SELECT key, descriptor, unit, value_count, value_sum, value_sumsq,
+                       value_min, value_max
+                FROM (
+                    SELECT *, row_number() OVER (PARTITION BY key ORDER BY value_count DESC,
+                                                 descriptor, unit) AS rank
+                    FROM record_rollup_descriptors
+                    WHERE dimension = %s AND key = ANY(%s) AND value_count > 0
+                ) ranked
+                WHERE rank <= %s
+                ORDER BY key, rank
+            ''', (dimension, [r['key'] for r in rows], descriptors))
+            for d in cur.fetchall():
+                n = d['value_count']
+                mean = d['value_sum'] / n
+                variance = max(d['value_sumsq'] / n - mean * mean, 0.0)
+                stats.setdefault(d['key'], []).append({
+                    'descriptor': d['descriptor'], 'unit': d['unit'], 'count': n,
+                    'mean': mean, 'stddev': variance ** 0.5,
+                    'min': d['value_min'], 'max': d['value_max'],
+                })
+
+        return [{
+            'key': r['key'],
+            'record_count': int(r['record_count']),
+            'domains': {k: v for k, v in r['domains'].items() if v > 0},
+            'first_created': r['first_created'].isoformat() if r['first_created'] else None,
+            'last_created': r['last_created'].isoformat() if r['last_created'] else None,
+            'descriptors': stats.get(r['key'], []),
+        } for r in rows]
     finally:
         cur.close()
         conn.close()
@@ -515,43 +1924,272 @@ def delete_template(name: str) -> bool:
 
 def get_dashboard_stats() -> dict:
     """
-    Get dashboard statistics: total records, last indexed time, and counts by type.
+    Get dashboard statistics: total records, last indexed time, and counts by
+    type and domain.
+
+    Served from the record_stats counters (maintained by the records_stats
+    trigger and backfilled by init_tables()), so the cost is independent of
+    the size of the records table.
 
     Returns:
-        Dict with 'total', 'last_indexed', and 'by_type' keys
+        Dict with 'total', 'last_indexed', 'by_type' and 'by_domain' keys
     """
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
         cur.execute('''
-            SELECT
-                COUNT(*) AS total,
-                MAX(created_at) AS last_indexed
-            FROM records
+            SELECT record_type, record_domain, record_count, last_indexed
+            FROM record_stats
+            WHERE record_count > 0
         ''')
-        row = cur.fetchone()
+        rows = cur.fetchall()
+
+        by_type = {}
+        by_domain = {}
+        last_indexed = None
+        for r in rows:
+            by_type[r['record_type']] = by_type.get(r['record_type'], 0) + r['record_count']
+            by_domain[r['record_domain']] = by_domain.get(r['record_domain'], 0) + r['record_count']
+            if r['last_indexed'] and (last_indexed is None or r['last_indexed'] > last_indexed):
+                last_indexed = r['last_indexed']
+
+        return {
+            'total': sum(by_type.values()),
+            'last_indexed': last_indexed,
+            'by_type': dict(sorted(by_type.items(), key=lambda kv: kv[1], reverse=True)),
+            'by_domain': dict(sorted(by_domain.items(), key=lambda kv: kv[1], reverse=True)),
+        }
+    finally:
+        cur.close()
+        conn.close()
+
+
+def rebuild_dashboard_counters() -> dict:
+    """
+    Recompute record_stats and portal_access_stats from the base tables.
+
+    The triggers keep the counters exact; this is a repair tool (e.g. after
+    restoring a dump with triggers disabled). Full scans — run off-peak.
+
+    Returns:
+        Dict with the rebuilt 'records' and 'visits' totals
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
 
+    try:
+        cur.execute('LOCK TABLE records, portal_access_log IN SHARE MODE')
+        cur.execute('DELETE FROM record_stats')
         cur.execute('''
-            SELECT record_type, COUNT(*) AS cnt
+            INSERT INTO record_stats (record_type, record_domain, record_count, last_indexed)
+            SELECT record_type, record_domain, COUNT(*), MAX(created_at)
             FROM records
-            GROUP BY record_type
-            ORDER BY cnt DESC
+            GROUP BY record_type, record_domain
         ''')
-        by_type = {r['record_type']: r['cnt'] for r in cur.fetchall()}
+        cur.execute('DELETE FROM portal_access_stats')
+        cur.execute('''
+            INSERT INTO portal_access_stats (id, total_visits, last_access)
+            SELECT TRUE, COUNT(*), MAX(accessed_at) FROM portal_access_log
+        ''')
+        cur.execute('SELECT COALESCE(SUM(record_count), 0) AS n FROM record_stats')
+        records_total = int(cur.fetchone()['n'])
+        cur.execute('SELECT total_visits FROM portal_access_stats')
+        visits_total = int(cur.fetchone()['total_visits'])
+        conn.commit()
+        return {'records': records_total, 'visits': visits_total}
+    finally:
+        cur.close()
+        conn.close()
 
-        return {
-            'total': row['total'],
-            'last_indexed': row['last_indexed'],
-            'by_type': by_type,
-        }
+
+def rebuild_term_usage(batch_size: int = 500) -> dict:
+    """
+    Recompute record_terms and vocabulary_term_usage from every record.
+
+    save_record()/delete_record() keep both exact; run this after adding a
+    vocabulary category (older records are only indexed for categories that
+    existed when they were saved) or to repair. Full scan — run off-peak.
+
+    Returns:
+        Dict with 'records' scanned, 'terms' indexed and distinct 'usage' rows
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+    scan = conn.cursor(name='rebuild_term_usage_scan')
+    scan.itersize = batch_size
+
+    try:
+        cur.execute('LOCK TABLE records IN SHARE MODE')
+        cur.execute('TRUNCATE record_terms, vocabulary_term_usage')
+
+        scanned = 0
+        indexed = 0
+        scan.execute('SELECT record_id, data FROM records')
+        while True:
+            rows = scan.fetchmany(batch_size)
+            if not rows:
+                break
+            batch = [(row['record_id'], category, term)
+                     for row in rows
+                     for category, term in _record_terms(row['data'])]
+            if batch:
+                execute_values(cur, 'INSERT INTO record_terms (record_id, category, term) VALUES %s',
+                               batch, page_size=1000)
+            scanned += len(rows)
+            indexed += len(batch)
+        # A named (server-side) cursor dies with the transaction: close it
+        # before committing, never after
+        scan.close()
+
+        cur.execute('''
+            INSERT INTO vocabulary_term_usage (category, term, record_count, sample_record_ids)
+            SELECT category, term, COUNT(*),
+                   (array_agg(rtrim(record_id) ORDER BY record_id))[1:%s]
+            FROM record_terms
+            GROUP BY category, term
+        ''', (TERM_USAGE_SAMPLES,))
+        usage_rows = cur.rowcount
+        conn.commit()
+        return {'records': scanned, 'terms': indexed, 'usage': usage_rows}
+    finally:
+        cur.close()
+        conn.close()
+
+
+def rebuild_record_descriptors(batch_size: int = 500) -> dict:
+    """
+    Recompute record_descriptors from every record (one-time backfill for
+    records saved before the table existed, or repair). Full scan.
+
+    Returns:
+        Dict with 'records' scanned and 'descriptors' indexed
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+    scan = conn.cursor(name='rebuild_record_descriptors_scan')
+    scan.itersize = batch_size
+
+    try:
+        cur.execute('LOCK TABLE records IN SHARE MODE')
+        cur.execute('TRUNCATE record_descriptors, descriptor_usage')
+
+        scanned = 0
+        indexed = 0
+        scan.execute('SELECT record_id, data FROM records')
+        while True:
+            rows = scan.fetchmany(batch_size)
+            if not rows:
+                break
+            batch = [d for row in rows for d in _record_descriptors(row['record_id'], row['data'])]
+            if batch:
+                execute_values(cur, '''
+                    INSERT INTO record_descriptors (record_id, name, kind, unit, value) VALUES %s
+                ''', batch, page_size=1000)
+            scanned += len(rows)
+            indexed += len(batch)
+        scan.close()  # before commit: the named cursor dies with the transaction
+        cur.execute(_FILL_DESCRIPTOR_USAGE)
+
+        conn.commit()
+        return {'records': scanned, 'descriptors': indexed}
+    finally:
+        cur.close()
+        conn.close()
+
+
+_FILL_DESCRIPTOR_USAGE = '''
+    INSERT INTO descriptor_usage (name, record_count)
+    SELECT name, COUNT(DISTINCT record_id) FROM record_descriptors GROUP BY name
+'''
+
+
+def rebuild_descriptor_usage() -> dict:
+    """
+    Recompute descriptor_usage from record_descriptors (one-time backfill,
+    or repair). Scans record_descriptors, not records.
+
+    Returns:
+        Dict with the number of distinct descriptor 'names'
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('LOCK TABLE records IN SHARE MODE')
+        cur.execute('TRUNCATE descriptor_usage')
+        cur.execute(_FILL_DESCRIPTOR_USAGE)
+        names = cur.rowcount
+        conn.commit()
+        return {'names': names}
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_term_usage(category: str = None) -> list:
+    """
+    Read the vocabulary_term_usage rollup (no record scans).
+
+    Args:
+        category: only this category, or None for all
+
+    Returns:
+        List of dicts with category, term, record_count, sample_record_ids,
+        ordered by category then descending count
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        query = '''
+            SELECT category, term, record_count, sample_record_ids
+            FROM vocabulary_term_usage
+            WHERE record_count > 0
+        '''
+        params = []
+        if category:
+            query += ' AND category = %s'
+            params.append(category)
+        query += ' ORDER BY category, record_count DESC, term'
+        try:
+            cur.execute(query, params)
+        except psycopg2.errors.UndefinedTable:
+            return []
+        return [dict(row) for row in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+
+def list_record_ids_with_term(category: str, term: str, after: str = "", limit: int = 100) -> list:
+    """
+    Record ids whose *category* value includes *term*, via the record_terms
+    index, in record_id order (keyset pagination: pass the last id seen).
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('''
+            SELECT rtrim(record_id) AS record_id
+            FROM record_terms
+            WHERE category = %s AND term = %s AND record_id > %s
+            ORDER BY record_id
+            LIMIT %s
+        ''', (category, term, after or "", limit))
+        return [row['record_id'] for row in cur.fetchall()]
     finally:
         cur.close()
         conn.close()
 
 
 def log_access(username: str = "anonymous"):
-    """Insert a row into the portal_access_log table."""
+    """
+    Insert a row into the portal_access_log table synchronously.
+
+    Hot paths should use audit.log_access(), which batches these inserts.
+    """
     conn = get_db_connection()
     cur = conn.cursor()
 
@@ -566,9 +2204,72 @@ def log_access(username: str = "anonymous"):
         conn.close()
 
 
+def log_access_batch(rows: list) -> int:
+    """
+    Insert many portal_access_log rows in one statement.
+
+    Args:
+        rows: list of (username, accessed_at) tuples
+
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        execute_values(
+            cur,
+            'INSERT INTO portal_access_log (username, accessed_at) VALUES %s',
+            rows,
+            page_size=len(rows),
+        )
+        conn.commit()
+        return len(rows)
+    finally:
+        cur.close()
+        conn.close()
+
+
+def log_api_audit_batch(rows: list) -> int:
+    """
+    Insert many api_audit_log rows in one statement.
+
+    Args:
+        rows: list of (occurred_at, method, path, status, username,
+            auth_method, duration_ms, remote_addr) tuples
+
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        execute_values(
+            cur,
+            '''
+            INSERT INTO api_audit_log
+                (occurred_at, method, path, status, username, auth_method, duration_ms, remote_addr)
+            VALUES %s
+            ''',
+            rows,
+            page_size=len(rows),
+        )
+        conn.commit()
+        return len(rows)
+    finally:
+        cur.close()
+        conn.close()
+
+
 def get_access_stats() -> dict:
     """
-    Get portal access statistics.
+    Get portal access statistics from the portal_access_stats counter row.
 
     Returns:
         Dict with 'total_visits' and 'last_access' keys
@@ -577,13 +2278,10 @@ def get_access_stats() -> dict:
     cur = conn.cursor()
 
     try:
-        cur.execute('''
-            SELECT
-                COUNT(*) AS total_visits,
-                MAX(accessed_at) AS last_access
-            FROM portal_access_log
-        ''')
+        cur.execute('SELECT total_visits, last_access FROM portal_access_stats')
         row = cur.fetchone()
+        if not row:
+            return {'total_visits': 0, 'last_access': None}
         return {
             'total_visits': row['total_visits'],
             'last_access': row['last_access'],
@@ -597,50 +2295,115 @@ def get_access_stats() -> dict:
 # Vocabulary Cache Operations
 # =============================================================================
 
+def _vocabulary_rows(vocab: dict) -> dict:
+    """{(section, category): (description, terms_json, wiki_page)} for a vocabulary dict."""
+    rows = {}
+    for section, categories in vocab.items():
+        # Derive wiki_page from section name
+        wiki_page = section.replace(" ", "-") if section != "Record Info" else "Record-Overview"
+        for category, data in categories.items():
+            rows[(section, category)] = (
+                data.get('description', '') or '',
+                json.dumps(data.get('values', []), sort_keys=True),
+                wiki_page,
+            )
+    return rows
+
+
+def vocabulary_content_hash(vocab: dict) -> str:
+    """Stable sha256 of a vocabulary dict (key order independent)."""
+    return hashlib.sha256(json.dumps(vocab, sort_keys=True).encode('utf-8')).hexdigest()
+
+
 def save_vocabulary_cache(vocab: dict, synced_by: str = "system") -> bool:
     """
-    Replace all vocabulary cache from parsed wiki data and log the sync.
+    Bring the vocabulary cache in line with parsed wiki data and log the sync.
+
+    Diff-based: if the content hash matches portal_meta 'vocabulary_hash'
+    nothing is written at all. Otherwise only added/changed categories are
+    upserted (one batched statement) and removed ones deleted, then a
+    NOTIFY on VOCABULARY_CHANNEL tells every listening process to drop its
+    in-memory vocabulary.
 
     Args:
         vocab: dict matching vocabulary.json structure {section: {category: {description, values}}}
         synced_by: username who triggered the sync
 
     Returns:
-        True on success
+        True if the cache changed, False if it was already up to date
     """
+    content_hash = vocabulary_content_hash(vocab)
+    desired = _vocabulary_rows(vocab)
+
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        cur.execute('DELETE FROM vocabulary_cache')
+        # Serialize concurrent writers so the diff below stays valid
+        cur.execute('SELECT pg_advisory_xact_lock(%s)', (VOCABULARY_LOCK_KEY,))
+
+        cur.execute("SELECT value FROM portal_meta WHERE key = 'vocabulary_hash'")
+        row = cur.fetchone()
+        if row and row['value'] == content_hash:
+            conn.rollback()
+            return False
+
+        cur.execute('SELECT section, category, description, terms, wiki_page FROM vocabulary_cache')
+        current = {
+            (r['section'], r['category']): (
+                r['description'] or '',
+                json.dumps(r['terms'] if isinstance(r['terms'], list) else json.loads(r['terms']),
+                           sort_keys=True),
+                r['wiki_page'],
+            )
+            for r in cur.fetchall()
+        }
 
-        sections_count = 0
-        categories_count = 0
+        changed = [(section, category, *values)
+                   for (section, category), values in desired.items()
+                   if current.get((section, category)) != values]
+        removed = [key for key in current if key not in desired]
+
+        if changed:
+            execute_values(cur, '''
+                INSERT INTO vocabulary_cache (section, category, description, terms, wiki_page)
+                VALUES %s
+                ON CONFLICT (section, category) DO UPDATE SET
+                    description = EXCLUDED.description,
+                    terms = EXCLUDED.terms,
+                    wiki_page = EXCLUDED.wiki_page,
+                    synced_at = NOW()
+            ''', changed, template='(%s, %s, %s, %s::jsonb, %s)')
+        if removed:
+            execute_values(cur, '''
+                DELETE FROM vocabulary_cache v
+                USING (VALUES %s) AS gone (section, category)
+                WHERE v.section = gone.section AND v.category = gone.category
+            ''', removed)
 
-        for section, categories in vocab.items():
-            sections_count += 1
-            # Derive wiki_page from section name
-            wiki_page = section.replace(" ", "-") if section != "Record Info" else "Record-Overview"
-            for category, data in categories.items():
-                categories_count += 1
-                cur.execute('''
-                    INSERT INTO vocabulary_cache (section, category, description, terms, wiki_page)
-                    VALUES (%s, %s, %s, %s, %s)
-                ''', (
-                    section,
-                    category,
-                    data.get('description', ''),
-                    json.dumps(data.get('values', [])),
-                    wiki_page
-                ))
+        cur.execute('''
+            INSERT INTO portal_meta (key, value, updated_at)
+            VALUES ('vocabulary_hash', %s, NOW())
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = NOW()
+        ''', (content_hash,))
+
+        if not (changed or removed):
+            # Rows already matched (e.g. first run after upgrade): record the hash only
+            conn.commit()
+            return False
 
         # Log the sync
         cur.execute('''
             INSERT INTO vocabulary_sync_log (synced_by, sections_count, categories_count, status)
             VALUES (%s, %s, %s, 'success')
-        ''', (synced_by, sections_count, categories_count))
+        ''', (synced_by, len(vocab), len(desired)))
+
+        # Delivered to listeners on commit
+        cur.execute('SELECT pg_notify(%s, %s)', (VOCABULARY_CHANNEL, content_hash))
 
         conn.commit()
+        logger.info("Vocabulary cache: %d categories upserted, %d removed (%s)",
+                    len(changed), len(removed), synced_by)
         return True
     except Exception as e:
         conn.rollback()
@@ -659,6 +2422,41 @@ def save_vocabulary_cache(vocab: dict, synced_by: str = "system") -> bool:
         conn.close()
 
 
+def listen_for_vocabulary_changes(callback, stop_event, reconnect_delay: float = 5.0):
+    """
+    Block on LISTEN VOCABULARY_CHANNEL until *stop_event* is set, calling
+    callback(True) after each (re)connect and for every notification, and
+    callback(False) when the connection drops (notifications sent while
+    disconnected are lost). Intended for a daemon thread.
+    """
+    while not stop_event.is_set():
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.autocommit = True
+            cur = conn.cursor()
+            cur.execute(f'LISTEN {VOCABULARY_CHANNEL}')
+            cur.close()
+            callback(True)
+            while not stop_event.is_set():
+                if select.select([conn], [], [], 5.0) == ([], [], []):
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    conn.notifies.clear()
+                    callback(True)
+        except Exception as exc:
+            logger.warning("Vocabulary listener disconnected: %s", exc)
+            callback(False)
+            stop_event.wait(reconnect_delay)
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+
 def load_vocabulary_cache() -> dict:
     """
     Load vocabulary from the cache table.
@@ -830,6 +2628,118 @@ def review_proposal(proposal_id: int, status: str, reviewed_by: str, comment: st
         conn.close()
 
 
+def review_proposals(proposal_ids: list, status: str, reviewed_by: str, comment: str = "") -> list:
+    """
+    Approve or reject several proposals in one statement.
+
+    Only proposals still pending are updated, so two admins reviewing the
+    same backlog never both claim a proposal.
+
+    Args:
+        proposal_ids: proposals to review
+        status: 'approved' or 'rejected'
+        reviewed_by: admin username
+        comment: optional review comment
+
+    Returns:
+        List of the reviewed proposal dicts (pending ones only), in id order
+    """
+    if not proposal_ids:
+        return []
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('''
+            UPDATE vocabulary_proposals
+            SET status = %s, reviewed_by = %s, reviewed_at = NOW(), review_comment = %s
+            WHERE id = ANY(%s) AND status = 'pending'
+            RETURNING *
+        ''', (status, reviewed_by, comment, list(proposal_ids)))
+
+        rows = [dict(row) for row in cur.fetchall()]
+        conn.commit()
+        return sorted(rows, key=lambda r: r['id'])
+    finally:
+        cur.close()
+        conn.close()
+
+
+def mark_proposal_drafting(proposal_id: int) -> None:
+    """Flag a proposal's draft as in progress (drafted_at = request time)."""
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('''
+            UPDATE vocabulary_proposals
+            SET draft_status = 'pending', draft_error = NULL, drafted_at = NOW()
+            WHERE id = %s
+        ''', (proposal_id,))
+        conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+
+
+def save_proposal_draft(proposal_id: int, draft_key: str, result: dict) -> None:
+    """
+    Store a generate_wiki_description() result on a proposal.
+
+    Args:
+        proposal_id: the proposal the draft belongs to
+        draft_key: cache key the draft was produced for
+        result: dict with yaml_description, wiki_prose, success, error
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('''
+            UPDATE vocabulary_proposals
+            SET draft_status = %s, draft_key = %s, draft_yaml_description = %s,
+                draft_wiki_prose = %s, draft_error = %s, drafted_at = NOW()
+            WHERE id = %s
+        ''', (
+            'ready' if result.get('success') else 'failed',
+            draft_key,
+            result.get('yaml_description', ''),
+            result.get('wiki_prose', ''),
+            result.get('error'),
+            proposal_id,
+        ))
+        conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+
+
+def find_proposal_draft(draft_key: str) -> dict:
+    """
+    Return a ready draft produced for *draft_key* by any proposal, or None.
+
+    Returns:
+        dict with yaml_description and wiki_prose, or None
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('''
+            SELECT draft_yaml_description AS yaml_description, draft_wiki_prose AS wiki_prose
+            FROM vocabulary_proposals
+            WHERE draft_key = %s AND draft_status = 'ready'
+            ORDER BY drafted_at DESC
+            LIMIT 1
+        ''', (draft_key,))
+        row = cur.fetchone()
+        return dict(row) if row else None
+    finally:
+        cur.close()
+        conn.close()
+
+
 def count_pending_proposals() -> int:
     """Return the count of pending vocabulary proposals."""
     conn = get_db_connection()
@@ -0,0 +1,174 @@
+"""
+ISAAC AI-Ready Record - Proposal Draft Worker
+Produces the LLM wiki-prose draft for a vocabulary proposal in the
+background, as soon as the proposal is created, so Admin Review opens
+with the draft already stored on the proposal.
+
+Drafts run on a small bounded thread pool (ISAAC_DRAFT_WORKERS, default 2)
+and are cached by (section, category, term, description, wiki page blob
+sha): first in a per-process LRU, then across processes via the draft_key
+column of vocabulary_proposals. A changed wiki page yields a new key, so
+drafts never reuse stale tone reference.
+
+For local testing point ISAAC_LLM_API_URL at tools/llm_stub_server.py.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import database
+import ontology
+
+logger = logging.getLogger("isaac-drafts")
+
+MAX_WORKERS = int(os.environ.get("ISAAC_DRAFT_WORKERS", 2))
+CACHE_SIZE = int(os.environ.get("ISAAC_DRAFT_CACHE_SIZE", 256))
+# A 'pending' draft older than this is assumed lost (process restarted)
+STALE_SECONDS = float(os.environ.get("ISAAC_DRAFT_STALE_SECONDS", 300))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="isaac-draft")
+_lock = threading.Lock()
+_cache = OrderedDict()  # draft key -> {'yaml_description', 'wiki_prose'}
+_inflight = {}  # proposal id -> Future
+
+
+def draft_key(proposal: dict, page_sha: str) -> str:
+    """Cache key for a proposal's draft against a given wiki page version."""
+    parts = [
+        proposal.get('proposal_type') or '',
+        proposal.get('section') or '',
+        proposal.get('category') or '',
+        proposal.get('term') or '',
+        proposal.get('description') or '',
+        page_sha or '',
+    ]
+    return hashlib.sha256(json.dumps(parts).encode('utf-8')).hexdigest()
+
+
+def _cache_get(key: str):
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+        return hit
+
+
+def _cache_put(key: str, draft: dict):
+    with _lock:
+        _cache[key] = draft
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def generate(proposal: dict, force: bool = False) -> tuple:
+    """
+    Produce the draft for *proposal* synchronously, using the cache unless
+    *force* (Regenerate).
+
+    Returns:
+        (draft_key, result) where result matches generate_wiki_description()
+    """
+    page_sha, page_content = ontology.get_wiki_page(proposal['section'])
+    key = draft_key(proposal, page_sha)
+
+    if not force:
+        cached = _cache_get(key)
+        if cached is None and database.is_db_configured():
+            try:
+                cached = database.find_proposal_draft(key)
+            except Exception:
+                cached = None
+        if cached is not None:
+            _cache_put(key, cached)
+            return key, {**cached, 'success': True, 'error': None}
+
+    result = ontology.generate_wiki_description(
+        section=proposal['section'],
+        category=proposal.get('category', ''),
+        term=proposal.get('term', ''),
+        proposal_type=proposal['proposal_type'],
+        user_description=proposal.get('description', ''),
+        wiki_content=page_content,
+    )
+    if result['success']:
+        _cache_put(key, {'yaml_description': result['yaml_description'],
+                         'wiki_prose': result['wiki_prose']})
+    return key, result
+
+
+def _run(proposal: dict, force: bool):
+    try:
+        key, result = generate(proposal, force=force)
+    except Exception as exc:
+        key, result = None, {'success': False, 'error': f'Draft failed: {exc}'}
+    try:
+        database.save_proposal_draft(proposal['id'], key, result)
+    except Exception as exc:
+        logger.warning("Could not store draft for proposal %s: %s", proposal['id'], exc)
+    finally:
+        with _lock:
+            _inflight.pop(proposal['id'], None)
+    if not result.get('success'):
+        logger.info("Draft for proposal %s failed: %s", proposal['id'], result.get('error'))
+
+
+def submit(proposal: dict, force: bool = False) -> bool:
+    """
+    Queue a background draft for a stored proposal (needs 'id').
+
+    Returns:
+        True if queued, False if one is already running in this process.
+    """
+    pid = proposal['id']
+    with _lock:
+        if pid in _inflight:
+            return False
+        # Reserve the slot before the DB write so concurrent reruns don't double-queue
+        _inflight[pid] = None
+    try:
+        database.mark_proposal_drafting(pid)
+    except Exception as exc:
+        logger.warning("Could not mark proposal %s as drafting: %s", pid, exc)
+    future = _executor.submit(_run, dict(proposal), force)
+    with _lock:
+        if pid in _inflight:
+            _inflight[pid] = future
+    return True
+
+
+def is_drafting(proposal: dict) -> bool:
+    """True while a draft for *proposal* is queued or running (any process)."""
+    with _lock:
+        if proposal['id'] in _inflight:
+            return True
+    if proposal.get('draft_status') != 'pending':
+        return False
+    requested = proposal.get('drafted_at')
+    if requested is None:
+        return False
+    return (datetime.now(timezone.utc) - requested).total_seconds() < STALE_SECONDS
+
+
+def submit_missing(proposals: list) -> int:
+    """
+    Queue drafts for pending proposals that have none (created before this
+    process started, or whose drafting process died). Failed drafts are
+    left for an explicit retry.
+
+    Returns:
+        Number of drafts queued
+    """
+    queued = 0
+    for proposal in proposals:
+        if proposal.get('draft_status') in ('ready', 'failed') or is_drafting(proposal):
+            continue
+        if submit(proposal):
+            queued += 1
+    return queued
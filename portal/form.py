@@ -8,6 +8,7 @@ import json
 from datetime import datetime
 import database
 import ontology
+import portal_cache
 
 # Try to import ulid, fall back to simple generation if not available
 try:
@@ -26,37 +27,61 @@ except ImportError:
         return (timestamp + random_part)[:26]
 
 
-def get_vocab_values(section: str, category: str) -> list:
-    """Get allowed values from vocabulary for dropdowns"""
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _vocabulary_options(vocab_version: int) -> dict:
+    """
+    Option lists for every vocabulary category, built once per vocabulary
+    version and shared (read-only) by all sessions in the process.
+
+    Returns:
+        {section: {category_key: {'values': [...], 'description': str}}}
+    """
     vocab = ontology.load_vocabulary()
-    if section in vocab and category in vocab[section]:
-        return vocab[section][category].get('values', [])
-    return []
+    return {
+        section: {
+            cat_key: {
+                'values': list(cat_data.get('values', [])),
+                'description': cat_data.get('description', ''),
+            }
+            for cat_key, cat_data in categories.items()
+        }
+        for section, categories in vocab.items()
+    }
+
 
+def vocabulary_snapshot() -> dict:
+    """
+    The vocabulary options for one form render. Taken once at the top of
+    render_form() so every widget in a run sees the same vocabulary version;
+    reruns reuse the cached lists until ontology.get_vocabulary_version()
+    changes, so rendering the form does not touch the database.
+    """
+    return _vocabulary_options(ontology.get_vocabulary_version())
+
+
+def get_vocab_values(vocab: dict, section: str, category: str) -> list:
+    """Get allowed values for dropdowns from a vocabulary_snapshot()"""
+    return vocab.get(section, {}).get(category, {}).get('values', [])
 
-def render_extra_vocab_fields(section: str, handled_categories: list, prefix: str) -> dict:
+
+def render_extra_vocab_fields(vocab: dict, section: str, handled_categories: list, prefix: str) -> dict:
     """
     Render selectboxes for any vocabulary categories in a section
     that aren't already handled by the hardcoded form fields.
 
     Returns dict of {category_key: selected_value} for categories rendered.
     """
-    vocab = ontology.load_vocabulary()
     extra = {}
-    if section not in vocab:
-        return extra
-    for cat_key, cat_data in vocab[section].items():
+    for cat_key, cat_data in vocab.get(section, {}).items():
         if cat_key in handled_categories:
             continue
-        values = cat_data.get('values', [])
+        values = cat_data['values']
         if not values:
             continue
-        desc = cat_data.get('description', '')
-        options = [""] + values
         selected = st.selectbox(
             cat_key,
-            options,
-            help=desc,
+            [""] + values,
+            help=cat_data['description'],
             key=f"{prefix}_{cat_key}"
         )
         if selected:
@@ -71,8 +96,11 @@ def render_form():
     if 'record_id' not in st.session_state:
         st.session_state.record_id = generate_ulid()
 
+    # One vocabulary snapshot for every widget in this run
+    vocab = vocabulary_snapshot()
+
     # Template management
-    db_connected = database.test_db_connection()
+    db_connected = portal_cache.db_online()
 
     if db_connected:
         with st.expander("Templates", expanded=False):
@@ -134,14 +162,14 @@ def render_form():
                 st.rerun()
 
         with col2:
-            record_type_options = [""] + get_vocab_values("Record Info", "record_type")
+            record_type_options = [""] + get_vocab_values(vocab, "Record Info", "record_type")
             record_type = st.selectbox(
                 "Record Type *",
                 record_type_options,
                 help="Fundamental nature of the record"
             )
 
-            record_domain_options = [""] + get_vocab_values("Record Info", "record_domain")
+            record_domain_options = [""] + get_vocab_values(vocab, "Record Info", "record_domain")
             record_domain = st.selectbox(
                 "Record Domain *",
                 record_domain_options,
@@ -149,7 +177,7 @@ def render_form():
             )
 
         extra_record_info = render_extra_vocab_fields(
-            "Record Info",
+            vocab, "Record Info",
             ["record_type", "record_domain", "source_type"],
             "ri"
         )
@@ -179,7 +207,7 @@ def render_form():
         st.subheader("3. Source Type *")
         st.caption("Origin of the data acquisition (facility details go in System block)")
 
-        source_type_options = [""] + get_vocab_values("Record Info", "source_type")
+        source_type_options = [""] + get_vocab_values(vocab, "Record Info", "source_type")
         source_type = st.selectbox("Source Type *", source_type_options)
 
         # =====================================================================
@@ -193,10 +221,10 @@ def render_form():
                 material_name = st.text_input("Material Name", placeholder="e.g., Copper nanoparticles")
                 material_formula = st.text_input("Chemical Formula", placeholder="e.g., Cu")
             with col2:
-                provenance_options = [""] + get_vocab_values("Sample", "sample.material.provenance")
+                provenance_options = [""] + get_vocab_values(vocab, "Sample", "sample.material.provenance")
                 material_provenance = st.selectbox("Provenance", provenance_options)
 
-                sample_form_options = [""] + get_vocab_values("Sample", "sample.sample_form")
+                sample_form_options = [""] + get_vocab_values(vocab, "Sample", "sample.sample_form")
                 sample_form = st.selectbox("Sample Form", sample_form_options)
 
             composition_json = st.text_area(
@@ -212,7 +240,7 @@ def render_form():
             )
 
             extra_sample = render_extra_vocab_fields(
-                "Sample",
+                vocab, "Sample",
                 ["sample.sample_form", "sample.material.provenance", "sample.material.identifiers.scheme"],
                 "samp"
             )
@@ -223,16 +251,16 @@ def render_form():
         with st.expander("5. System (Optional)", expanded=False):
             st.caption("Infrastructure and configuration")
 
-            domain_options = [""] + get_vocab_values("System", "system.domain")
+            domain_options = [""] + get_vocab_values(vocab, "System", "system.domain")
             system_domain = st.selectbox("Domain", domain_options)
 
-            technique_options = [""] + get_vocab_values("System", "system.technique")
+            technique_options = [""] + get_vocab_values(vocab, "System", "system.technique")
             system_technique = st.selectbox("Technique *", technique_options,
                 help="Primary technique or computational method")
 
             col1, col2 = st.columns(2)
             with col1:
-                instrument_type_options = [""] + get_vocab_values("System", "system.instrument.instrument_type")
+                instrument_type_options = [""] + get_vocab_values(vocab, "System", "system.instrument.instrument_type")
                 instrument_type = st.selectbox("Instrument Type", instrument_type_options)
                 instrument_name = st.text_input("Instrument Name", placeholder="e.g., XRD Diffractometer")
             with col2:
@@ -246,7 +274,7 @@ def render_form():
             )
 
             extra_system = render_extra_vocab_fields(
-                "System",
+                vocab, "System",
                 ["system.domain", "system.technique", "system.instrument.instrument_type"],
                 "sys"
             )
@@ -259,7 +287,7 @@ def render_form():
 
             col1, col2 = st.columns(2)
             with col1:
-                environment_options = [""] + get_vocab_values("Context", "context.environment")
+                environment_options = [""] + get_vocab_values(vocab, "Context", "context.environment")
                 environment = st.selectbox("Environment", environment_options)
             with col2:
                 temperature_k = st.number_input("Temperature (K)", min_value=0.0, value=None, format="%.2f")
@@ -268,13 +296,13 @@ def render_form():
             st.write("**Electrochemistry**")
             col1, col2, col3 = st.columns(3)
             with col1:
-                reaction_options = [""] + get_vocab_values("Context", "context.electrochemistry.reaction")
+                reaction_options = [""] + get_vocab_values(vocab, "Context", "context.electrochemistry.reaction")
                 echem_reaction = st.selectbox("Reaction", reaction_options)
             with col2:
-                cell_type_options = [""] + get_vocab_values("Context", "context.electrochemistry.cell_type")
+                cell_type_options = [""] + get_vocab_values(vocab, "Context", "context.electrochemistry.cell_type")
                 echem_cell_type = st.selectbox("Cell Type", cell_type_options)
             with col3:
-                potential_scale_options = [""] + get_vocab_values("Context", "context.electrochemistry.potential_scale")
+                potential_scale_options = [""] + get_vocab_values(vocab, "Context", "context.electrochemistry.potential_scale")
                 echem_potential_scale = st.selectbox("Potential Scale", potential_scale_options)
 
             context_additional_json = st.text_area(
@@ -284,7 +312,7 @@ def render_form():
             )
 
             extra_context = render_extra_vocab_fields(
-                "Context",
+                vocab, "Context",
                 ["context.environment", "context.electrochemistry.reaction",
                  "context.electrochemistry.cell_type", "context.electrochemistry.potential_scale"],
                 "ctx"
@@ -309,7 +337,7 @@ def render_form():
             with col2:
                 channel_name = st.text_input("Channel Name", placeholder="e.g., intensity")
                 channel_unit = st.text_input("Channel Unit", placeholder="e.g., counts")
-                channel_role_options = [""] + get_vocab_values("Measurement", "measurement.series.channels.role")
+                channel_role_options = [""] + get_vocab_values(vocab, "Measurement", "measurement.series.channels.role")
                 channel_role = st.selectbox("Channel Role", channel_role_options)
                 channel_values = st.text_input("Channel Values (comma-separated)", placeholder="e.g., 100, 150, 200")
 
@@ -320,7 +348,7 @@ def render_form():
             processing_json = st.text_area("Processing Details (JSON)", placeholder='{"steps": ["normalization"]}', height=60)
 
             extra_measurement = render_extra_vocab_fields(
-                "Measurement",
+                vocab, "Measurement",
                 ["measurement.series.channels.role"],
                 "meas"
             )
@@ -331,7 +359,7 @@ def render_form():
         with st.expander("8. Links (Optional)", expanded=False):
             st.caption("Relationships to other records")
 
-            link_rel_options = [""] + get_vocab_values("Links", "links.rel")
+            link_rel_options = [""] + get_vocab_values(vocab, "Links", "links.rel")
 
             col1, col2 = st.columns(2)
             with col1:
@@ -342,7 +370,7 @@ def render_form():
                 link_notes = st.text_input("Notes", placeholder="Additional notes")
 
             extra_links = render_extra_vocab_fields(
-                "Links",
+                vocab, "Links",
                 ["links.rel"],
                 "lnk"
             )
@@ -353,7 +381,7 @@ def render_form():
         with st.expander("9. Assets (Optional)", expanded=False):
             st.caption("External file references")
 
-            asset_role_options = [""] + get_vocab_values("Assets", "assets.content_role")
+            asset_role_options = [""] + get_vocab_values(vocab, "Assets", "assets.content_role")
 
             col1, col2 = st.columns(2)
             with col1:
@@ -365,7 +393,7 @@ def render_form():
             asset_media_type = st.text_input("Media Type", placeholder="e.g., application/json")
 
             extra_assets = render_extra_vocab_fields(
-                "Assets",
+                vocab, "Assets",
                 ["assets.content_role"],
                 "ast"
             )
@@ -386,7 +414,7 @@ def render_form():
             col1, col2 = st.columns(2)
             with col1:
                 desc_name = st.text_input("Descriptor Name", placeholder="e.g., band_gap")
-                desc_kind_options = [""] + get_vocab_values("Descriptors", "descriptors.outputs.descriptors.kind")
+                desc_kind_options = [""] + get_vocab_values(vocab, "Descriptors", "descriptors.outputs.descriptors.kind")
                 desc_kind = st.selectbox("Kind", desc_kind_options)
                 desc_source = st.text_input("Source", placeholder="e.g., DFT calculation")
             with col2:
@@ -395,7 +423,7 @@ def render_form():
                 desc_uncertainty = st.text_input("Uncertainty", placeholder="e.g., 0.05")
 
             extra_descriptors = render_extra_vocab_fields(
-                "Descriptors",
+                vocab, "Descriptors",
                 ["descriptors.outputs.descriptors.kind", "descriptors.theoretical_metric"],
                 "desc"
             )
@@ -503,6 +531,7 @@ def render_form():
                 if database.test_db_connection():
                     try:
                         saved_id = database.save_record(record)
+                        portal_cache.invalidate_records()
                         st.success(f"Record saved successfully! ID: {saved_id}")
                         # Generate new ID for next record
                         st.session_state.record_id = generate_ulid()
@@ -3,29 +3,42 @@ ISAAC AI-Ready Record - Ontology/Vocabulary Module
 Wiki-sourced living ontology with proposal/approval workflow.
 
 Data flow:
-  Wiki (source of truth) → sync_from_wiki() → vocabulary_cache table → load_vocabulary()
-  Proposals: user submits → admin approves → apply_approved_proposal() → cache + wiki push
+  Wiki (source of truth) → local mirror (incremental fetch) → sync_from_wiki()
+    → vocabulary_cache table (diff-based write + NOTIFY) → load_vocabulary()
+    (in-memory, dropped on NOTIFY isaac_vocabulary)
+  Proposals: user submits → admin approves → apply_approved_proposals() → cache + wiki push
+    (one cache write, one commit per wiki page, one push per batch)
   Fallback: vocabulary_cache → vocabulary.json (file)
 """
 
+import base64
+import copy
 import json
 import os
 import re
 import tempfile
 import shutil
+import threading
+import time
+from contextlib import contextmanager
 
-import yaml
-import git
-import requests as http_requests
+import artifact
+import suggest
 
-# Path to vocabulary file in data/ directory (fallback)
-VOCAB_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "vocabulary.json")
+# yaml, git (GitPython) and requests are imported inside the wiki-sync,
+# wiki-push and LLM functions that use them: the validation/CRUD hot path
+# that imports this module never needs them, and GitPython in particular
+# is slow to import (it probes the git executable).
+
+# Path to vocabulary file in data/ directory (fallback, read via the compiled artifact)
+VOCAB_FILE = str(artifact.SOURCES["vocabulary"])
 
 # Database imports (optional, for PostgreSQL support)
 try:
     from database import (
         get_db_connection, is_db_configured, test_db_connection,
         save_vocabulary_cache, load_vocabulary_cache, get_last_sync,
+        listen_for_vocabulary_changes, get_term_usage,
     )
     DB_AVAILABLE = True
 except ImportError:
@@ -69,11 +82,8 @@ def is_admin(username: str) -> bool:
 # =============================================================================
 
 def _load_vocabulary_from_file():
-    """Loads the vocabulary JSON file."""
-    if not os.path.exists(VOCAB_FILE):
-        return {}
-    with open(VOCAB_FILE, 'r') as f:
-        return json.load(f)
+    """Returns the seed vocabulary from the compiled artifact (shared; do not mutate)."""
+    return artifact.load().vocabulary
 
 
 # =============================================================================
@@ -81,33 +91,112 @@ def _load_vocabulary_from_file():
 # =============================================================================
 
 def _get_wiki_url():
-    """Get the wiki repo URL, optionally injecting GITHUB_TOKEN for auth."""
-    url = os.environ.get("WIKI_REPO_URL", "")
-    if not url:
-        return None
+    """Get the wiki repo URL (never carries GITHUB_TOKEN; see _wiki_git_env)."""
+    return os.environ.get("WIKI_REPO_URL", "") or None
+
 
+def _wiki_git_env(url: str) -> dict:
+    """
+    Environment that authenticates git against GitHub with GITHUB_TOKEN.
+
+    The token is passed per command as an http.extraHeader through git's
+    GIT_CONFIG_* variables, so it never lands in the mirror's .git/config
+    or on a command line visible in the process list.
+    """
     token = os.environ.get("GITHUB_TOKEN", "")
-    if token and "github.com" in url and "@" not in url:
-        # Inject token: https://github.com/... → https://<token>@github.com/...
-        url = url.replace("https://github.com/", f"https://{token}@github.com/")
-    return url
+    if not token or "github.com" not in url or "@" in url:
+        return {}
+    basic = base64.b64encode(f"x-access-token:{token}".encode("utf-8")).decode("ascii")
+    return {
+        "GIT_CONFIG_COUNT": "1",
+        "GIT_CONFIG_KEY_0": "http.https://github.com/.extraHeader",
+        "GIT_CONFIG_VALUE_0": f"Authorization: Basic {basic}",
+    }
+
+
+# Persistent local mirror of the wiki repo, shared by sync, page reads and
+# pushes. Updated with incremental fetches instead of a clone per operation.
+WIKI_MIRROR_DIR = os.environ.get(
+    "ISAAC_WIKI_MIRROR_DIR", os.path.join(tempfile.gettempdir(), "isaac_wiki_mirror")
+)
+# Minimum seconds between fetches for read-only page lookups (sync and
+# push always fetch).
+WIKI_FETCH_INTERVAL = float(os.environ.get("ISAAC_WIKI_FETCH_INTERVAL", 30))
+
+_mirror_lock = threading.RLock()
+_mirror_fetched_at = 0.0
+# wiki_page -> (blob sha, parsed Controlled Vocabulary dict)
+_parsed_pages = {}
+
+
+@contextmanager
+def _wiki_mirror(fetch: bool = True, force_fetch: bool = False):
+    """
+    Yield the GitPython Repo of the local wiki mirror, cloning it on first
+    use and fast-forwarding it to origin when *fetch* is set (at most every
+    WIKI_FETCH_INTERVAL seconds unless *force_fetch*).
+
+    Held under a thread lock plus an flock on the mirror directory, so
+    concurrent sessions and the API/Streamlit processes sharing a pod never
+    fetch or edit the checkout at the same time.
+    """
+    import fcntl
+    import git  # deferred: see module imports
 
+    global _mirror_fetched_at
 
-def _clone_or_pull_wiki(target_dir: str):
-    """Clone or pull the wiki repo into target_dir using GitPython."""
     url = _get_wiki_url()
     if not url:
         raise ValueError("WIKI_REPO_URL not configured")
 
-    repo_path = os.path.join(target_dir, "wiki")
-
-    if os.path.exists(os.path.join(repo_path, ".git")):
-        repo = git.Repo(repo_path)
-        repo.remotes.origin.pull()
-    else:
-        git.Repo.clone_from(url, repo_path)
+    env = _wiki_git_env(url)
 
-    return repo_path
+    os.makedirs(os.path.dirname(WIKI_MIRROR_DIR) or ".", exist_ok=True)
+    with _mirror_lock, open(WIKI_MIRROR_DIR + ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            repo = None
+            if os.path.exists(os.path.join(WIKI_MIRROR_DIR, ".git")):
+                try:
+                    repo = git.Repo(WIKI_MIRROR_DIR)
+                    origin = repo.remotes.origin
+                    if origin.url != url:  # URL changed, or an old token-bearing one
+                        origin.set_url(url)
+                except (git.InvalidGitRepositoryError, git.NoSuchPathError, AttributeError):
+                    repo = None  # corrupt checkout, or no origin remote
+                if repo is not None and fetch and (
+                        force_fetch or time.monotonic() - _mirror_fetched_at >= WIKI_FETCH_INTERVAL):
+                    # Network/auth errors propagate and keep the checkout
+                    with repo.git.custom_environment(**env):
+                        origin.fetch()
+                    # The mirror never carries local work: anything not
+                    # on origin (e.g. a commit whose push failed) is dropped.
+                    try:
+                        repo.git.reset("--hard", f"origin/{repo.active_branch.name}")
+                    except (git.GitCommandError, TypeError):
+                        repo = None  # broken or detached checkout
+                    else:
+                        _mirror_fetched_at = time.monotonic()
+                if repo is None:
+                    # Start over with a fresh clone
+                    shutil.rmtree(WIKI_MIRROR_DIR, ignore_errors=True)
+                    _parsed_pages.clear()
+            if repo is None:
+                repo = git.Repo.clone_from(url, WIKI_MIRROR_DIR, env=env)
+                _mirror_fetched_at = time.monotonic()
+            with repo.git.custom_environment(**env):
+                yield repo
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_wiki_blob(repo, wiki_page: str):
+    """Return (blob sha, markdown text) for a page at the mirror's HEAD, or (None, '')."""
+    try:
+        blob = repo.head.commit.tree / f"{wiki_page}.md"
+    except KeyError:
+        return None, ""
+    return blob.hexsha, blob.data_stream.read().decode("utf-8")
 
 
 def _parse_yaml_from_markdown(md_content: str) -> dict:
@@ -125,6 +214,8 @@ def _parse_yaml_from_markdown(md_content: str) -> dict:
     Returns:
         Parsed dict from the YAML block, or empty dict if not found/parse error.
     """
+    import yaml  # deferred: see module imports
+
     # Match both ATX (## Heading) and Setext (Heading\n---) style headings
     pattern = r'(?:##\s*Controlled\s+Vocabulary|Controlled\s+Vocabulary\n-+)\s*\n+```yaml\s*\n(.*?)```'
     match = re.search(pattern, md_content, re.DOTALL | re.IGNORECASE)
@@ -144,59 +235,70 @@ def _parse_yaml_from_markdown(md_content: str) -> dict:
 
 def sync_from_wiki(synced_by: str = "system") -> tuple:
     """
-    Clone/pull the wiki, parse each page's Controlled Vocabulary YAML,
+    Fetch the wiki mirror, parse each page's Controlled Vocabulary YAML,
     and save to the vocabulary_cache table.
 
+    Only pages whose blob hash changed since the last sync in this process
+    are re-parsed; unchanged pages reuse their parsed vocabulary.
+
     Returns:
         (success: bool, message: str)
     """
     if not _use_database():
         return False, "Database not available"
 
-    tmp_dir = tempfile.mkdtemp(prefix="isaac_wiki_")
     try:
-        repo_path = _clone_or_pull_wiki(tmp_dir)
-
         vocab = {}
         parsed_pages = 0
+        reparsed_pages = 0
         skipped_pages = []
 
-        for wiki_page, section_name in WIKI_PAGE_TO_SECTION.items():
-            md_file = os.path.join(repo_path, f"{wiki_page}.md")
-            if not os.path.exists(md_file):
-                skipped_pages.append(wiki_page)
-                continue
-
-            with open(md_file, 'r') as f:
-                content = f.read()
-
-            page_vocab = _parse_yaml_from_markdown(content)
-            if page_vocab:
-                vocab[section_name] = {}
-                for key, data in page_vocab.items():
-                    if isinstance(data, dict):
-                        vocab[section_name][key] = {
-                            'description': data.get('description', ''),
-                            'values': data.get('values', [])
-                        }
-                parsed_pages += 1
-            else:
-                skipped_pages.append(wiki_page)
+        with _wiki_mirror(force_fetch=True) as repo:
+            for wiki_page, section_name in WIKI_PAGE_TO_SECTION.items():
+                try:
+                    blob = repo.head.commit.tree / f"{wiki_page}.md"
+                except KeyError:
+                    _parsed_pages.pop(wiki_page, None)
+                    skipped_pages.append(wiki_page)
+                    continue
+
+                cached = _parsed_pages.get(wiki_page)
+                if cached and cached[0] == blob.hexsha:
+                    section_vocab = cached[1]
+                else:
+                    page_vocab = _parse_yaml_from_markdown(blob.data_stream.read().decode("utf-8"))
+                    section_vocab = {}
+                    for key, data in page_vocab.items():
+                        if isinstance(data, dict):
+                            section_vocab[key] = {
+                                'description': data.get('description', ''),
+                                'values': data.get('values', [])
+                            }
+                    _parsed_pages[wiki_page] = (blob.hexsha, section_vocab)
+                    reparsed_pages += 1
+
+                if section_vocab:
+                    vocab[section_name] = section_vocab
+                    parsed_pages += 1
+                else:
+                    skipped_pages.append(wiki_page)
 
         if not vocab:
             return False, "No vocabulary data found in wiki pages"
 
-        save_vocabulary_cache(vocab, synced_by)
+        changed = save_vocabulary_cache(vocab, synced_by)
+        if changed:
+            invalidate_vocabulary_cache()
 
-        msg = f"Synced {parsed_pages} pages, {sum(len(cats) for cats in vocab.values())} categories"
+        msg = (f"Synced {parsed_pages} pages ({reparsed_pages} re-parsed), "
+               f"{sum(len(cats) for cats in vocab.values())} categories"
+               f"{'' if changed else ' (no changes)'}")
         if skipped_pages:
             msg += f" (skipped: {', '.join(skipped_pages)})"
         return True, msg
 
     except Exception as e:
         return False, f"Wiki sync failed: {e}"
-    finally:
-        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
 def _regenerate_yaml_block(vocab_for_section: dict) -> str:
@@ -215,33 +317,35 @@ def _regenerate_yaml_block(vocab_for_section: dict) -> str:
 # LLM-Assisted Wiki Prose Generation (Stanford AI API Gateway)
 # =============================================================================
 
-LLM_API_URL = "https://aiapi-prod.stanford.edu/v1/chat/completions"
+LLM_API_URL = os.environ.get("ISAAC_LLM_API_URL", "https://aiapi-prod.stanford.edu/v1/chat/completions")
 LLM_MODEL = "gemini-2.5-pro"
 
 
-def _get_wiki_page_content(section: str) -> str:
-    """Clone the wiki and return the full markdown content for a section's page."""
+def get_wiki_page(section: str) -> tuple:
+    """
+    Return (blob sha, markdown content) for a section's page from the wiki
+    mirror, or ('', '') if unavailable. The sha identifies the page version.
+    """
     wiki_page = SECTION_TO_WIKI_PAGE.get(section)
     if not wiki_page:
-        return ""
+        return "", ""
 
-    tmp_dir = tempfile.mkdtemp(prefix="isaac_wiki_read_")
     try:
-        repo_path = _clone_or_pull_wiki(tmp_dir)
-        md_file = os.path.join(repo_path, f"{wiki_page}.md")
-        if not os.path.exists(md_file):
-            return ""
-        with open(md_file, 'r') as f:
-            return f.read()
+        with _wiki_mirror() as repo:
+            sha, content = _read_wiki_blob(repo, wiki_page)
+            return sha or "", content
     except Exception:
-        return ""
-    finally:
-        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return "", ""
+
+
+def _get_wiki_page_content(section: str) -> str:
+    """Return the full markdown content for a section's page from the wiki mirror."""
+    return get_wiki_page(section)[1]
 
 
 def generate_wiki_description(section: str, category: str,
                               term: str = None, proposal_type: str = "add_term",
-                              user_description: str = "") -> dict:
+                              user_description: str = "", wiki_content: str = None) -> dict:
     """
     Use Stanford AI API to generate wiki-style description for a new term or category.
 
@@ -251,6 +355,7 @@ def generate_wiki_description(section: str, category: str,
         term: new term value (for add_term)
         proposal_type: 'add_term' or 'add_category'
         user_description: proposer's plain-language description of the term/category
+        wiki_content: the section's wiki page if the caller already read it
 
     Returns:
         {
@@ -270,7 +375,8 @@ def generate_wiki_description(section: str, category: str,
         }
 
     # Get existing wiki page for tone reference
-    wiki_content = _get_wiki_page_content(section)
+    if wiki_content is None:
+        wiki_content = _get_wiki_page_content(section)
     if not wiki_content:
         wiki_content = "(Wiki page not available — generate in a generic scientific style.)"
 
@@ -326,6 +432,8 @@ Return ONLY valid JSON (no markdown fencing):
     else:
         return {'yaml_description': '', 'wiki_prose': '', 'success': False, 'error': f'Unknown type: {proposal_type}'}
 
+    import requests as http_requests  # deferred: see module imports
+
     try:
         resp = http_requests.post(
             LLM_API_URL,
@@ -379,214 +487,427 @@ Return ONLY valid JSON (no markdown fencing):
 # Wiki Push Operations
 # =============================================================================
 
-def push_change_to_wiki(section: str, vocab_for_section: dict,
-                        wiki_prose: str = "", category: str = "",
-                        proposal_type: str = "add_term") -> tuple:
+def _edit_wiki_page(content: str, vocab_for_section: dict, wiki_prose: str = "",
+                    category: str = "", proposal_type: str = "add_term") -> str:
     """
-    Clone the wiki, update the YAML block for the given section,
-    optionally insert wiki prose, commit & push.
+    Return *content* (a wiki page's markdown) with *wiki_prose* inserted at
+    the right place and the Controlled Vocabulary YAML block regenerated
+    from *vocab_for_section*.
+    """
+    # Insert wiki prose into the correct location
+    if wiki_prose and wiki_prose.strip():
+        inserted = False
+
+        if proposal_type == "add_term" and category:
+            # For add_term: find the category's subsection and append
+            # the bullet inside the **Values**: list.
+            # Look for a heading like: ### 2.1 `system.domain`
+            cat_heading = re.search(
+                r'###[^`\n]*`' + re.escape(category) + r'`',
+                content
+            )
+            if cat_heading:
+                # Find the **Values**: bullet within this subsection
+                # (search from the heading to the next ### or ## heading)
+                sub_start = cat_heading.start()
+                next_heading = re.search(r'\n#{2,3}\s', content[sub_start + 1:])
+                sub_end = sub_start + 1 + next_heading.start() if next_heading else len(content)
+                subsection = content[sub_start:sub_end]
+
+                # Find the last indented value bullet (    *   `value`: ...)
+                # to insert after it
+                value_bullets = list(re.finditer(
+                    r'^    \*\s+`[^`]+`\s*:.*$',
+                    subsection,
+                    re.MULTILINE
+                ))
+                if value_bullets:
+                    last_bullet = value_bullets[-1]
+                    # Check for sub-bullets (constraints) after the last value
+                    remaining = subsection[last_bullet.end():]
+                    extra = 0
+                    for line in remaining.split('\n'):
+                        if line.startswith('        *'):
+                            extra += len(line) + 1
+                        elif line.strip() == '':
+                            extra += len(line) + 1
+                            continue
+                        else:
+                            break
+                    abs_insert = sub_start + last_bullet.end() + extra
+                    # Ensure the prose has proper indentation (4 spaces)
+                    prose_line = wiki_prose.strip()
+                    if not prose_line.startswith('    '):
+                        prose_line = '    ' + prose_line
+                    content = content[:abs_insert] + "\n" + prose_line + content[abs_insert:]
+                    inserted = True
+
+        if not inserted:
+            # Fallback for add_category or if subsection not found:
+            # insert before Controlled Vocabulary heading
+            cv_pattern = r'(#{1,2}\s*Controlled\s+Vocabulary|Controlled\s+Vocabulary\n-+)'
+            match = re.search(cv_pattern, content, re.IGNORECASE)
+            if match:
+                insert_pos = match.start()
+                content = content[:insert_pos] + wiki_prose.strip() + "\n\n" + content[insert_pos:]
+            else:
+                content = content.rstrip() + "\n\n" + wiki_prose.strip() + "\n"
 
-    Args:
-        section: section name (e.g. "System")
-        vocab_for_section: full vocabulary dict for this section
-        wiki_prose: optional markdown prose to insert into wiki page
-        category: category key (e.g. "system.domain") — used to locate the right subsection
-        proposal_type: 'add_term' or 'add_category'
+    # Update the YAML block
+    new_yaml = _regenerate_yaml_block(vocab_for_section)
 
-    Returns:
-        (success: bool, message: str)
-    """
-    wiki_page = SECTION_TO_WIKI_PAGE.get(section)
-    if not wiki_page:
-        return False, f"No wiki page mapping for section '{section}'"
+    # Match both ATX (## Heading) and Setext (Heading\n---) style headings
+    yaml_pattern = r'(?:##\s*Controlled\s+Vocabulary|Controlled\s+Vocabulary\n-+)\s*\n+```yaml\s*\n.*?```'
+    if re.search(yaml_pattern, content, re.DOTALL | re.IGNORECASE):
+        # Preserve the original heading style by only replacing from ```yaml onward
+        yaml_only = r'((?:##\s*Controlled\s+Vocabulary|Controlled\s+Vocabulary\n-+)\s*\n+)```yaml\s*\n.*?```'
+        new_content = re.sub(
+            yaml_only,
+            r'\g<1>' + f"```yaml\n{new_yaml}\n```",
+            content,
+            flags=re.DOTALL | re.IGNORECASE
+        )
+    else:
+        new_content = content.rstrip() + "\n\n## Controlled Vocabulary\n\n```yaml\n" + new_yaml + "\n```\n"
 
-    token = os.environ.get("GITHUB_TOKEN", "")
-    if not token:
-        return False, "GITHUB_TOKEN not configured — cannot push to wiki"
+    return new_content
 
-    tmp_dir = tempfile.mkdtemp(prefix="isaac_wiki_push_")
-    try:
-        repo_path = _clone_or_pull_wiki(tmp_dir)
-        md_file = os.path.join(repo_path, f"{wiki_page}.md")
+
+def _commit_wiki_pages(repo, pages: dict, changes: dict, results: dict) -> list:
+    """
+    Edit and commit each page in the mirror (one commit per page).
+
+    Returns:
+        Sections that got a commit; pages that are missing or unchanged are
+        reported in *results*.
+    """
+    committed = []
+    for section, wiki_page in pages.items():
+        vocab_for_section, edits = changes[section]
+        md_file = os.path.join(repo.working_tree_dir, f"{wiki_page}.md")
 
         if not os.path.exists(md_file):
-            return False, f"Wiki page {wiki_page}.md not found"
+            results[section] = (False, f"Wiki page {wiki_page}.md not found")
+            continue
 
         with open(md_file, 'r') as f:
             content = f.read()
 
-        # Insert wiki prose into the correct location
-        if wiki_prose and wiki_prose.strip():
-            inserted = False
-
-            if proposal_type == "add_term" and category:
-                # For add_term: find the category's subsection and append
-                # the bullet inside the **Values**: list.
-                # Look for a heading like: ### 2.1 `system.domain`
-                cat_heading = re.search(
-                    r'###[^`\n]*`' + re.escape(category) + r'`',
-                    content
-                )
-                if cat_heading:
-                    # Find the **Values**: bullet within this subsection
-                    # (search from the heading to the next ### or ## heading)
-                    sub_start = cat_heading.start()
-                    next_heading = re.search(r'\n#{2,3}\s', content[sub_start + 1:])
-                    sub_end = sub_start + 1 + next_heading.start() if next_heading else len(content)
-                    subsection = content[sub_start:sub_end]
-
-                    # Find the last indented value bullet (    *   `value`: ...)
-                    # to insert after it
-                    value_bullets = list(re.finditer(
-                        r'^    \*\s+`[^`]+`\s*:.*$',
-                        subsection,
-                        re.MULTILINE
-                    ))
-                    if value_bullets:
-                        last_bullet = value_bullets[-1]
-                        # Check for sub-bullets (constraints) after the last value
-                        remaining = subsection[last_bullet.end():]
-                        extra = 0
-                        for line in remaining.split('\n'):
-                            if line.startswith('        *'):
-                                extra += len(line) + 1
-                            elif line.strip() == '':
-                                extra += len(line) + 1
-                                continue
-                            else:
-                                break
-                        abs_insert = sub_start + last_bullet.end() + extra
-                        # Ensure the prose has proper indentation (4 spaces)
-                        prose_line = wiki_prose.strip()
-                        if not prose_line.startswith('    '):
-                            prose_line = '    ' + prose_line
-                        content = content[:abs_insert] + "\n" + prose_line + content[abs_insert:]
-                        inserted = True
-
-            if not inserted:
-                # Fallback for add_category or if subsection not found:
-                # insert before Controlled Vocabulary heading
-                cv_pattern = r'(#{1,2}\s*Controlled\s+Vocabulary|Controlled\s+Vocabulary\n-+)'
-                match = re.search(cv_pattern, content, re.IGNORECASE)
-                if match:
-                    insert_pos = match.start()
-                    content = content[:insert_pos] + wiki_prose.strip() + "\n\n" + content[insert_pos:]
-                else:
-                    content = content.rstrip() + "\n\n" + wiki_prose.strip() + "\n"
-
-        # Update the YAML block
-        new_yaml = _regenerate_yaml_block(vocab_for_section)
-
-        # Match both ATX (## Heading) and Setext (Heading\n---) style headings
-        yaml_pattern = r'(?:##\s*Controlled\s+Vocabulary|Controlled\s+Vocabulary\n-+)\s*\n+```yaml\s*\n.*?```'
-        if re.search(yaml_pattern, content, re.DOTALL | re.IGNORECASE):
-            # Preserve the original heading style by only replacing from ```yaml onward
-            yaml_only = r'((?:##\s*Controlled\s+Vocabulary|Controlled\s+Vocabulary\n-+)\s*\n+)```yaml\s*\n.*?```'
-            new_content = re.sub(
-                yaml_only,
-                r'\g<1>' + f"```yaml\n{new_yaml}\n```",
-                content,
-                flags=re.DOTALL | re.IGNORECASE
-            )
-        else:
-            new_content = content.rstrip() + "\n\n## Controlled Vocabulary\n\n```yaml\n" + new_yaml + "\n```\n"
+        # Insert each proposal's prose; the YAML block is rewritten
+        # on every pass, so only the final vocabulary matters.
+        for wiki_prose, category, proposal_type in edits or [("", "", "add_term")]:
+            content = _edit_wiki_page(content, vocab_for_section, wiki_prose,
+                                      category, proposal_type)
 
         with open(md_file, 'w') as f:
-            f.write(new_content)
+            f.write(content)
 
-        # Commit and push
-        repo = git.Repo(repo_path)
         repo.index.add([f"{wiki_page}.md"])
-
         if repo.is_dirty() or repo.untracked_files:
-            repo.index.commit(f"Update vocabulary for {section} (ISAAC Portal)")
-            repo.remotes.origin.push()
-            return True, f"Pushed vocabulary update for {section} to wiki"
+            n = len(edits)
+            repo.index.commit(
+                f"Update vocabulary for {section} (ISAAC Portal)"
+                + (f" — {n} proposals" if n > 1 else "")
+            )
+            committed.append(section)
         else:
-            return True, "No changes to push"
+            results[section] = (True, "No changes to push")
+    return committed
+
+
+def _push_wiki_mirror(repo) -> tuple:
+    """
+    Push the mirror's branch to origin.
 
+    Returns:
+        (error message or None, rejected because origin moved on)
+    """
+    try:
+        infos = repo.remotes.origin.push()
     except Exception as e:
-        return False, f"Wiki push failed: {e}"
-    finally:
-        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return str(e), False
+    if not infos:
+        return "push failed", False
+    for info in infos:
+        if info.flags & (info.ERROR | info.REJECTED | info.REMOTE_REJECTED):
+            return info.summary.strip() or "push rejected", bool(info.flags & info.REJECTED)
+    return None, False
 
 
-def apply_approved_proposal(proposal: dict, wiki_prose: str = "") -> tuple:
+def push_changes_to_wiki(changes: dict) -> dict:
     """
-    Apply an approved proposal: update DB cache and push to wiki (with prose).
+    Apply vocabulary edits for several sections in one mirror session:
+    one commit per wiki page, then a single push. If the push is rejected
+    because someone else pushed first, the edits are redone once on top of
+    the new origin and pushed again.
 
     Args:
-        proposal: dict with proposal_type, section, category, term, description
-        wiki_prose: LLM-generated (admin-edited) prose to insert into wiki page
+        changes: {section: (vocab_for_section, [(wiki_prose, category, proposal_type), ...])}
+            — the prose edits are applied in order, then the section's YAML
+            block is regenerated from vocab_for_section
 
     Returns:
-        (success: bool, message: str, wiki_push_ok: bool)
+        {section: (success: bool, message: str)}
     """
-    vocab = load_vocabulary()
+    results = {}
+    pages = {}
+    for section in changes:
+        wiki_page = SECTION_TO_WIKI_PAGE.get(section)
+        if wiki_page:
+            pages[section] = wiki_page
+        else:
+            results[section] = (False, f"No wiki page mapping for section '{section}'")
+    if not pages:
+        return results
+
+    token = os.environ.get("GITHUB_TOKEN", "")
+    if not token:
+        results.update({s: (False, "GITHUB_TOKEN not configured — cannot push to wiki") for s in pages})
+        return results
+
+    try:
+        with _wiki_mirror(force_fetch=True) as repo:
+            origin_branch = f"origin/{repo.active_branch.name}"
+            for attempt in range(2):
+                committed = _commit_wiki_pages(repo, pages, changes, results)
+                if not committed:
+                    break
+                error, rejected = _push_wiki_mirror(repo)
+                if error is None:
+                    results.update({s: (True, f"Pushed vocabulary update for {s} to wiki")
+                                    for s in committed})
+                    break
+                if rejected and attempt == 0:
+                    # Someone pushed first: redo the edits on top of their commits
+                    repo.remotes.origin.fetch()
+                    repo.git.reset("--hard", origin_branch)
+                    continue
+                # Leave the mirror matching origin for the next reader
+                repo.git.reset("--hard", origin_branch)
+                results.update({s: (False, f"Wiki push failed: {error}") for s in committed})
+                break
 
+    except Exception as e:
+        for section in pages:
+            results.setdefault(section, (False, f"Wiki push failed: {e}"))
+
+    return results
+
+
+def push_change_to_wiki(section: str, vocab_for_section: dict,
+                        wiki_prose: str = "", category: str = "",
+                        proposal_type: str = "add_term") -> tuple:
+    """
+    Update the YAML block for the given section in the wiki mirror,
+    optionally insert wiki prose, commit & push.
+
+    Args:
+        section: section name (e.g. "System")
+        vocab_for_section: full vocabulary dict for this section
+        wiki_prose: optional markdown prose to insert into wiki page
+        category: category key (e.g. "system.domain") — used to locate the right subsection
+        proposal_type: 'add_term' or 'add_category'
+
+    Returns:
+        (success: bool, message: str)
+    """
+    results = push_changes_to_wiki({
+        section: (vocab_for_section, [(wiki_prose, category, proposal_type)]),
+    })
+    return results[section]
+
+
+def _apply_proposal_to_vocab(vocab: dict, proposal: dict) -> tuple:
+    """
+    Apply one proposal to *vocab* in place. An optional '_yaml_description'
+    (the reviewed draft's one-line description) replaces the category's
+    description.
+
+    Returns:
+        (success: bool, message: str) — failure leaves *vocab* untouched
+    """
     section = proposal['section']
     proposal_type = proposal['proposal_type']
 
-    if section not in vocab:
-        vocab[section] = {}
-
     if proposal_type == 'add_term':
         category = proposal['category']
         term = proposal['term']
-        if category not in vocab[section]:
-            return False, f"Category '{category}' not found in '{section}'", False
+        if category not in vocab.get(section, {}):
+            return False, f"Category '{category}' not found in '{section}'"
         if term in vocab[section][category]['values']:
-            return False, f"Term '{term}' already exists", False
+            return False, f"Term '{term}' already exists"
         vocab[section][category]['values'].append(term)
+        if proposal.get('_yaml_description'):
+            vocab[section][category]['description'] = proposal['_yaml_description']
 
     elif proposal_type == 'add_category':
         category = proposal['category']
-        description = proposal.get('description', '')
-        if category in vocab[section]:
-            return False, f"Category '{category}' already exists", False
-        vocab[section][category] = {'description': description, 'values': []}
+        description = proposal.get('_yaml_description') or proposal.get('description', '')
+        if category in vocab.get(section, {}):
+            return False, f"Category '{category}' already exists"
+        vocab.setdefault(section, {})[category] = {'description': description, 'values': []}
 
     else:
-        return False, f"Unknown proposal type: {proposal_type}", False
+        return False, f"Unknown proposal type: {proposal_type}"
+
+    return True, f"Applied proposal: {proposal_type}"
+
+
+def apply_approved_proposals(batch: list, reviewed_by: str = "system") -> list:
+    """
+    Apply a batch of approved proposals: every change is applied to one
+    in-memory vocabulary, the DB cache is written once, and the wiki gets
+    one commit per touched page (single push).
+
+    A proposal that conflicts (term already present, unknown category, a
+    duplicate within the batch) fails on its own; the rest still apply.
+
+    Args:
+        batch: list of (proposal, wiki_prose) pairs, applied in order
+        reviewed_by: recorded in the vocabulary sync log
+
+    Returns:
+        List of (success: bool, message: str, wiki_push_ok: bool), one per
+        batch entry in the same order.
+    """
+    vocab = copy.deepcopy(load_vocabulary())
+
+    results = [None] * len(batch)
+    changes = {}
+    applied = []
+    for i, (proposal, wiki_prose) in enumerate(batch):
+        ok, msg = _apply_proposal_to_vocab(vocab, proposal)
+        if not ok:
+            results[i] = (False, msg, False)
+            continue
+        applied.append(i)
+        edits = changes.setdefault(proposal['section'], [])
+        edits.append((wiki_prose, proposal.get('category', ''), proposal['proposal_type']))
+
+    if not applied:
+        return results
 
     # Update DB cache
     if _use_database():
         try:
-            save_vocabulary_cache(vocab, proposal.get('reviewed_by', 'system'))
+            save_vocabulary_cache(vocab, reviewed_by or 'system')
+            invalidate_vocabulary_cache()
         except Exception as e:
-            return False, f"Failed to update cache: {e}", False
+            for i in applied:
+                results[i] = (False, f"Failed to update cache: {e}", False)
+            return results
 
     # Push to wiki (with prose)
-    wiki_push_ok = True
-    wiki_msg = ""
     try:
-        ok, wiki_msg = push_change_to_wiki(
-            section, vocab[section], wiki_prose=wiki_prose,
-            category=proposal.get('category', ''),
-            proposal_type=proposal_type
-        )
-        wiki_push_ok = ok
+        wiki_results = push_changes_to_wiki({
+            section: (vocab[section], edits) for section, edits in changes.items()
+        })
     except Exception as e:
-        wiki_push_ok = False
-        wiki_msg = str(e)
+        wiki_results = {section: (False, str(e)) for section in changes}
 
-    msg = f"Applied proposal: {proposal_type}"
-    if not wiki_push_ok:
-        msg += f" (wiki push warning: {wiki_msg})"
+    for i in applied:
+        proposal = batch[i][0]
+        wiki_ok, wiki_msg = wiki_results.get(proposal['section'], (False, "not pushed"))
+        msg = f"Applied proposal: {proposal['proposal_type']}"
+        if not wiki_ok:
+            msg += f" (wiki push warning: {wiki_msg})"
+        results[i] = (True, msg, wiki_ok)
 
-    return True, msg, wiki_push_ok
+    return results
+
+
+def apply_approved_proposal(proposal: dict, wiki_prose: str = "") -> tuple:
+    """
+    Apply an approved proposal: update DB cache and push to wiki (with prose).
+
+    Args:
+        proposal: dict with proposal_type, section, category, term, description
+            (and optionally _yaml_description)
+        wiki_prose: LLM-generated (admin-edited) prose to insert into wiki page
+
+    Returns:
+        (success: bool, message: str, wiki_push_ok: bool)
+    """
+    return apply_approved_proposals(
+        [(proposal, wiki_prose)], proposal.get('reviewed_by') or 'system'
+    )[0]
 
 
 # =============================================================================
 # Public API
 # =============================================================================
 
+# In-memory copy of vocabulary_cache. Only trusted while the LISTEN thread
+# is connected: every NOTIFY from save_vocabulary_cache (any process) bumps
+# _vocab_version and drops the copy, so readers never poll the database.
+_vocab_lock = threading.Lock()
+_vocab_memory = None
+_vocab_version = 0
+_vocab_listener = None
+_vocab_listener_stop = threading.Event()
+_vocab_listener_connected = False
+
+
+def invalidate_vocabulary_cache():
+    """Drop the in-memory vocabulary; the next load_vocabulary() re-reads the DB."""
+    global _vocab_memory, _vocab_version
+    with _vocab_lock:
+        _vocab_memory = None
+        _vocab_version += 1
+
+
+def get_vocabulary_version() -> int:
+    """Counter bumped on every vocabulary change seen by this process (for derived caches)."""
+    return _vocab_version
+
+
+def _on_vocabulary_notify(connected: bool):
+    global _vocab_listener_connected
+    _vocab_listener_connected = connected
+    invalidate_vocabulary_cache()
+
+
+def _listen_loop():
+    global _vocab_listener_connected
+    try:
+        listen_for_vocabulary_changes(_on_vocabulary_notify, _vocab_listener_stop)
+    finally:
+        _vocab_listener_connected = False
+
+
+def _ensure_vocabulary_listener():
+    """Start the LISTEN thread once per process (requires a configured DB)."""
+    global _vocab_listener
+    if _vocab_listener is not None and _vocab_listener.is_alive():
+        return
+    with _vocab_lock:
+        if _vocab_listener is None or not _vocab_listener.is_alive():
+            _vocab_listener = threading.Thread(
+                target=_listen_loop, name="isaac-vocab-listener", daemon=True)
+            _vocab_listener.start()
+
+
 def load_vocabulary():
-    """Loads the vocabulary from DB cache, falling back to file."""
+    """
+    Loads the vocabulary from DB cache, falling back to file.
+
+    The DB result is kept in memory until a vocabulary NOTIFY arrives.
+    Callers must not mutate the returned dict (copy.deepcopy it first).
+    """
+    global _vocab_memory
+    if _vocab_memory is not None and _vocab_listener_connected:
+        return _vocab_memory
+
     if _use_database():
+        _ensure_vocabulary_listener()
         try:
+            version = _vocab_version
             cached = load_vocabulary_cache()
             if cached:
+                with _vocab_lock:
+                    # Skip storing if a NOTIFY arrived while we were reading
+                    if version == _vocab_version:
+                        _vocab_memory = cached
                 return cached
         except Exception:
             pass
@@ -607,6 +928,56 @@ def get_categories(section):
     return {}
 
 
+def get_vocabulary_usage(category: str = None) -> dict:
+    """
+    Per-category term usage from the incrementally maintained
+    vocabulary_term_usage rollup, joined with the live vocabulary so unused
+    terms and categories show up too.
+
+    Args:
+        category: only this category key, or None for all
+
+    Returns:
+        {category: {'section', 'records_using', 'terms': [{'term',
+        'record_count', 'sample_record_ids', 'in_vocabulary'}], 'unused_terms'}}
+        where records_using sums per-term counts (a record using two terms
+        of one category counts twice).
+    """
+    vocab = load_vocabulary()
+    rows = get_term_usage(category) if _use_database() else []
+
+    usage = {}
+    for section, categories in vocab.items():
+        for cat_key, cat_data in categories.items():
+            if cat_key in _SKIP_CATEGORIES or (category and cat_key != category):
+                continue
+            if 'values' not in cat_data:
+                continue
+            usage[cat_key] = {
+                'section': section,
+                'records_using': 0,
+                'terms': [],
+                'unused_terms': list(cat_data.get('values') or []),
+            }
+
+    for row in rows:
+        entry = usage.setdefault(row['category'], {
+            'section': None, 'records_using': 0, 'terms': [], 'unused_terms': [],
+        })
+        in_vocab = row['term'] in entry['unused_terms']
+        if in_vocab:
+            entry['unused_terms'].remove(row['term'])
+        entry['records_using'] += row['record_count']
+        entry['terms'].append({
+            'term': row['term'],
+            'record_count': row['record_count'],
+            'sample_record_ids': row['sample_record_ids'],
+            'in_vocabulary': in_vocab,
+        })
+
+    return usage
+
+
 def add_term(section, category, term):
     """Deprecated — returns message directing to proposal workflow."""
     return False, "Direct edits are disabled. Please use the Propose form to suggest changes."
@@ -626,7 +997,9 @@ def sync_file_to_db():
     if not vocab:
         return False, "No vocabulary file found"
 
-    save_vocabulary_cache(vocab, "file_sync")
+    if not save_vocabulary_cache(vocab, "file_sync"):
+        return True, "Vocabulary cache already up to date"
+    invalidate_vocabulary_cache()
     return True, f"Synced {sum(len(cats) for cats in vocab.values())} categories to database"
 
 
@@ -635,7 +1008,28 @@ def sync_file_to_db():
 # =============================================================================
 
 # Category keys that are namespaces (not enum fields in the record)
-_SKIP_CATEGORIES = {"descriptors.theoretical_metric"}
+_SKIP_CATEGORIES = artifact.SKIP_CATEGORIES
+
+# (vocabulary dict, compiled lookups, alias map) for the last vocabulary
+# validated against; load_vocabulary() returns the same dict until it changes.
+_lookups_for = (None, (), {})
+
+
+def _vocabulary_lookups(vocab: dict) -> tuple:
+    """
+    (artifact.compile_vocabulary_lookups(vocab), artifact.term_aliases(vocab)),
+    reused while *vocab* is unchanged.
+    """
+    global _lookups_for
+    snapshot = artifact.load()
+    if vocab is snapshot.vocabulary:
+        return snapshot.vocabulary_lookups, snapshot.term_aliases
+    cached_vocab, lookups, aliases = _lookups_for
+    if cached_vocab is not vocab:
+        lookups = artifact.compile_vocabulary_lookups(vocab)
+        aliases = artifact.term_aliases(vocab)
+        _lookups_for = (vocab, lookups, aliases)
+    return lookups, aliases
 
 
 def _resolve_path(data, path_parts):
@@ -676,11 +1070,33 @@ def _resolve_path(data, path_parts):
     return results
 
 
+def extract_record_terms(record: dict) -> set:
+    """
+    {(category key, value)} for every string found at a vocabulary
+    category's path in *record* — the rows database.save_record() indexes
+    in record_terms. Values need not be in the vocabulary.
+    """
+    vocab = load_vocabulary()
+    if not vocab:
+        return set()
+
+    terms = set()
+    lookups, _aliases = _vocabulary_lookups(vocab)
+    for cat_key, path_parts, _allowed, _allowed_set, _index in lookups:
+        for _path, value in _resolve_path(record, list(path_parts)):
+            if isinstance(value, str) and value:
+                terms.add((cat_key, value))
+    return terms
+
+
 def validate_record_vocabulary(record):
     """
     Validate *record* (a dict) against the live vocabulary.
 
-    Returns a list of error dicts ``[{"path": ..., "message": ...}]``.
+    Returns a list of error dicts ``[{"path": ..., "message": ...,
+    "suggestions": [...]}]`` — suggestions are the closest allowed terms,
+    best first (possibly empty); the message lists at most
+    suggest.MAX_LISTED_VALUES allowed values.
     An empty list means all vocabulary terms are valid.
     """
     vocab = load_vocabulary()
@@ -688,28 +1104,25 @@ def validate_record_vocabulary(record):
         return []  # No vocabulary loaded — skip validation
 
     errors = []
+    lookups, aliases = _vocabulary_lookups(vocab)
 
-    for section_name, categories in vocab.items():
-        for cat_key, cat_data in categories.items():
-            if cat_key in _SKIP_CATEGORIES:
-                continue
-
-            allowed = cat_data.get("values", [])
-            if not allowed:
-                continue
+    for cat_key, path_parts, allowed, allowed_set, index in lookups:
+        hits = _resolve_path(record, list(path_parts))
 
-            path_parts = cat_key.split(".")
-            hits = _resolve_path(record, path_parts)
-
-            for dotted_path, value in hits:
-                if isinstance(value, str) and value not in allowed:
-                    errors.append({
-                        "path": dotted_path,
-                        "message": (
-                            f"'{value}' is not in the vocabulary for "
-                            f"{cat_key}. Allowed: {allowed}"
-                        ),
-                    })
+        for dotted_path, value in hits:
+            if isinstance(value, str) and value not in allowed_set:
+                suggestions = index.suggest(value, aliases)
+                hint = ""
+                if suggestions:
+                    hint = " Did you mean " + " or ".join(f"'{t}'" for t in suggestions) + "?"
+                errors.append({
+                    "path": dotted_path,
+                    "message": (
+                        f"'{value}' is not in the vocabulary for {cat_key}.{hint} "
+                        f"Allowed ({len(allowed)}): {suggest.format_allowed(allowed)}"
+                    ),
+                    "suggestions": suggestions,
+                })
 
     return errors
 
@@ -777,8 +1190,6 @@ def merge_vocabulary_into_schema(schema: dict) -> dict:
     vocabulary values so the returned schema is the single source of truth.
     Fields not covered by the vocabulary are left untouched.
     """
-    import copy
-
     vocab = load_vocabulary()
     if not vocab:
         return copy.deepcopy(schema)
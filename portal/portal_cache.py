@@ -0,0 +1,83 @@
+"""
+ISAAC AI-Ready Record - Portal Resource Cache
+Process-wide caches for what the Streamlit portal reads on every rerun, so
+clicking a widget does not cost a round of database queries. Entries are
+shared by all sessions in the process (st.cache_data) and bounded by an
+explicit TTL; writes made through the portal clear the affected entries
+immediately, writes made elsewhere (API, other processes) show up within
+one TTL.
+
+    db_online                test_db_connection()    ISAAC_PORTAL_HEALTH_TTL (15 s)
+    pending_proposal_count   menu badge              ISAAC_PORTAL_PENDING_TTL (30 s)
+    dashboard                record / access / validation counters and the
+                             top material & technique rollups
+                                                     ISAAC_PORTAL_STATS_TTL (60 s)
+
+Vocabulary-derived values (dashboard compliance, the ontology diagram in
+app.py, the Record Form option lists in form.py) are additionally keyed by
+ontology.get_vocabulary_version(), which the vocabulary LISTEN thread bumps
+on every change, so a vocabulary edit in any process invalidates them
+without polling. The vocabulary itself is already held in memory by
+ontology.load_vocabulary().
+
+Invalidation hooks for portal writes:
+    invalidate_records()     after save_record / delete_record
+    invalidate_proposals()   after creating or reviewing a proposal
+"""
+
+import os
+
+import streamlit as st
+
+import database
+import ontology
+
+HEALTH_TTL = float(os.environ.get("ISAAC_PORTAL_HEALTH_TTL", 15))
+PENDING_TTL = float(os.environ.get("ISAAC_PORTAL_PENDING_TTL", 30))
+STATS_TTL = float(os.environ.get("ISAAC_PORTAL_STATS_TTL", 60))
+
+
+@st.cache_data(ttl=HEALTH_TTL, show_spinner=False)
+def db_online() -> bool:
+    """database.test_db_connection(), checked at most once per HEALTH_TTL."""
+    return database.test_db_connection()
+
+
+@st.cache_data(ttl=PENDING_TTL, show_spinner=False)
+def pending_proposal_count() -> int:
+    """Number of pending vocabulary proposals (Admin Review badge)."""
+    return database.count_pending_proposals()
+
+
+@st.cache_data(ttl=STATS_TTL, show_spinner=False)
+def _dashboard(vocab_version: int) -> dict:
+    import validation  # deferred: validation loads the artifact at import
+    return {
+        "stats": database.get_dashboard_stats(),
+        "access": database.get_access_stats(),
+        "compliance": database.get_validation_summary(validation.rules_version()),
+        "top_materials": database.get_rollups("material", limit=10, descriptors=0),
+        "top_techniques": database.get_rollups("technique", limit=10, descriptors=0),
+    }
+
+
+def dashboard() -> dict:
+    """
+    Everything the Dashboard page shows, from one cached entry.
+
+    Returns:
+        Dict with 'stats' (get_dashboard_stats), 'access' (get_access_stats),
+        'compliance' (get_validation_summary for the current rules),
+        'top_materials' and 'top_techniques' (get_rollups)
+    """
+    return _dashboard(ontology.get_vocabulary_version())
+
+
+def invalidate_records():
+    """Drop cached record counters after the portal wrote or deleted a record."""
+    _dashboard.clear()
+
+
+def invalidate_proposals():
+    """Drop the cached pending-proposal count after a proposal changed."""
+    pending_proposal_count.clear()
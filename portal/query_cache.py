@@ -0,0 +1,169 @@
+"""
+ISAAC AI-Ready Record - Agent Query Result Cache
+Per-process cache in front of database.execute_readonly_query() for the
+SQL that nano ISAAC generates. Researchers ask the same few questions all
+day; a repeat turn is answered from memory instead of re-running the JSONB
+explosions over every record.
+
+    key           sha256 of the normalized SQL (comments dropped, whitespace
+                  collapsed and keywords lower-cased outside quoted literals)
+                  plus the row limit
+    invalidation  every entry remembers the records write generation
+                  (database.get_records_generation(), bumped by a statement
+                  trigger on records); a lookup under a newer generation is a
+                  miss, so an upload is visible to the very next question
+    bounds        ISAAC_QUERY_CACHE_TTL seconds (default 300) and
+                  ISAAC_QUERY_CACHE_SIZE entries (default 256, LRU)
+    bypass        queries calling non-deterministic functions (now(),
+                  random(), age(ts), ...) or using clock-relative literals
+                  ('now', 'today', ...) or reading tables that change without a
+                  records write (access logs, vocabulary, portal_meta,
+                  system catalogs) always run against the database
+
+Lookups are counted in isaac_query_cache_lookups_total{result=hit|miss|bypass}
+and summarised by stats(). Set ISAAC_QUERY_CACHE_SIZE=0 to disable.
+"""
+
+import copy
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import database
+import metrics
+
+logger = logging.getLogger("isaac-query-cache")
+
+CACHE_TTL = float(os.environ.get("ISAAC_QUERY_CACHE_TTL", 300))
+CACHE_SIZE = int(os.environ.get("ISAAC_QUERY_CACHE_SIZE", 256))
+
+# Functions whose result differs between identical executions
+_NONDETERMINISTIC = re.compile(
+    r"\b(now|random|setseed|clock_timestamp|statement_timestamp|transaction_timestamp|"
+    r"timeofday|current_timestamp|current_date|current_time|localtime|localtimestamp|"
+    r"gen_random_uuid|uuid_generate_v\d\w*|nextval|currval|lastval|txid_current\w*|"
+    r"pg_sleep\w*|tablesample)\b"
+    # age(ts) measures from the current date (two-argument age is pure, but rare)
+    r"|\bage\s*\("
+)
+# Literals the date/time input functions resolve against the clock
+# ('now'::timestamptz, DATE 'today', ...)
+_TIME_LITERAL = re.compile(r"'\s*(now|today|tomorrow|yesterday)\s*'", re.IGNORECASE)
+# Tables that change without a records write (so the generation misses them)
+_UNTRACKED_TABLES = re.compile(
+    r"\b(portal_meta|templates|portal_access_log|portal_access_stats|api_audit_log|"
+    r"vocabulary_cache|vocabulary_sync_log|vocabulary_proposals|pg_\w+|information_schema)\b"
+)
+
+_LITERAL = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+_LINE_COMMENT = re.compile(r"--[^\n]*")
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+
+CACHE_LOOKUPS = metrics.REGISTRY.counter(
+    "isaac_query_cache_lookups_total", "Agent SQL result cache lookups by result (hit/miss/bypass).",
+    ("result",),
+)
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # key -> (generation, stored_at, rows)
+_stats = {"hit": 0, "miss": 0, "bypass": 0, "evicted": 0, "invalidated": 0}
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Canonical form of *sql* for cache keys: quoted literals and identifiers
+    are kept verbatim, everything else loses comments, redundant whitespace
+    and case, and trailing semicolons are dropped.
+    """
+    parts = _LITERAL.split(sql.strip())
+    out = []
+    for i, part in enumerate(parts):
+        if i % 2:  # quoted literal / identifier
+            out.append(part)
+            continue
+        part = _BLOCK_COMMENT.sub(" ", _LINE_COMMENT.sub(" ", part))
+        out.append(_WHITESPACE.sub(" ", part).lower())
+    return "".join(out).strip().rstrip(";").strip()
+
+
+def is_cacheable(normalized: str) -> bool:
+    """False if the (normalized) query is non-deterministic or reads untracked tables."""
+    parts = _LITERAL.split(normalized)
+    unquoted = " ".join(parts[::2])
+    if any(_TIME_LITERAL.fullmatch(literal) for literal in parts[1::2]):
+        return False
+    return not (_NONDETERMINISTIC.search(unquoted) or _UNTRACKED_TABLES.search(unquoted))
+
+
+def _key(normalized: str, max_rows: int) -> str:
+    return hashlib.sha256(f"{max_rows}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+def _count(result: str):
+    _stats[result] += 1
+    CACHE_LOOKUPS.inc(result=result)
+
+
+def execute(sql: str, max_rows: int = 50, timeout_ms: int = 5000) -> list:
+    """
+    database.execute_readonly_query() with result caching.
+
+    Same arguments, return value and exceptions. Returned rows are copies,
+    so callers may modify them freely. Failed queries are never cached.
+    """
+    normalized = normalize_sql(sql)
+    if CACHE_SIZE <= 0 or not is_cacheable(normalized):
+        with _lock:
+            _count("bypass")
+        return database.execute_readonly_query(sql, max_rows=max_rows, timeout_ms=timeout_ms)
+
+    generation = database.get_records_generation()
+    if generation is None:
+        with _lock:
+            _count("bypass")
+        return database.execute_readonly_query(sql, max_rows=max_rows, timeout_ms=timeout_ms)
+
+    key = _key(normalized, max_rows)
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            cached_generation, stored_at, rows = entry
+            if cached_generation == generation and now - stored_at < CACHE_TTL:
+                _cache.move_to_end(key)
+                _count("hit")
+                return copy.deepcopy(rows)
+            del _cache[key]
+            _stats["invalidated"] += 1
+        _count("miss")
+
+    rows = database.execute_readonly_query(sql, max_rows=max_rows, timeout_ms=timeout_ms)
+
+    with _lock:
+        _cache[key] = (generation, now, copy.deepcopy(rows))
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+            _stats["evicted"] += 1
+    return rows
+
+
+def stats() -> dict:
+    """Hit/miss/bypass/eviction counters, hit ratio and current size."""
+    with _lock:
+        result = dict(_stats)
+        result["size"] = len(_cache)
+    lookups = result["hit"] + result["miss"]
+    result["hit_ratio"] = result["hit"] / lookups if lookups else 0.0
+    return result
+
+
+def clear():
+    """Drop every cached result in this process."""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,169 @@
+"""
+ISAAC AI-Ready Record - Background Re-validation
+Keeps the stored per-record validation status (records.validation_status /
+rules_version) current when the rules change, from a daemon thread.
+
+save_record() stamps every record it writes with validation.rules_version().
+When that version moves (schema or seed vocabulary rebuilt, live vocabulary
+synced or extended, validation.RULES_REVISION bumped) existing records become
+"stale". Each round checks the record_validation_stats counters (no scan);
+if anything is stale it walks only those records in id order, validates each
+batch on a small thread pool, writes the outcomes back in one statement and
+sleeps between batches so the sweep never saturates the database.
+
+A non-blocking Postgres advisory lock keeps it to one sweep at a time across
+all API workers and Streamlit processes. A vocabulary sync finished by this
+process (sync_worker listener) wakes the thread early.
+
+Configuration:
+    ISAAC_REVALIDATE_INTERVAL    seconds between rounds (default 600)
+    ISAAC_REVALIDATE_BATCH_SIZE  records per batch (default 200)
+    ISAAC_REVALIDATE_WORKERS     validation threads per batch (default 4)
+    ISAAC_REVALIDATE_THROTTLE    seconds slept between batches (default 0.5)
+    ISAAC_REVALIDATE_WORKER      set to 0 to disable the thread in this process
+"""
+
+import logging
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+
+logger = logging.getLogger("isaac-revalidation")
+
+REVALIDATE_INTERVAL = float(os.environ.get("ISAAC_REVALIDATE_INTERVAL", 600))
+REVALIDATE_BATCH_SIZE = int(os.environ.get("ISAAC_REVALIDATE_BATCH_SIZE", 200))
+REVALIDATE_WORKERS = int(os.environ.get("ISAAC_REVALIDATE_WORKERS", 4))
+REVALIDATE_THROTTLE = float(os.environ.get("ISAAC_REVALIDATE_THROTTLE", 0.5))
+
+# pg_try_advisory_lock key: one sweep at a time across the cluster
+REVALIDATE_LOCK_KEY = 0x15AAC0004
+
+_thread = None
+_thread_lock = threading.Lock()
+_stop = threading.Event()
+_wake = threading.Event()
+
+last_result = None
+
+
+def _validate(row: dict, version: str) -> tuple:
+    import validation  # deferred: validation loads the artifact at import
+    result = validation.validate_record_full(row["data"])
+    if result["valid"]:
+        return row["record_id"], row["row_version"], "valid", None, version
+    return (row["record_id"], row["row_version"], "invalid",
+            validation.summarize_errors(result), version)
+
+
+def sweep_once(batch_size: int = None, workers: int = None, throttle: float = None,
+               progress=None):
+    """
+    Re-validate every record whose stored rules version is not current.
+
+    Args:
+        batch_size, workers, throttle: override the ISAAC_REVALIDATE_* settings
+        progress: optional callback(summary dict) after each batch
+
+    Returns:
+        Summary dict ('rules_version', 'checked', 'valid', 'invalid',
+        'batches'), or None if skipped because another process is sweeping
+        or nothing is stale.
+    """
+    global last_result
+    import validation  # deferred: validation loads the artifact at import
+
+    batch_size = batch_size or REVALIDATE_BATCH_SIZE
+    workers = max(1, workers or REVALIDATE_WORKERS)
+    throttle = REVALIDATE_THROTTLE if throttle is None else throttle
+
+    version = validation.rules_version()
+    if database.get_validation_summary(version)["stale"] == 0:
+        return None
+
+    conn = database.get_db_connection()
+    conn.autocommit = True
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT pg_try_advisory_lock(%s) AS locked", (REVALIDATE_LOCK_KEY,))
+        if not cur.fetchone()["locked"]:
+            return None
+        try:
+            summary = {"rules_version": version, "checked": 0, "valid": 0,
+                       "invalid": 0, "batches": 0}
+            after_id = 0
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix="isaac-revalidate") as pool:
+                while not _stop.is_set():
+                    rows = database.list_stale_records(version, after_id, batch_size)
+                    if not rows:
+                        break
+                    results = list(pool.map(lambda row: _validate(row, version), rows))
+                    database.store_validation_results(results)
+                    for _, _, status, _, _ in results:
+                        summary[status] += 1
+                    summary["checked"] += len(results)
+                    summary["batches"] += 1
+                    after_id = rows[-1]["id"]
+                    if progress:
+                        progress(summary)
+                    if throttle and _stop.wait(throttle):
+                        break
+        finally:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (REVALIDATE_LOCK_KEY,))
+    finally:
+        cur.close()
+        conn.close()
+
+    last_result = summary
+    logger.info("Re-validated %d record(s) under rules %s: %d valid, %d invalid",
+                summary["checked"], version, summary["valid"], summary["invalid"])
+    return summary
+
+
+def _on_sync(ok: bool, msg: str):
+    if ok:
+        _wake.set()
+
+
+def _run():
+    # Spread the first round so processes started together don't collide
+    if _stop.wait(random.uniform(0, 30.0)):
+        return
+    while not _stop.is_set():
+        try:
+            sweep_once()
+        except Exception as exc:
+            logger.warning("Re-validation round failed: %s", exc)
+        _wake.wait(REVALIDATE_INTERVAL)
+        _wake.clear()
+
+
+def start() -> bool:
+    """
+    Start the background re-validation thread in this process (idempotent).
+
+    Returns:
+        True if the worker is running.
+    """
+    global _thread
+    if os.environ.get("ISAAC_REVALIDATE_WORKER", "1") == "0":
+        return False
+    if not database.is_db_configured():
+        return False
+    import sync_worker  # deferred: only needed to hook sync completion
+    sync_worker.add_listener(_on_sync)
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _stop.clear()
+            _thread = threading.Thread(target=_run, name="isaac-revalidate", daemon=True)
+            _thread.start()
+    return True
+
+
+def stop():
+    """Ask the worker to exit after its current batch."""
+    _stop.set()
+    _wake.set()
@@ -0,0 +1,126 @@
+"""
+ISAAC AI-Ready Record - Overview Rollup Reconciliation
+Periodically reconciles the precomputed overview tables (record_rollups,
+record_rollup_descriptors) from a daemon thread.
+
+The records_rollups trigger maintains the rollups incrementally on every
+insert, update and delete — record counts per domain, descriptor counts,
+sums and sums of squares stay exact. Ranges only ever widen, though: the
+trigger cannot know the new first/last creation time or descriptor min/max
+once the record holding them is gone. Each round of this worker
+recomputes both tables from a snapshot and applies the difference
+(database.reconcile_rollups()), tightening the ranges and repairing any
+drift without blocking record writes, and logs how many rollup rows had
+changed.
+
+Every process that calls start() runs the loop, but each round takes a
+non-blocking Postgres advisory lock and checks when the rollups were last
+reconciled by *any* process (portal_meta 'rollups_reconciled_at'), so at
+most one reconciliation runs roughly once per interval across the cluster.
+
+Configuration:
+    ISAAC_ROLLUP_RECONCILE_INTERVAL  seconds between reconciliations (default 3600)
+    ISAAC_ROLLUP_WORKER              set to 0 to disable the thread in this process
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+
+import database
+
+logger = logging.getLogger("isaac-rollups")
+
+RECONCILE_INTERVAL = float(os.environ.get("ISAAC_ROLLUP_RECONCILE_INTERVAL", 3600))
+
+# pg_try_advisory_lock key: one reconciliation at a time across the cluster
+ROLLUP_LOCK_KEY = 0x15AAC0005
+
+_thread = None
+_thread_lock = threading.Lock()
+_stop = threading.Event()
+
+last_result = None
+
+
+def reconcile_once(min_age: float = None):
+    """
+    Rebuild the rollups if no other process is doing so and the last
+    reconciliation (by any process) is older than *min_age* seconds.
+
+    Args:
+        min_age: defaults to RECONCILE_INTERVAL; pass 0 to force
+
+    Returns:
+        Counts dict from database.reconcile_rollups(), or None if skipped.
+    """
+    global last_result
+
+    if min_age is None:
+        min_age = RECONCILE_INTERVAL
+
+    conn = database.get_db_connection()
+    conn.autocommit = True
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT pg_try_advisory_lock(%s) AS locked", (ROLLUP_LOCK_KEY,))
+        if not cur.fetchone()["locked"]:
+            return None
+        try:
+            reconciled_at = float(database.get_meta("rollups_reconciled_at", 0) or 0)
+            if time.time() - reconciled_at < min_age:
+                return None
+            result = database.reconcile_rollups()
+            database.set_meta("rollups_reconciled_at", time.time())
+        finally:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (ROLLUP_LOCK_KEY,))
+    finally:
+        cur.close()
+        conn.close()
+
+    last_result = result
+    if result["drift"]:
+        logger.warning("Rollups reconciled, %d row(s) had drifted: %s", result["drift"], result)
+    else:
+        logger.info("Rollups reconciled: %s", result)
+    return result
+
+
+def _run():
+    # Spread the first round so processes started together don't collide
+    if _stop.wait(random.uniform(0, 60.0)):
+        return
+    while not _stop.is_set():
+        try:
+            reconcile_once()
+        except Exception as exc:
+            logger.warning("Rollup reconciliation failed: %s", exc)
+        if _stop.wait(max(RECONCILE_INTERVAL / 4, 60.0)):
+            return
+
+
+def start() -> bool:
+    """
+    Start the background reconciliation thread in this process (idempotent).
+
+    Returns:
+        True if the worker is running.
+    """
+    global _thread
+    if os.environ.get("ISAAC_ROLLUP_WORKER", "1") == "0":
+        return False
+    if not database.is_db_configured():
+        return False
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _stop.clear()
+            _thread = threading.Thread(target=_run, name="isaac-rollups", daemon=True)
+            _thread.start()
+    return True
+
+
+def stop():
+    """Ask the worker to exit after its current round."""
+    _stop.set()
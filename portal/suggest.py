@@ -0,0 +1,114 @@
+"""
+ISAAC AI-Ready Record - Vocabulary Suggestions
+"Did you mean" lookups for vocabulary validation errors.
+
+TermIndex is a per-category trigram index built once per vocabulary
+version (in the compiled artifact for the seed vocabulary, and by
+ontology for the live one). A lookup touches only the postings for the
+bad value's trigrams, so it costs microseconds regardless of enum size.
+
+Suggestions are ranked: alias map target (units.aliases /
+descriptors.product_aliases), then separator/case-insensitive match, then
+trigram similarity (Dice coefficient).
+"""
+
+import os
+import re
+
+# Suggestions returned per bad value, and allowed values quoted in the message
+MAX_SUGGESTIONS = int(os.environ.get("ISAAC_VOCAB_MAX_SUGGESTIONS", 3))
+MAX_LISTED_VALUES = int(os.environ.get("ISAAC_VOCAB_MAX_LISTED_VALUES", 10))
+# Minimum trigram similarity for a fuzzy suggestion
+MIN_SIMILARITY = 0.3
+
+_SEPARATORS = re.compile(r"[\s_\-./]+")
+
+
+def _normalize(term: str) -> str:
+    """Case- and separator-insensitive form: 'Cyclic-Voltammetry' → 'cyclic voltammetry'."""
+    return _SEPARATORS.sub(" ", term.strip().lower()).strip()
+
+
+def _trigrams(norm: str) -> set:
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TermIndex:
+    """Trigram index over one category's allowed terms (state is plain data)."""
+
+    __slots__ = ("terms", "normalized", "sizes", "postings")
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+        self.normalized = {}
+        self.sizes = []
+        self.postings = {}
+        for i, term in enumerate(self.terms):
+            norm = _normalize(term)
+            self.normalized.setdefault(norm, i)
+            grams = _trigrams(norm)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    @classmethod
+    def from_state(cls, state: dict):
+        """Rebuild an index from __getstate__() output, e.g. parsed from JSON."""
+        index = cls.__new__(cls)
+        index.__setstate__(state)
+        return index
+
+    def suggest(self, value: str, aliases: dict = None, limit: int = MAX_SUGGESTIONS) -> list:
+        """
+        Up to *limit* allowed terms closest to *value*, best first.
+
+        Args:
+            value: the rejected value
+            aliases: deprecated → canonical map; a canonical target that is
+                an allowed term is always the first suggestion
+        """
+        ranked = []
+
+        target = (aliases or {}).get(value)
+        if target is not None:
+            i = self.normalized.get(_normalize(target))
+            if i is not None:
+                ranked.append(self.terms[i])
+
+        norm = _normalize(value)
+        exact = self.normalized.get(norm)
+        if exact is not None and self.terms[exact] not in ranked:
+            ranked.append(self.terms[exact])
+
+        grams = _trigrams(norm)
+        overlap = {}
+        for gram in grams:
+            for i in self.postings.get(gram, ()):
+                overlap[i] = overlap.get(i, 0) + 1
+        scored = sorted(
+            ((2.0 * n / (len(grams) + self.sizes[i]), i) for i, n in overlap.items()),
+            key=lambda item: (-item[0], item[1]),
+        )
+        for score, i in scored:
+            if len(ranked) >= limit or score < MIN_SIMILARITY:
+                break
+            if self.terms[i] not in ranked:
+                ranked.append(self.terms[i])
+
+        return ranked[:limit]
+
+
+def format_allowed(allowed: list, limit: int = MAX_LISTED_VALUES) -> str:
+    """Quote at most *limit* allowed values, noting how many were left out."""
+    shown = ", ".join(f"'{v}'" for v in allowed[:limit])
+    if len(allowed) > limit:
+        shown += f", … ({len(allowed) - limit} more)"
+    return shown
@@ -0,0 +1,143 @@
+"""
+ISAAC AI-Ready Record - Background Vocabulary Sync
+Keeps vocabulary_cache in step with the wiki from a daemon thread, so no
+page load or API request ever waits on wiki I/O.
+
+Every process that calls start() runs the loop, but each round first takes
+a non-blocking Postgres advisory lock and checks when the wiki was last
+synced by *any* process (portal_meta 'wiki_sync_checked_at'), so across
+all API workers and Streamlit processes at most one sync runs at a time
+and roughly once per interval.
+
+Configuration:
+    ISAAC_WIKI_SYNC_INTERVAL  seconds between syncs (default 300)
+    ISAAC_WIKI_SYNC_JITTER    +/- random seconds added to each sleep (default 30)
+    ISAAC_WIKI_SYNC_WORKER    set to 0 to disable the thread in this process
+
+Completion is signalled to in-process listeners (add_listener) and through
+the `generation` counter, so caches can refresh.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+
+import database
+
+logger = logging.getLogger("isaac-sync-worker")
+
+SYNC_INTERVAL = float(os.environ.get("ISAAC_WIKI_SYNC_INTERVAL", 300))
+SYNC_JITTER = float(os.environ.get("ISAAC_WIKI_SYNC_JITTER", 30))
+
+# pg_try_advisory_lock key: one wiki sync at a time across the cluster
+SYNC_LOCK_KEY = 0x15AAC0002
+
+_thread = None
+_thread_lock = threading.Lock()
+_stop = threading.Event()
+_listeners = []
+
+# Incremented after every successful sync completed by this process
+generation = 0
+last_result = None
+
+
+def add_listener(fn):
+    """Register fn(ok: bool, message: str), called after each sync this process runs."""
+    if fn not in _listeners:
+        _listeners.append(fn)
+
+
+def run_once(synced_by: str = "auto", min_age: float = None):
+    """
+    Sync from the wiki if no other process is syncing and the last sync
+    (by any process) is older than *min_age* seconds.
+
+    Args:
+        synced_by: recorded in vocabulary_sync_log
+        min_age: skip if the wiki was checked more recently than this;
+            defaults to SYNC_INTERVAL, pass 0 to force (admin button)
+
+    Returns:
+        (ok, message) from ontology.sync_from_wiki, or None if skipped
+        because another process holds the lock or synced recently.
+    """
+    global generation, last_result
+
+    if min_age is None:
+        min_age = SYNC_INTERVAL
+
+    conn = database.get_db_connection()
+    conn.autocommit = True
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT pg_try_advisory_lock(%s) AS locked", (SYNC_LOCK_KEY,))
+        if not cur.fetchone()["locked"]:
+            return None
+        try:
+            checked_at = float(database.get_meta("wiki_sync_checked_at", 0) or 0)
+            if time.time() - checked_at < min_age:
+                return None
+
+            import ontology  # deferred: pulls in the wiki machinery
+            ok, msg = ontology.sync_from_wiki(synced_by=synced_by)
+            database.set_meta("wiki_sync_checked_at", time.time())
+        finally:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (SYNC_LOCK_KEY,))
+    finally:
+        cur.close()
+        conn.close()
+
+    last_result = (ok, msg)
+    if ok:
+        generation += 1
+        logger.info("Wiki sync (%s): %s", synced_by, msg)
+    else:
+        logger.warning("Wiki sync (%s) failed: %s", synced_by, msg)
+    for fn in list(_listeners):
+        try:
+            fn(ok, msg)
+        except Exception as exc:
+            logger.warning("Sync listener %r failed: %s", fn, exc)
+    return ok, msg
+
+
+def _run():
+    # Spread the first round so processes started together don't collide
+    if _stop.wait(random.uniform(0, max(SYNC_JITTER, 1.0))):
+        return
+    while not _stop.is_set():
+        try:
+            run_once()
+        except Exception as exc:
+            logger.warning("Wiki sync round failed: %s", exc)
+        delay = SYNC_INTERVAL + random.uniform(-SYNC_JITTER, SYNC_JITTER)
+        if _stop.wait(max(delay, 1.0)):
+            return
+
+
+def start() -> bool:
+    """
+    Start the background sync thread in this process (idempotent).
+
+    Returns:
+        True if the worker is running.
+    """
+    global _thread
+    if os.environ.get("ISAAC_WIKI_SYNC_WORKER", "1") == "0":
+        return False
+    if not (database.is_db_configured() and os.environ.get("WIKI_REPO_URL")):
+        return False
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _stop.clear()
+            _thread = threading.Thread(target=_run, name="isaac-wiki-sync", daemon=True)
+            _thread.start()
+    return True
+
+
+def stop():
+    """Ask the worker to exit after its current round."""
+    _stop.set()
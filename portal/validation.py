@@ -19,9 +19,10 @@ Layers:
   3. Semantic     (ontology.validate_semantic_integrity — cross-field rules)
 """
 
-import json
+import hashlib
 import logging
 import sys
+import threading
 from pathlib import Path
 
 from jsonschema import Draft202012Validator
@@ -32,16 +33,20 @@ _portal_dir = Path(__file__).resolve().parent
 if str(_portal_dir) not in sys.path:
     sys.path.insert(0, str(_portal_dir))
 
+import artifact  # noqa: E402
+import metrics  # noqa: E402
 import ontology  # noqa: E402
+import suggest  # noqa: E402
 
 logger = logging.getLogger("isaac-validation")
 
 # ---------------------------------------------------------------------------
-# Schema (loaded once at import)
+# Schema and canonical-form maps come from the compiled artifact (one read,
+# shared with ontology/bootstrap; rebuilt automatically if sources change).
 # ---------------------------------------------------------------------------
-SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schema" / "isaac_record_v1.json"
-with open(SCHEMA_PATH) as f:
-    ISAAC_SCHEMA = json.load(f)
+SNAPSHOT = artifact.load()
+SCHEMA_PATH = artifact.SOURCES["schema"]
+ISAAC_SCHEMA = SNAPSHOT.schema
 ISAAC_VALIDATOR = Draft202012Validator(ISAAC_SCHEMA)
 
 # ---------------------------------------------------------------------------
@@ -49,15 +54,21 @@ ISAAC_VALIDATOR = Draft202012Validator(ISAAC_SCHEMA)
 # single source of truth. Deprecated unit spellings and product tokens are
 # REJECTED with a message naming the canonical replacement.
 # ---------------------------------------------------------------------------
-VOCAB_PATH = Path(__file__).resolve().parent.parent / "data" / "vocabulary.json"
-try:
-    with open(VOCAB_PATH) as f:
-        _VOCAB = json.load(f)
-    UNIT_ALIASES = _VOCAB.get("Units", {}).get("units.aliases", {}).get("map", {})
-    PRODUCT_ALIASES = _VOCAB.get("Descriptors", {}).get("descriptors.product_aliases", {}).get("map", {})
-except Exception as _exc:  # degrade gracefully; canonical checks become no-ops
-    logger.warning("Could not load canonical-form maps from %s: %s", VOCAB_PATH, _exc)
-    UNIT_ALIASES, PRODUCT_ALIASES = {}, {}
+VOCAB_PATH = artifact.SOURCES["vocabulary"]
+UNIT_ALIASES = SNAPSHOT.unit_aliases
+PRODUCT_ALIASES = SNAPSHOT.product_aliases
+if not (UNIT_ALIASES or PRODUCT_ALIASES):  # canonical checks become no-ops
+    logger.warning("No canonical-form maps found in %s", VOCAB_PATH)
+
+# ---------------------------------------------------------------------------
+# Rules version — stamped on every stored record (records.rules_version) so
+# the revalidation sweeper can find records judged under older rules. It
+# changes when RULES_REVISION is bumped (edit this whenever the Python rules
+# in this module or ontology.validate_* change meaning), when the schema or
+# seed vocabulary changes (artifact content hash), or when the live
+# vocabulary changes (wiki sync / approved proposal).
+# ---------------------------------------------------------------------------
+RULES_REVISION = 1
 
 PRODUCT_CLASS_PREFIXES = (
     "faradaic_efficiency.", "partial_current_density.", "production_rate.",
@@ -112,6 +123,43 @@ def _canonical_form_errors(record: dict) -> list:
     return errors
 
 
+# TermIndex per schema enum (keyed by its schema path; the schema is static)
+_enum_indexes = {}
+_enum_indexes_lock = threading.Lock()
+
+
+def _schema_error(err) -> dict:
+    """
+    One JSON Schema error as {path, message}. Enum failures get the same
+    treatment as vocabulary errors: closest allowed values as
+    'suggestions', and at most suggest.MAX_LISTED_VALUES values quoted
+    instead of jsonschema's full list.
+    """
+    path = "/".join(str(p) for p in err.absolute_path) or "(root)"
+    if err.validator != "enum" or not isinstance(err.validator_value, list):
+        return {"path": path, "message": err.message}
+
+    allowed = err.validator_value
+    suggestions = []
+    if isinstance(err.instance, str):
+        key = tuple(err.schema_path)
+        index = _enum_indexes.get(key)
+        if index is None:
+            with _enum_indexes_lock:
+                index = _enum_indexes.setdefault(
+                    key, suggest.TermIndex(v for v in allowed if isinstance(v, str)))
+        suggestions = index.suggest(err.instance, UNIT_ALIASES)
+    hint = ""
+    if suggestions:
+        hint = " Did you mean " + " or ".join(f"'{t}'" for t in suggestions) + "?"
+    return {
+        "path": path,
+        "message": (f"{err.instance!r} is not one of the allowed values.{hint} "
+                    f"Allowed ({len(allowed)}): {suggest.format_allowed(allowed)}"),
+        "suggestions": suggestions,
+    }
+
+
 class ValidationError(Exception):
     """
     Raised by the persistence chokepoint (database.save_record) when a
@@ -143,29 +191,26 @@ def validate_record_full(record: dict) -> dict:
     on internal failure, matching the API's historical behavior; the JSON
     Schema layer never degrades.
     """
-    schema_errors = [
-        {
-            "path": "/".join(str(p) for p in err.absolute_path) or "(root)",
-            "message": err.message,
-        }
-        for err in ISAAC_VALIDATOR.iter_errors(record)
-    ]
+    with metrics.VALIDATION_SECONDS.time(layer="schema"):
+        schema_errors = [_schema_error(err) for err in ISAAC_VALIDATOR.iter_errors(record)]
 
-    try:
-        vocabulary_errors = ontology.validate_record_vocabulary(record)
-    except Exception as exc:
-        logger.warning("Vocabulary validation degraded: %s", exc)
-        vocabulary_errors = []
+    with metrics.VALIDATION_SECONDS.time(layer="vocabulary"):
+        try:
+            vocabulary_errors = ontology.validate_record_vocabulary(record)
+        except Exception as exc:
+            logger.warning("Vocabulary validation degraded: %s", exc)
+            vocabulary_errors = []
 
-    # Canonical-form enforcement (Decisions A & B) — deterministic, never
-    # degrades, lives in the vocabulary layer of the response.
-    vocabulary_errors = vocabulary_errors + _canonical_form_errors(record)
+        # Canonical-form enforcement (Decisions A & B) — deterministic, never
+        # degrades, lives in the vocabulary layer of the response.
+        vocabulary_errors = vocabulary_errors + _canonical_form_errors(record)
 
-    try:
-        semantic_errors = ontology.validate_semantic_integrity(record)
-    except Exception as exc:
-        logger.warning("Semantic integrity validation degraded: %s", exc)
-        semantic_errors = []
+    with metrics.VALIDATION_SECONDS.time(layer="semantic"):
+        try:
+            semantic_errors = ontology.validate_semantic_integrity(record)
+        except Exception as exc:
+            logger.warning("Semantic integrity validation degraded: %s", exc)
+            semantic_errors = []
 
     errors = schema_errors + vocabulary_errors + semantic_errors
     return {
@@ -183,3 +228,39 @@ def validate_record_full(record: dict) -> dict:
 def format_errors_flat(result: dict) -> list:
     """Flatten a validation result into 'path: message' strings for UIs."""
     return [f"{e['path']}: {e['message']}" for e in result.get("errors", [])]
+
+
+_rules_version_cache = (None, None)
+_rules_version_lock = threading.Lock()
+
+
+def rules_version() -> str:
+    """
+    Short identifier of the rules validate_record_full() currently applies.
+
+    Cached per ontology.get_vocabulary_version(), so it costs a counter read
+    on the save path and one vocabulary hash after each vocabulary change.
+    """
+    global _rules_version_cache
+    vocab_version = ontology.get_vocabulary_version()
+    cached_for, cached = _rules_version_cache
+    if cached_for == vocab_version and cached is not None:
+        return cached
+    with _rules_version_lock:
+        import database  # deferred: database imports this module lazily too
+        vocab_hash = database.vocabulary_content_hash(ontology.load_vocabulary())
+        digest = hashlib.sha256(
+            f"{RULES_REVISION}:{SNAPSHOT.content_hash}:{vocab_hash}".encode("utf-8")
+        ).hexdigest()[:16]
+        _rules_version_cache = (vocab_version, digest)
+        return digest
+
+
+def summarize_errors(result: dict, limit: int = 5) -> dict:
+    """Compact form of a failing result for records.validation_errors."""
+    return {
+        "count": len(result.get("errors", [])),
+        "layers": [layer for layer in ("schema", "vocabulary", "semantic")
+                   if not result.get(f"{layer}_valid", True)],
+        "errors": result.get("errors", [])[:limit],
+    }
@@ -0,0 +1,166 @@
+"""
+ISAAC AI-Ready Record - Vocabulary Term Rewrite
+Impact analysis and bulk rename of a controlled term across stored records.
+
+    preview_rename()  — affected record count and sample ids, read from the
+                        vocabulary_term_usage rollup (no record scans)
+    rename_term()     — rewrites every affected record in batches on a
+                        thread pool; each record is re-saved through
+                        database.save_record(), so it is revalidated at the
+                        chokepoint and its record_terms/usage rows follow.
+
+Affected records are found through the record_terms index in record_id
+order. Progress is checkpointed in portal_meta after every batch, so an
+interrupted rename resumes where it stopped when run again with the same
+arguments.
+
+CLI: tools/rename_term.py
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+import ontology
+
+logger = logging.getLogger("isaac-vocab-rewrite")
+
+DEFAULT_BATCH_SIZE = int(os.environ.get("ISAAC_REWRITE_BATCH_SIZE", 200))
+DEFAULT_WORKERS = int(os.environ.get("ISAAC_REWRITE_WORKERS", 4))
+
+
+def _checkpoint_key(category: str, old: str, new: str) -> str:
+    """portal_meta key for a rename's checkpoint (hashed: keys are VARCHAR(100))."""
+    digest = hashlib.sha1(json.dumps([category, old, new]).encode("utf-8")).hexdigest()
+    return f"term_rename:{digest}"
+
+
+def rewrite_record(record: dict, category: str, old: str, new: str) -> tuple:
+    """
+    Replace *old* with *new* at every occurrence of *category*'s path.
+
+    Returns:
+        (rewritten copy of the record, number of values replaced)
+    """
+    rewritten = copy.deepcopy(record)
+    replaced = 0
+
+    def _walk(obj, remaining):
+        nonlocal replaced
+        if isinstance(obj, list):
+            for item in obj:
+                _walk(item, remaining)
+            return
+        if not isinstance(obj, dict) or remaining[0] not in obj:
+            return
+        key = remaining[0]
+        if len(remaining) == 1:
+            if obj[key] == old:
+                obj[key] = new
+                replaced += 1
+        else:
+            _walk(obj[key], remaining[1:])
+
+    _walk(rewritten, category.split("."))
+    return rewritten, replaced
+
+
+def preview_rename(category: str, old: str, new: str = None) -> dict:
+    """
+    Impact of renaming *old* in *category*, answered from the usage rollup.
+
+    Returns:
+        Dict with 'affected_records', 'sample_record_ids',
+        'new_in_vocabulary' (None if *new* not given) and 'resume_after'
+        (record id of an interrupted run's checkpoint, or None)
+    """
+    usage = ontology.get_vocabulary_usage(category).get(category, {})
+    row = next((t for t in usage.get("terms", []) if t["term"] == old), None)
+
+    new_in_vocab = None
+    if new is not None:
+        new_in_vocab = any(
+            new in (cats.get(category) or {}).get("values", [])
+            for cats in ontology.load_vocabulary().values()
+        )
+
+    return {
+        "category": category,
+        "old": old,
+        "new": new,
+        "affected_records": row["record_count"] if row else 0,
+        "sample_record_ids": row["sample_record_ids"] if row else [],
+        "new_in_vocabulary": new_in_vocab,
+        "resume_after": (database.get_meta(_checkpoint_key(category, old, new)) or None)
+        if new is not None else None,
+    }
+
+
+def _rewrite_one(record_id: str, category: str, old: str, new: str) -> tuple:
+    """Rewrite and re-save one record. Returns (record_id, status, detail)."""
+    record = database.get_record(record_id)
+    if record is None:
+        return record_id, "missing", None
+    rewritten, replaced = rewrite_record(record, category, old, new)
+    if not replaced:
+        return record_id, "unchanged", None
+    try:
+        database.save_record(rewritten)
+    except Exception as exc:
+        import validation  # deferred: only needed to recognise the error type
+        if isinstance(exc, validation.ValidationError):
+            detail = "; ".join(e.get("message", "") for e in exc.result.get("errors", [])[:3])
+            return record_id, "invalid", detail
+        return record_id, "error", str(exc)
+    return record_id, "rewritten", replaced
+
+
+def rename_term(category: str, old: str, new: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                workers: int = DEFAULT_WORKERS, restart: bool = False, progress=None) -> dict:
+    """
+    Rename *old* to *new* in *category* across all stored records.
+
+    Args:
+        category: vocabulary category key, e.g. "links.basis"
+        old, new: the term to replace and its replacement
+        batch_size: record ids fetched (and checkpointed) per batch
+        workers: records rewritten concurrently within a batch
+        restart: ignore any checkpoint and start from the first record
+        progress: optional callback(summary dict) after each batch
+
+    Returns:
+        Summary dict with counts per outcome ('rewritten', 'unchanged',
+        'missing', 'invalid', 'error') and 'failures' [(record_id, status,
+        detail)]. Records that fail validation keep the old term.
+    """
+    key = _checkpoint_key(category, old, new)
+    after = "" if restart else (database.get_meta(key) or "")
+
+    summary = {"rewritten": 0, "unchanged": 0, "missing": 0, "invalid": 0, "error": 0,
+               "failures": [], "resumed_after": after or None}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="isaac-rewrite") as pool:
+        while True:
+            ids = database.list_record_ids_with_term(category, old, after=after, limit=batch_size)
+            if not ids:
+                break
+            for record_id, status, detail in pool.map(
+                    lambda rid: _rewrite_one(rid, category, old, new), ids):
+                summary[status] += 1
+                if status in ("invalid", "error"):
+                    summary["failures"].append((record_id, status, detail))
+            after = ids[-1]
+            database.set_meta(key, after)
+            if progress:
+                progress(summary)
+
+    # Finished: a later run starts from the beginning (and only finds
+    # records that failed this time)
+    database.set_meta(key, "")
+    logger.info("Renamed %s '%s' -> '%s': %s", category, old, new,
+                {k: v for k, v in summary.items() if k != "failures"})
+    return summary
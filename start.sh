@@ -15,6 +15,9 @@
 
 set -e
 
+echo "Bootstrapping database schema and vocabulary..."
+python portal/bootstrap.py || echo "Bootstrap failed; workers will retry on startup."
+
 echo "Starting ISAAC Portal API on port ${PORT:-8502}..."
 gunicorn -b 0.0.0.0:${PORT:-8502} portal.api:app --access-logfile - --error-logfile - &
 API_PID=$!
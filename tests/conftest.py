@@ -0,0 +1,97 @@
+"""
+Shared pytest setup. Portal and tools modules are flat imports
+(``import database``), so portal/ and tools/ go on sys.path. Database
+tests need PG* pointing at a disposable Postgres and are skipped otherwise.
+"""
+
+import copy
+import glob
+import json
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "portal"))
+sys.path.insert(0, str(ROOT / "tools"))
+
+TEST_PREFIX = "00TEST"
+
+
+@pytest.fixture(scope="session")
+def db():
+    import database
+    if not database.is_db_configured():
+        pytest.skip("PGHOST not set; database tests need a disposable Postgres")
+    import bootstrap
+    assert bootstrap.ensure_ready(), "bootstrap failed"
+    return database
+
+
+@pytest.fixture
+def populated_db(db):
+    """Save copies of the valid example records under TEST_PREFIX ids; delete them afterwards."""
+    import validation
+    saved = []
+    for i, path in enumerate(sorted(glob.glob(str(ROOT / "examples" / "*.json")))):
+        with open(path) as f:
+            record = json.load(f)
+        if not (isinstance(record, dict) and validation.validate_record_full(record)["valid"]):
+            continue
+        record = copy.deepcopy(record)
+        record["record_id"] = f"{TEST_PREFIX}{i:020d}"
+        saved.append(db.save_record(record))
+    assert saved, "no valid example records to save"
+    yield saved
+    for record_id in saved:
+        db.delete_record(record_id)
+
+
+@pytest.fixture
+def saved_record(db):
+    """save(record) -> id: saves an example-based record under a TEST_PREFIX id, deleted afterwards."""
+    saved = []
+
+    def save(record):
+        record = copy.deepcopy(record)
+        record["record_id"] = f"{TEST_PREFIX}{len(saved):019d}X"
+        saved.append(db.save_record(record))
+        return saved[-1]
+
+    yield save
+    for record_id in saved:
+        db.delete_record(record_id)
+
+
+@pytest.fixture
+def llm_stub(monkeypatch):
+    """tools/llm_stub_server.py on an ephemeral port; returns its handler class (.requests, .token_delay)."""
+    import agent
+    import llm_stub_server
+    import ontology
+
+    class Handler(llm_stub_server.StubHandler):
+        requests = 0
+
+        def do_POST(self):
+            type(self).requests += 1
+            super().do_POST()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    Handler.url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    monkeypatch.setattr(agent, "LLM_API_URL", Handler.url)
+    monkeypatch.setattr(ontology, "LLM_API_URL", Handler.url)
+    monkeypatch.setenv("ISAAC_LLM_API_KEY", "stub")
+    yield Handler
+    server.shutdown()
+    server.server_close()
+
+
+def load_example(name: str) -> dict:
+    with open(ROOT / "examples" / name) as f:
+        return json.load(f)
@@ -0,0 +1,42 @@
+"""nano ISAAC history budgeting (_fit_history), no LLM or database."""
+
+import agent
+
+SYSTEM = {"role": "system", "content": "system prompt"}
+
+
+def _turn(n, rows=400):
+    return [
+        {"role": "user", "content": f"question {n}"},
+        {"role": "assistant", "content": f"```sql\nSELECT {n}\n```"},
+        {"role": "user", "content": f"Query:\nSELECT {n}\n\nResults ({rows} rows)\n" + "row\n" * rows},
+        {"role": "assistant", "content": f"answer {n}"},
+    ]
+
+
+def _questions(messages):
+    return [m["content"] for m in messages if m["role"] == "user" and not agent._is_result(m)]
+
+
+def test_summaries_still_count_as_results():
+    summary = agent._summarize_results(_turn(1)[2]["content"])
+    assert agent._is_result({"role": "user", "content": summary})
+
+
+def test_old_results_are_summarised_before_turns_are_dropped():
+    messages = [SYSTEM, *_turn(1), *_turn(2), {"role": "user", "content": "question 3"}]
+    fitted = agent._fit_history(messages, budget=agent._estimate_tokens(messages) - 100)
+
+    assert _questions(fitted) == ["question 1", "question 2", "question 3"]
+    assert fitted[3]["content"].startswith(agent._SUMMARY_MARK)
+
+
+def test_dropping_a_summarised_turn_drops_its_results():
+    messages = [SYSTEM, *_turn(1), *_turn(2), {"role": "user", "content": "question 3"}]
+    # Room for one summarised turn plus the current question, not two
+    fitted = agent._fit_history(messages, budget=60)
+
+    assert fitted[0] is SYSTEM
+    assert fitted[1] == {"role": "user", "content": "question 2"}
+    assert _questions(fitted) == ["question 2", "question 3"]
+    assert not any(m["content"] == "answer 1" for m in fitted)
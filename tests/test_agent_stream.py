@@ -0,0 +1,98 @@
+"""nano ISAAC streaming: fence scanning and block dispatch against the stub LLM."""
+
+import threading
+
+import pytest
+
+import agent
+import agent_tools
+import query_cache
+
+SYSTEM = {"role": "system", "content": "You are nano ISAAC."}
+REPLY = ("Let me check.\n\n```sql\nSELECT record_type, COUNT(*) FROM records GROUP BY 1\n```\n\n"
+         "Then:\n```tool\n{\"tool\": \"facet_counts\", \"args\": {\"facet\": \"record_domain\"}}\n```\n")
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(REPLY)])
+def test_fence_scanner_handles_any_chunking(size):
+    scanner = agent._FenceScanner()
+    found = []
+    for i in range(0, len(REPLY), size):
+        found += scanner.feed(REPLY[i:i + size])
+    assert found == [
+        ("sql", "SELECT record_type, COUNT(*) FROM records GROUP BY 1"),
+        ("tool", '{"tool": "facet_counts", "args": {"facet": "record_domain"}}'),
+    ]
+
+
+def test_block_emitted_when_closing_fence_arrives():
+    scanner = agent._FenceScanner()
+    assert scanner.feed("```sql\nSELECT 1\n`") == []
+    assert scanner.feed("``") == [("sql", "SELECT 1")]
+    assert scanner.feed(" more text") == []
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """Stub query_cache.execute and agent_tools.run; record when each block starts."""
+    calls = []
+
+    def execute(sql, timeout_ms=None):
+        calls.append(("sql", sql, threading.current_thread().name))
+        return [{"record_type": "evidence", "n": 3}]
+
+    def run(name, args):
+        calls.append(("tool", name, threading.current_thread().name))
+        return [{"value": "performance", "count": 3}]
+
+    monkeypatch.setattr(query_cache, "execute", execute)
+    monkeypatch.setattr(agent_tools, "run", run)
+    monkeypatch.setattr(agent, "_relevant_vocabulary", lambda question: "")
+    return calls
+
+
+def _events(question):
+    history = [SYSTEM, {"role": "user", "content": question}]
+    return list(agent.run_agent_turn_stream(history))
+
+
+def test_stream_event_order(llm_stub, fake_backend):
+    events = _events("give me an overview")
+    kinds = [e["type"] for e in events]
+
+    assert kinds[0] == "round" and kinds[-1] == "done"
+    first_results = kinds.index("results")
+    assert kinds.index("query") < kinds.index("tool") < first_results
+    assert kinds[first_results + 1] == "round"
+    assert [c[0] for c in fake_backend] == ["sql", "tool"]
+    assert all(c[2].startswith("isaac-agent-sql") for c in fake_backend)
+
+    results = events[first_results]
+    assert results["count"] == 2
+    assert [b["kind"] for b in results["blocks"]] == ["sql", "tool"]
+    assert not any(b["error"] for b in results["blocks"])
+
+    done = events[-1]
+    assert done["reply"] == "Stub summary of 2 query result block(s)."
+    assert done["messages"][-2]["content"].startswith("Query:\nSELECT record_type")
+
+
+def test_block_starts_before_reply_finishes(llm_stub, fake_backend, monkeypatch):
+    llm_stub.token_delay = 0.02
+    started = threading.Event()
+    execute = query_cache.execute
+
+    def timed_execute(sql, timeout_ms=None):
+        started.set()
+        return execute(sql, timeout_ms)
+
+    monkeypatch.setattr(query_cache, "execute", timed_execute)
+
+    tokens_after_start = 0
+    for event in agent.run_agent_turn_stream([SYSTEM, {"role": "user", "content": "overview"}]):
+        if event["type"] == "results":
+            break
+        if event["type"] == "token" and started.is_set():
+            tokens_after_start += 1
+    # The ```tool block was still streaming in while the SQL ran
+    assert tokens_after_start > 0
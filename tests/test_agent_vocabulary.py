@@ -0,0 +1,41 @@
+"""nano ISAAC vocabulary prompt: cached per vocabulary version."""
+
+import agent
+import ontology
+
+VOCAB = {"System": {"system.technique": {"description": "Technique. Long text.",
+                                         "values": ["cyclic_voltammetry", "xrd"]}}}
+
+
+def test_prompt_parts_cached_per_vocabulary_version(monkeypatch):
+    loads = []
+
+    def load_vocabulary():
+        # Listener disconnected: every call returns a fresh dict
+        loads.append(1)
+        return {k: dict(v) for k, v in VOCAB.items()}
+
+    version = [1000]
+    monkeypatch.setattr(ontology, "load_vocabulary", load_vocabulary)
+    monkeypatch.setattr(ontology, "get_vocabulary_version", lambda: version[0])
+    monkeypatch.setattr(agent, "_vocab_prompt_cache", (None, None, {}, {}))
+
+    block = agent._build_vocabulary_block()
+    assert "system.technique" in block
+    assert "cyclic_voltammetry" in agent._relevant_vocabulary("any cyclic voltammetry data?")
+    assert len(loads) == 1
+
+    version[0] += 1
+    agent._build_vocabulary_block()
+    assert len(loads) == 2
+
+
+def test_unavailable_vocabulary_is_not_cached(monkeypatch):
+    vocab = {}
+    monkeypatch.setattr(ontology, "load_vocabulary", lambda: vocab)
+    monkeypatch.setattr(ontology, "get_vocabulary_version", lambda: 2000)
+    monkeypatch.setattr(agent, "_vocab_prompt_cache", (None, None, {}, {}))
+
+    assert "not available" in agent._build_vocabulary_block()
+    vocab.update(VOCAB)
+    assert "system.technique" in agent._build_vocabulary_block()
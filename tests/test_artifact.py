@@ -0,0 +1,39 @@
+"""Compiled artifact: plain-data round trip and missing/broken sources."""
+
+import logging
+
+import pytest
+
+import artifact
+
+
+def test_round_trip_is_plain_json(tmp_path):
+    fresh = artifact.build()
+    path = artifact.write(fresh, tmp_path / "snapshot.json")
+    assert path.read_bytes().startswith(b"{")
+
+    loaded = artifact._read(path)
+    assert loaded.content_hash == fresh.content_hash
+    assert loaded.fingerprint == fresh.fingerprint
+    assert loaded.schema == fresh.schema
+    for (key, parts, allowed, allowed_set, index), expected in zip(
+            loaded.vocabulary_lookups, fresh.vocabulary_lookups):
+        assert (key, parts, allowed, allowed_set) == expected[:4]
+        assert index.suggest(allowed[0].upper()) == expected[4].suggest(allowed[0].upper())
+
+
+def test_missing_schema_refuses_to_build(tmp_path, monkeypatch):
+    monkeypatch.setitem(artifact.SOURCES, "schema", tmp_path / "absent.json")
+    with pytest.raises(FileNotFoundError):
+        artifact.build()
+
+
+def test_malformed_vocabulary_degrades(tmp_path, monkeypatch, caplog):
+    broken = tmp_path / "vocabulary.json"
+    broken.write_text("{not json")
+    monkeypatch.setitem(artifact.SOURCES, "vocabulary", broken)
+    with caplog.at_level(logging.WARNING, logger="isaac-artifact"):
+        snapshot = artifact.build()
+    assert snapshot.vocabulary == {} and snapshot.unit_aliases == {}
+    assert snapshot.schema
+    assert "Could not parse" in caplog.text
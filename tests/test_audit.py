@@ -0,0 +1,49 @@
+"""AuditBuffer retry behaviour (writer faked, no database)."""
+
+import psycopg2
+
+from audit import AuditBuffer
+
+
+class Writer:
+    """Rejects any batch containing "bad"; fails everything while `down`."""
+
+    def __init__(self):
+        self.rows = []
+        self.down = False
+
+    def __call__(self, batch):
+        if self.down:
+            raise psycopg2.OperationalError("connection refused")
+        if "bad" in batch:
+            raise psycopg2.errors.StringDataRightTruncation("value too long")
+        self.rows.extend(batch)
+
+
+def test_rejected_event_does_not_block_the_batch():
+    writer = Writer()
+    buf = AuditBuffer("test", writer, batch_size=3)
+    for event in ["a", "bad", "b", "c"]:
+        buf._events.append(event)
+
+    assert buf.flush() == 3
+    assert writer.rows == ["a", "b", "c"]
+    assert (buf.rejected, len(buf)) == (1, 0)
+
+    buf._events.append("d")
+    assert buf.flush() == 1
+
+
+def test_connection_error_keeps_the_batch_for_retry():
+    writer = Writer()
+    writer.down = True
+    buf = AuditBuffer("test", writer, batch_size=2)
+    for event in ["a", "b", "c"]:
+        buf._events.append(event)
+
+    assert buf.flush() == 0
+    assert list(buf._events) == ["a", "b", "c"]
+
+    writer.down = False
+    assert buf.flush() == 3
+    assert buf.rejected == 0
@@ -0,0 +1,71 @@
+"""bootstrap() ordering of DDL, one-time backfills and the schema version (database faked)."""
+
+import pytest
+
+import bootstrap
+import database
+
+
+class FakeLockCursor:
+    def execute(self, *args):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeLockConnection:
+    autocommit = False
+
+    def cursor(self):
+        return FakeLockCursor()
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def meta(monkeypatch):
+    store = {"vocabulary_file_hash": bootstrap._vocabulary_file_hash()}
+    monkeypatch.setattr(database, "is_db_configured", lambda: True)
+    monkeypatch.setattr(database, "get_db_connection", FakeLockConnection)
+    monkeypatch.setattr(database, "get_meta_many", lambda keys: {k: store[k] for k in keys if k in store})
+    monkeypatch.setattr(database, "get_meta", lambda key, default=None: store.get(key, default))
+    monkeypatch.setattr(database, "set_meta", lambda key, value: store.__setitem__(key, str(value)))
+    monkeypatch.setattr(database, "init_tables", lambda: True)
+    for _, _, rebuild, count_key in bootstrap.BACKFILLS:
+        monkeypatch.setattr(database, rebuild, lambda count_key=count_key: {count_key: 3})
+    return store
+
+
+def test_failed_backfill_leaves_schema_version_unset(meta, monkeypatch):
+    def broken():
+        raise RuntimeError("boom")
+    monkeypatch.setattr(database, "rebuild_record_descriptors", broken)
+
+    with pytest.raises(RuntimeError):
+        bootstrap.bootstrap()
+
+    assert "schema_version" not in meta
+    assert meta["term_usage_built"] == "3"
+    assert "record_descriptors_built" not in meta
+
+
+def test_missing_backfill_runs_when_schema_is_current(meta):
+    meta["schema_version"] = str(database.SCHEMA_VERSION)
+    meta["term_usage_built"] = "3"
+
+    result = bootstrap.bootstrap()
+
+    assert result["schema"] == "current"
+    assert result["backfilled"] == ["record_descriptors_built", "descriptor_usage_built",
+                                    "rollups_built"]
+    assert meta["rollups_built"] == "3"
+
+
+def test_nothing_pending_is_a_no_op(meta):
+    meta["schema_version"] = str(database.SCHEMA_VERSION)
+    for flag, _, _, _ in bootstrap.BACKFILLS:
+        meta[flag] = "3"
+
+    assert bootstrap.bootstrap() == {"schema": "current", "vocabulary": "current"}
@@ -0,0 +1,99 @@
+"""Proposal draft worker against the stub LLM: background drafts and the draft_key cache."""
+
+import threading
+from collections import OrderedDict
+
+import pytest
+
+import database
+import drafts
+import ontology
+
+PAGE = ("page-sha-1", "# System\n\n*   `xrd`: X-ray diffraction.\n")
+
+
+def _proposal(pid, term="00test_probe_technique"):
+    return {"id": pid, "proposal_type": "add_term", "section": "System",
+            "category": "system.technique", "term": term,
+            "description": "Probe technique for tests"}
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(drafts, "_cache", OrderedDict())
+    monkeypatch.setattr(ontology, "get_wiki_page", lambda section: PAGE)
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    """Capture save_proposal_draft() calls instead of writing to the database."""
+    saved = {}
+    done = threading.Condition()
+
+    def save(proposal_id, key, result):
+        with done:
+            saved[proposal_id] = (key, result)
+            done.notify_all()
+
+    def wait_for(proposal_id):
+        with done:
+            assert done.wait_for(lambda: proposal_id in saved, timeout=10)
+        return saved[proposal_id]
+
+    monkeypatch.setattr(database, "is_db_configured", lambda: False)
+    monkeypatch.setattr(database, "mark_proposal_drafting", lambda proposal_id: None)
+    monkeypatch.setattr(database, "save_proposal_draft", save)
+    return wait_for
+
+
+def test_submit_drafts_in_background_and_reuses_identical_draft(llm_stub, fresh_cache, stored):
+    assert drafts.submit(_proposal(-1))
+    key, result = stored(-1)
+    assert result["success"]
+    assert "`00test_probe_technique`" in result["wiki_prose"]
+    assert llm_stub.requests == 1
+
+    # Same section/category/term/description against the same page: cache hit
+    assert drafts.submit(_proposal(-2))
+    key2, result2 = stored(-2)
+    assert key2 == key
+    assert result2["wiki_prose"] == result["wiki_prose"]
+    assert llm_stub.requests == 1
+
+    # Regenerate bypasses the cache
+    assert drafts.submit(_proposal(-3), force=True)
+    stored(-3)
+    assert llm_stub.requests == 2
+
+
+def test_changed_wiki_page_changes_the_key():
+    proposal = _proposal(-1)
+    assert drafts.draft_key(proposal, "sha-a") != drafts.draft_key(proposal, "sha-b")
+    assert drafts.draft_key(proposal, "sha-a") == drafts.draft_key(dict(proposal, id=-9), "sha-a")
+
+
+def test_stored_draft_is_shared_across_processes(db, llm_stub, fresh_cache):
+    ids = [db.create_proposal("add_term", "System", "system.technique",
+                              "00test_probe_technique", "Probe technique for tests",
+                              proposed_by="00TEST")
+           for _ in range(2)]
+    try:
+        key, result = drafts.generate(_proposal(ids[0]))
+        db.save_proposal_draft(ids[0], key, result)
+        assert db.find_proposal_draft(key) == {"yaml_description": result["yaml_description"],
+                                               "wiki_prose": result["wiki_prose"]}
+
+        # Another process: empty LRU, the stored draft is found by key
+        drafts._cache.clear()
+        key2, result2 = drafts.generate(_proposal(ids[1]))
+        assert key2 == key and result2["wiki_prose"] == result["wiki_prose"]
+        assert llm_stub.requests == 1
+    finally:
+        conn = db.get_db_connection()
+        cur = conn.cursor()
+        try:
+            cur.execute("DELETE FROM vocabulary_proposals WHERE id = ANY(%s)", (ids,))
+            conn.commit()
+        finally:
+            cur.close()
+            conn.close()
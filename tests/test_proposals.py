@@ -0,0 +1,36 @@
+"""Applying approved proposals to the vocabulary (no database or wiki)."""
+
+import ontology
+
+
+def _vocab():
+    return {"System": {"system.technique": {"description": "Technique.", "values": ["xrd"]}}}
+
+
+def test_reviewed_yaml_description_updates_category():
+    vocab = _vocab()
+    ok, _ = ontology._apply_proposal_to_vocab(vocab, {
+        "proposal_type": "add_term", "section": "System", "category": "system.technique",
+        "term": "probe", "_yaml_description": "Technique, including probes.",
+    })
+    assert ok
+    assert vocab["System"]["system.technique"] == {
+        "description": "Technique, including probes.", "values": ["xrd", "probe"]}
+
+
+def test_new_category_prefers_reviewed_description():
+    vocab = _vocab()
+    ontology._apply_proposal_to_vocab(vocab, {
+        "proposal_type": "add_category", "section": "System", "category": "system.probe",
+        "description": "what the proposer typed", "_yaml_description": "Probe configuration.",
+    })
+    assert vocab["System"]["system.probe"]["description"] == "Probe configuration."
+
+
+def test_without_draft_description_is_unchanged():
+    vocab = _vocab()
+    ontology._apply_proposal_to_vocab(vocab, {
+        "proposal_type": "add_term", "section": "System", "category": "system.technique",
+        "term": "probe",
+    })
+    assert vocab["System"]["system.technique"]["description"] == "Technique."
@@ -0,0 +1,25 @@
+"""Agent query cache: which statements may be served from memory."""
+
+import pytest
+
+from query_cache import is_cacheable, normalize_sql
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT COUNT(*) FROM records WHERE created_at > 'now'::timestamptz - interval '1 day'",
+    "SELECT * FROM records WHERE created_at::date = DATE 'Today'",
+    "SELECT record_id, AGE(created_at) FROM records",
+    "SELECT record_id FROM records WHERE age (created_at) < interval '7 days'",
+    "SELECT now()",
+])
+def test_clock_dependent_queries_bypass(sql):
+    assert not is_cacheable(normalize_sql(sql))
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT record_type, COUNT(*) FROM records GROUP BY record_type",
+    "SELECT record_id FROM records WHERE data->>'note' = 'known by now'",
+    "SELECT data->'sample'->>'age' AS age FROM records",
+])
+def test_deterministic_queries_are_cached(sql):
+    assert is_cacheable(normalize_sql(sql))
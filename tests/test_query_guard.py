@@ -0,0 +1,47 @@
+"""EXPLAIN-based query guard: row estimates under LIMIT (synthetic plans, no database)."""
+
+from database import _plan_estimate
+
+
+def _scan(rows, function="jsonb_array_elements", relationship="Inner"):
+    return {"Node Type": "Function Scan", "Function Name": function,
+            "Plan Rows": rows, "Parent Relationship": relationship}
+
+
+def _channel_names_plan(top_rows=50):
+    # SELECT ... FROM records, jsonb_array_elements(..) s, jsonb_array_elements(..) ch LIMIT 50
+    join = {
+        "Node Type": "Nested Loop", "Plan Rows": 4_900_000, "Parent Relationship": "Outer",
+        "Plans": [
+            {"Node Type": "Nested Loop", "Plan Rows": 49_000, "Parent Relationship": "Outer",
+             "Plans": [
+                 {"Node Type": "Seq Scan", "Relation Name": "records", "Plan Rows": 490,
+                  "Parent Relationship": "Outer"},
+                 _scan(100),
+             ]},
+            _scan(100),
+        ],
+    }
+    return join, {"Node Type": "Limit", "Plan Rows": top_rows, "Total Cost": 12.5, "Plans": [join]}
+
+
+def test_streaming_nodes_under_limit_are_scaled():
+    _, plan = _channel_names_plan()
+    estimate = _plan_estimate(plan)
+    assert estimate["plan_rows"] <= 100
+    assert estimate["total_cost"] == 12.5
+
+
+def test_unlimited_plan_reports_full_estimate():
+    join, _ = _channel_names_plan()
+    assert _plan_estimate(join)["plan_rows"] == 4_900_000
+
+
+def test_sort_under_limit_still_counts_its_input():
+    join, _ = _channel_names_plan()
+    sort = {"Node Type": "Sort", "Plan Rows": 4_900_000, "Parent Relationship": "Outer",
+            "Plans": [join]}
+    plan = {"Node Type": "Limit", "Plan Rows": 50, "Total Cost": 900_000.0, "Plans": [sort]}
+    estimate = _plan_estimate(plan)
+    assert estimate["plan_rows"] == 4_900_000
+    assert estimate["worst_node"] == "Nested Loop"
@@ -0,0 +1,44 @@
+"""Full-scan rebuilds of the derived record indexes on a populated database."""
+
+
+def _count(db, sql, params=()):
+    conn = db.get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(sql, params)
+        return list(cur.fetchone().values())[0]
+    finally:
+        cur.close()
+        conn.close()
+
+
+def test_rebuild_term_usage(db, populated_db):
+    before = _count(db, "SELECT COUNT(*) FROM record_terms")
+
+    counts = db.rebuild_term_usage(batch_size=2)
+
+    assert counts["records"] == _count(db, "SELECT COUNT(*) FROM records")
+    assert counts["records"] >= len(populated_db)
+    assert counts["terms"] == _count(db, "SELECT COUNT(*) FROM record_terms") == before
+    assert counts["usage"] == _count(db, "SELECT COUNT(*) FROM vocabulary_term_usage") > 0
+
+
+def test_rebuild_record_descriptors(db, populated_db):
+    before = _count(db, "SELECT COUNT(*) FROM record_descriptors")
+
+    counts = db.rebuild_record_descriptors(batch_size=2)
+
+    assert counts["records"] == _count(db, "SELECT COUNT(*) FROM records")
+    assert counts["descriptors"] == _count(db, "SELECT COUNT(*) FROM record_descriptors") == before
+    assert _count(db, "SELECT COUNT(*) FROM record_descriptors WHERE record_id = ANY(%s)",
+                  (populated_db,)) > 0
+
+
+def test_descriptor_usage_matches_a_full_recount(db, populated_db):
+    facets = {f["value"]: f["record_count"] for f in db.get_facet_counts("descriptor", limit=10000)}
+
+    counts = db.rebuild_descriptor_usage()
+
+    assert counts["names"] == _count(db, "SELECT COUNT(DISTINCT name) FROM record_descriptors")
+    assert facets == {f["value"]: f["record_count"]
+                      for f in db.get_facet_counts("descriptor", limit=10000)}
@@ -0,0 +1,22 @@
+"""Revalidation sweep writes only apply to the row version they judged."""
+
+from conftest import load_example
+
+
+def _stale_row(db, record_id):
+    rows = db.list_stale_records("00TEST-other-rules", 0, 100000)
+    return next(row for row in rows if row["record_id"] == record_id)
+
+
+def test_sweep_result_skips_records_saved_since_read(db, saved_record):
+    record_id = saved_record(load_example("co2rr_performance_record.json"))
+    read = _stale_row(db, record_id)
+
+    db.save_record(read["data"])  # re-saved between the sweep's read and write
+    verdict = (record_id, read["row_version"], "invalid", {"stale": True}, "00TEST-old-read")
+    assert db.store_validation_results([verdict]) == 0
+
+    current = _stale_row(db, record_id)
+    assert current["row_version"] != read["row_version"]
+    fresh = (record_id, current["row_version"], "valid", None, "00TEST-fresh-read")
+    assert db.store_validation_results([fresh]) == 1
@@ -0,0 +1,23 @@
+"""Overview rollups: trigger maintenance agrees with a full reconciliation."""
+
+from conftest import load_example
+
+
+def _snapshot(db):
+    return {r["key"]: (r["record_count"], r["domains"]) for r in db.get_rollups("technique", limit=500)}
+
+
+def test_reconcile_matches_trigger_maintained_rollups(db, saved_record):
+    record = load_example("co2rr_performance_record.json")
+    saved_record(record)
+    db.reconcile_rollups()
+    before = _snapshot(db)
+
+    saved_record(record)
+    after_insert = _snapshot(db)
+    result = db.reconcile_rollups()
+
+    assert result["drift"] == 0
+    assert _snapshot(db) == after_insert
+    technique = record["system"]["technique"]
+    assert after_insert[technique][0] == before[technique][0] + 1
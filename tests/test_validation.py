@@ -0,0 +1,27 @@
+"""Schema-layer enum errors: capped allowed list and suggestions."""
+
+import suggest
+import validation
+from conftest import load_example
+
+
+def test_enum_error_lists_capped_values_and_suggests():
+    record = load_example("co2rr_performance_record.json")
+    allowed = validation.ISAAC_SCHEMA["properties"]["system"]["properties"]["technique"]["enum"]
+    assert len(allowed) > suggest.MAX_LISTED_VALUES
+    misspelt = allowed[-1].upper().replace("_", "-")
+    record["system"]["technique"] = misspelt
+
+    errors = [e for e in validation.validate_record_full(record)["schema_errors"]
+              if e["path"] == "system/technique"]
+
+    assert len(errors) == 1
+    assert errors[0]["suggestions"][0] == allowed[-1]
+    assert f"Allowed ({len(allowed)})" in errors[0]["message"]
+    assert f"({len(allowed) - suggest.MAX_LISTED_VALUES} more)" in errors[0]["message"]
+    assert sum(f"'{v}'" in errors[0]["message"] for v in allowed) <= suggest.MAX_LISTED_VALUES + 1
+
+
+def test_alias_suggestion_is_the_allowed_spelling():
+    index = suggest.TermIndex(["mA/cm2", "V"])
+    assert index.suggest("milliamp", aliases={"milliamp": "MA-CM2"})[0] == "mA/cm2"
@@ -0,0 +1,114 @@
+"""Wiki mirror: GITHUB_TOKEN authenticates git without being stored."""
+
+import os
+import subprocess
+
+import pytest
+
+git = pytest.importorskip("git")
+
+import ontology
+
+TOKEN = "ghp_00TESTtoken"
+PAGE = "# System\n\n## Controlled Vocabulary\n\n```yaml\nsystem.technique:\n  values: [xrd]\n```\n"
+
+
+def test_token_sent_as_header_not_url(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", TOKEN)
+    url = "https://github.com/example/wiki.wiki.git"
+    env = ontology._wiki_git_env(url)
+    assert env["GIT_CONFIG_KEY_0"].endswith(".extraHeader")
+    assert env["GIT_CONFIG_VALUE_0"].startswith("Authorization: Basic ")
+    assert TOKEN not in env["GIT_CONFIG_VALUE_0"]
+
+
+def _git(*args):
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *map(str, args)],
+                   check=True, capture_output=True)
+
+
+def _origin(tmp_path, bare=False):
+    work = tmp_path / "origin-work"
+    _git("init", "-q", "-b", "main", work)
+    (work / "Home.md").write_text("# Home\n")
+    (work / "System.md").write_text(PAGE)
+    _git("-C", work, "add", ".")
+    _git("-C", work, "commit", "-qm", "init")
+    if not bare:
+        return work
+    origin = tmp_path / "origin.git"
+    _git("clone", "-q", "--bare", work, origin)
+    return origin
+
+
+def test_mirror_config_never_holds_token(tmp_path, monkeypatch):
+    origin = _origin(tmp_path)
+    mirror = tmp_path / "mirror"
+    monkeypatch.setattr(ontology, "WIKI_MIRROR_DIR", str(mirror))
+    monkeypatch.setattr(ontology, "_mirror_fetched_at", 0.0)
+    monkeypatch.setenv("WIKI_REPO_URL", str(origin))
+    monkeypatch.setenv("GITHUB_TOKEN", TOKEN)
+
+    with ontology._wiki_mirror() as repo:
+        assert ontology._read_wiki_blob(repo, "Home")[1] == "# Home\n"
+
+    # A mirror left behind by the old token-in-URL scheme is scrubbed
+    repo = git.Repo(str(mirror))
+    repo.remotes.origin.set_url(f"{origin}?{TOKEN}")
+    with ontology._wiki_mirror(force_fetch=True):
+        pass
+
+    with open(os.path.join(mirror, ".git", "config")) as f:
+        assert TOKEN not in f.read()
+
+
+def test_failed_fetch_keeps_mirror(tmp_path, monkeypatch):
+    origin = _origin(tmp_path)
+    mirror = tmp_path / "mirror"
+    monkeypatch.setattr(ontology, "WIKI_MIRROR_DIR", str(mirror))
+    monkeypatch.setenv("WIKI_REPO_URL", str(origin))
+    with ontology._wiki_mirror(force_fetch=True):
+        pass
+    head = git.Repo(str(mirror)).head.commit.hexsha
+
+    # Origin unreachable (network/auth): the error surfaces, the checkout stays
+    monkeypatch.setenv("WIKI_REPO_URL", str(tmp_path / "unreachable"))
+    with pytest.raises(git.GitCommandError):
+        with ontology._wiki_mirror(force_fetch=True):
+            pass
+    assert git.Repo(str(mirror)).head.commit.hexsha == head
+
+
+def test_rejected_push_is_redone_on_top_of_origin(tmp_path, monkeypatch):
+    origin = _origin(tmp_path, bare=True)
+    mirror = tmp_path / "mirror"
+    monkeypatch.setattr(ontology, "WIKI_MIRROR_DIR", str(mirror))
+    monkeypatch.setenv("WIKI_REPO_URL", str(origin))
+    monkeypatch.setenv("GITHUB_TOKEN", TOKEN)
+    monkeypatch.setitem(ontology.SECTION_TO_WIKI_PAGE, "System", "System")
+
+    # Another editor pushes between our fetch and our push
+    other = tmp_path / "other"
+    _git("clone", "-q", origin, other)
+    commit_pages = ontology._commit_wiki_pages
+    calls = []
+
+    def racing_commit(*args):
+        if not calls:
+            (other / "Home.md").write_text("# Home\n\nEdited elsewhere.\n")
+            _git("-C", other, "commit", "-qam", "concurrent edit")
+            _git("-C", other, "push", "-q", "origin", "main")
+        calls.append(1)
+        return commit_pages(*args)
+
+    monkeypatch.setattr(ontology, "_commit_wiki_pages", racing_commit)
+    vocab = {"system.technique": {"values": ["xrd", "probe"]}}
+    results = ontology.push_changes_to_wiki({
+        "System": (vocab, [("*   `probe`: Probe technique.", "system.technique", "add_term")]),
+    })
+
+    assert results == {"System": (True, "Pushed vocabulary update for System to wiki")}
+    assert len(calls) == 2
+    pushed = git.Repo(str(origin)).head.commit
+    assert "probe" in (pushed.tree / "System.md").data_stream.read().decode()
+    assert "Edited elsewhere" in (pushed.tree / "Home.md").data_stream.read().decode()
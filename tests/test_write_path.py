@@ -0,0 +1,50 @@
+"""save_record() must accept every valid record, whatever the derived indexes make of it."""
+
+import copy
+
+from conftest import load_example
+
+
+def _with_descriptor(**fields):
+    record = load_example("co2rr_performance_record.json")
+    descriptor = copy.deepcopy(record["descriptors"]["outputs"][0]["descriptors"][0])
+    descriptor.update(fields)
+    record["descriptors"]["outputs"][0]["descriptors"].append(descriptor)
+    return record
+
+
+def test_extreme_descriptor_values_are_saved(db, saved_record):
+    saved_record(_with_descriptor(name="rollup_overflow_probe", value=1e200))
+    saved_record(_with_descriptor(name="rollup_underflow_probe", value=1e-200))
+
+    material = db.get_rollups("material", limit=500, descriptors=100)
+    names = {d["descriptor"] for row in material for d in row["descriptors"]}
+    assert "rollup_underflow_probe" in names
+    assert "rollup_overflow_probe" not in names
+
+
+def test_long_descriptor_unit_is_saved(db, saved_record):
+    unit = "mA/cm2 " * 30
+    record_id = saved_record(_with_descriptor(name="long_unit_probe", unit=unit))
+
+    stats = db.get_descriptor_stats("long_unit_probe")
+    assert [row["unit"] for row in stats] == [unit]
+    assert db.search_records({"descriptor": "long_unit_probe"}, limit=5)[0]["record_id"] == record_id
+
+
+def test_descriptor_facet_counts_follow_saves_and_deletes(db, saved_record):
+    def count():
+        facets = db.get_facet_counts("descriptor", limit=10000)
+        return next((f["record_count"] for f in facets if f["value"] == "usage_probe"), 0)
+
+    before = count()
+    record = _with_descriptor(name="usage_probe", value=1.0)
+    record_id = saved_record(record)
+    assert count() == before + 1
+
+    record["record_id"] = record_id
+    db.save_record(record)  # re-save: still one record
+    assert count() == before + 1
+
+    db.delete_record(record_id)
+    assert count() == before
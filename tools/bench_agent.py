@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency benchmark for nano ISAAC, runnable offline.
+
+Runs a fixed question set through agent.run_agent_turn_stream() against the
+Postgres configured by PG* (bootstrapped if needed) and reports, per
+question and round: time to first token, LLM wait, blocking SQL/tool wait,
+per-block execution time, rows returned and truncation events, plus total
+turn latency.
+
+LLM sources:
+    --llm stub    (default) tools/llm_stub_server.py started in-process on a
+                  free port: scripted ```sql / ```tool replies streamed over
+                  real HTTP/SSE; --latency / --token-delay shape it
+    --llm live    the configured gateway (ISAAC_LLM_API_URL / _KEY)
+    --replay F    replies recorded by an earlier run with --record F, played
+                  back with their original chunk timing (scaled by --speed)
+
+Synthetic corpus: --seed N saves N records cloned from the valid examples/
+records (new ids prefixed BENCH_PREFIX, varied material names) through
+database.save_record(); seeding is idempotent and --cleanup deletes them.
+Never point this at a production database.
+
+Usage:
+    PGHOST=localhost python tools/bench_agent.py --seed 500
+    python tools/bench_agent.py --llm live --record replies.jsonl
+    python tools/bench_agent.py --replay replies.jsonl --speed 0
+    python tools/bench_agent.py --repeat 3 --json bench.json --max-turn-seconds 5
+
+Exits 1 if the median turn exceeds --max-turn-seconds or any query / tool
+block errors (--max-errors, default 0), so CI catches rejected queries.
+"""
+
+import argparse
+import copy
+import glob
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_root / "portal"))
+sys.path.insert(0, str(_root / "tools"))
+
+import agent  # noqa: E402
+import bootstrap  # noqa: E402
+import database  # noqa: E402
+import query_cache  # noqa: E402
+
+BENCH_PREFIX = "00BENCH"
+
+QUESTIONS = [
+    "Give me an overview of the database.",
+    "How many records are there of each type?",
+    "Which techniques are used most?",
+    "What materials have been measured?",
+    "What faradaic efficiencies have been reported?",
+    "Which measurement channel names appear?",
+    "List the most recent records.",
+]
+
+MATERIALS = ["Cu nanoparticles on GDE", "Cu(100)", "Cu2O film", "Ag foil", "Au/C",
+             "CuO nanowires", "Sn-doped Cu", "IrO2", "Pt(111)", "Ni-N-C"]
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def _bench_id(i: int) -> str:
+    digits = []
+    for _ in range(26 - len(BENCH_PREFIX)):
+        i, r = divmod(i, 32)
+        digits.append(_CROCKFORD[r])
+    return BENCH_PREFIX + "".join(reversed(digits))
+
+
+def _templates() -> list:
+    import validation  # deferred: needs the bootstrapped vocabulary
+    templates = []
+    for path in sorted(glob.glob(str(_root / "examples" / "*.json"))):
+        with open(path) as f:
+            record = json.load(f)
+        if isinstance(record, dict) and validation.validate_record_full(record)["valid"]:
+            templates.append(record)
+    return templates
+
+
+def _bench_ids() -> list:
+    conn = database.get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT rtrim(record_id) AS record_id FROM records WHERE record_id LIKE %s",
+                    (BENCH_PREFIX + "%",))
+        return [row["record_id"] for row in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+
+def seed_corpus(count: int) -> int:
+    """Save synthetic records up to *count*; returns how many were added."""
+    existing = set(_bench_ids())
+    templates = _templates()
+    if not templates:
+        raise RuntimeError("No valid example records to clone")
+
+    added = 0
+    for i in range(count):
+        record_id = _bench_id(i)
+        if record_id in existing:
+            continue
+        record = copy.deepcopy(templates[i % len(templates)])
+        record["record_id"] = record_id
+        material = (record.get("sample") or {}).get("material")
+        if isinstance(material, dict):
+            material["name"] = MATERIALS[i % len(MATERIALS)]
+        database.save_record(record)
+        added += 1
+    return added
+
+
+def cleanup_corpus() -> int:
+    ids = _bench_ids()
+    for record_id in ids:
+        database.delete_record(record_id)
+    return len(ids)
+
+
+# =============================================================================
+# LLM sources
+# =============================================================================
+
+def _turn_position(messages: list) -> tuple:
+    """(question, round index) for the request about to be sent."""
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i]["role"] == "user" and not agent._is_result(messages[i]):
+            rounds = sum(1 for m in messages[i + 1:] if m["role"] == "assistant")
+            return messages[i]["content"], rounds
+    return "", 0
+
+
+def start_stub(latency: float, token_delay: float) -> str:
+    import llm_stub_server
+    llm_stub_server.StubHandler.latency = latency
+    llm_stub_server.StubHandler.token_delay = token_delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), llm_stub_server.StubHandler)
+    threading.Thread(target=server.serve_forever, name="bench-llm-stub", daemon=True).start()
+    os.environ.setdefault("ISAAC_LLM_API_KEY", "stub")
+    return f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+
+
+def install_recorder(path: str):
+    """Wrap agent._stream_llm so every reply is appended to *path* as JSONL."""
+    inner = agent._stream_llm
+    lock = threading.Lock()
+
+    def recording(messages):
+        question, round_index = _turn_position(messages)
+        chunks = []
+        last = time.perf_counter()
+        for delta in inner(messages):
+            now = time.perf_counter()
+            chunks.append([round(now - last, 4), delta])
+            last = now
+            yield delta
+        with lock, open(path, "a") as f:
+            f.write(json.dumps({"question": question, "round": round_index, "chunks": chunks}) + "\n")
+
+    agent._stream_llm = recording
+
+
+def install_replay(path: str, speed: float):
+    """Replace agent._stream_llm with replies recorded by install_recorder()."""
+    replies = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                replies[(entry["question"], entry["round"])] = entry["chunks"]
+
+    def replaying(messages):
+        key = _turn_position(messages)
+        if key not in replies:
+            raise RuntimeError(f"No recorded reply for question {key[0]!r} round {key[1]}")
+        for delay, delta in replies[key]:
+            if speed:
+                time.sleep(delay * speed)
+            yield delta
+
+    agent._stream_llm = replaying
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+def run_question(question: str) -> dict:
+    """One fresh conversation turn; returns its timing breakdown."""
+    messages = agent.build_initial_messages() + [{"role": "user", "content": question}]
+    rounds = []
+    current = None
+    start = time.perf_counter()
+
+    for event in agent.run_agent_turn_stream(messages):
+        now = time.perf_counter() - start
+        kind = event["type"]
+        if kind == "round":
+            current = {"started": now, "first_token": None, "last_token": now,
+                       "blocks": [], "llm_seconds": 0.0, "wait_seconds": 0.0}
+            rounds.append(current)
+        elif kind == "token":
+            if current["first_token"] is None:
+                current["first_token"] = now - current["started"]
+            current["last_token"] = now
+        elif kind == "results":
+            current["blocks"] = event["blocks"]
+            current["wait_seconds"] = now - current["last_token"]
+        elif kind == "done":
+            break
+        if current is not None:
+            current["llm_seconds"] = current["last_token"] - current["started"]
+
+    total = time.perf_counter() - start
+    return {
+        "question": question,
+        "total_seconds": total,
+        "rounds": [{
+            "first_token_seconds": r["first_token"],
+            "llm_seconds": r["llm_seconds"],
+            "wait_seconds": r["wait_seconds"],
+            "blocks": r["blocks"],
+        } for r in rounds],
+        "rows": sum(b["rows"] or 0 for r in rounds for b in r["blocks"]),
+        "truncations": sum(1 for r in rounds for b in r["blocks"] if b["truncated"]),
+        "errors": sum(1 for r in rounds for b in r["blocks"] if b["error"]),
+    }
+
+
+def _ms(seconds) -> str:
+    return "      -" if seconds is None else f"{seconds * 1000:7.1f}"
+
+
+def print_result(result: dict, label: str):
+    print(f"\n{label} {result['question']!r}: {result['total_seconds'] * 1000:.1f} ms, "
+          f"{result['rows']} rows, {result['truncations']} truncated, {result['errors']} errors")
+    for i, r in enumerate(result["rounds"]):
+        print(f"  round {i}: first token {_ms(r['first_token_seconds'])} ms  "
+              f"llm {_ms(r['llm_seconds'])} ms  blocked on queries {_ms(r['wait_seconds'])} ms")
+        for b in r["blocks"]:
+            flags = " truncated" if b["truncated"] else ""
+            flags += " ERROR" if b["error"] else ""
+            print(f"    {b['kind']:4} {_ms(b['seconds'])} ms  rows {b['rows'] if b['rows'] is not None else '-':>5}{flags}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark nano ISAAC turn latency offline")
+    parser.add_argument("--llm", choices=["stub", "live"], default="stub")
+    parser.add_argument("--replay", metavar="FILE", help="replay recorded LLM replies")
+    parser.add_argument("--record", metavar="FILE", help="append LLM replies to FILE")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="replay timing multiplier (0 = instant)")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub time to first token (s)")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="stub delay between chunks (s)")
+    parser.add_argument("--seed", type=int, default=0, metavar="N", help="ensure N synthetic records")
+    parser.add_argument("--cleanup", action="store_true", help="delete synthetic records and exit")
+    parser.add_argument("--questions", metavar="FILE", help="JSON list of questions")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per question")
+    parser.add_argument("--no-cache", action="store_true", help="disable the query result cache")
+    parser.add_argument("--json", metavar="FILE", help="write full results as JSON")
+    parser.add_argument("--max-turn-seconds", type=float,
+                        help="exit 1 if the median turn latency exceeds this")
+    parser.add_argument("--max-errors", type=int, default=0,
+                        help="exit 1 if more query/tool blocks than this fail or are "
+                             "rejected (default 0; -1 to ignore)")
+    args = parser.parse_args()
+
+    if not bootstrap.ensure_ready():
+        print("Database not configured or bootstrap failed (set PGHOST etc.)")
+        sys.exit(1)
+
+    if args.cleanup:
+        print(f"Deleted {cleanup_corpus()} synthetic records")
+        return
+    if args.seed:
+        added = seed_corpus(args.seed)
+        print(f"Synthetic corpus: {args.seed} records ({added} added)")
+
+    if args.replay:
+        install_replay(args.replay, args.speed)
+    elif args.llm == "stub":
+        agent.LLM_API_URL = start_stub(args.latency, args.token_delay)
+    if args.record:
+        install_recorder(args.record)
+    if args.no_cache:
+        query_cache.CACHE_SIZE = 0
+
+    questions = QUESTIONS
+    if args.questions:
+        with open(args.questions) as f:
+            questions = json.load(f)
+
+    results = []
+    for run in range(args.repeat):
+        for question in questions:
+            result = run_question(question)
+            result["run"] = run
+            results.append(result)
+            print_result(result, f"[run {run}]")
+
+    totals = [r["total_seconds"] for r in results]
+    median = statistics.median(totals)
+    p95 = sorted(totals)[max(0, int(round(len(totals) * 0.95)) - 1)]
+    summary = {
+        "turns": len(results),
+        "median_turn_seconds": median,
+        "p95_turn_seconds": p95,
+        "max_turn_seconds": max(totals),
+        "rows": sum(r["rows"] for r in results),
+        "truncations": sum(r["truncations"] for r in results),
+        "errors": sum(r["errors"] for r in results),
+        "query_cache": query_cache.stats(),
+    }
+    print(f"\n{summary['turns']} turns: median {median * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms, "
+          f"max {summary['max_turn_seconds'] * 1000:.1f} ms; {summary['truncations']} truncated, "
+          f"{summary['errors']} errors; query cache {summary['query_cache']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": summary, "results": results}, f, indent=2, default=str)
+
+    failed = False
+    if args.max_turn_seconds is not None and median > args.max_turn_seconds:
+        print(f"FAIL: median turn latency {median:.3f}s exceeds {args.max_turn_seconds}s")
+        failed = True
+    if args.max_errors >= 0 and summary["errors"] > args.max_errors:
+        print(f"FAIL: {summary['errors']} query/tool block error(s), allowed {args.max_errors}")
+        for r in results:
+            for b in (b for rnd in r["rounds"] for b in rnd["blocks"] if b["error"]):
+                print(f"  {r['question']!r}: {b['kind']}: {b.get('detail')}")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: time to import the API sidecar (portal/api.py) and
+the Streamlit script (portal/app.py) in a fresh interpreter, plus which
+heavy optional modules each one pulls in.
+
+Each sample is a new `python -X importtime` subprocess, so nothing is
+shared between runs except the OS file cache. Importing app.py outside
+`streamlit run` executes the script in Streamlit's bare mode (warnings
+about the missing ScriptRunContext are expected and ignored).
+
+Usage:
+    python tools/bench_startup.py                 # both targets, 5 runs each
+    python tools/bench_startup.py --runs 10 --target api
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PORTAL_DIR = Path(__file__).resolve().parent.parent / "portal"
+
+TARGETS = {
+    "api": "import api",
+    "app": "import app",
+}
+
+# Modules that should stay off the validation/CRUD cold path
+HEAVY_MODULES = ["git", "yaml", "requests", "openpyxl", "pptx", "pandas", "streamlit"]
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _sample(statement: str) -> tuple:
+    """Run one fresh interpreter; return (total_seconds, {top-level module: cumulative_us})."""
+    env = dict(os.environ)
+    env.pop("PGHOST", None)  # measure import cost, not DB round trips
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PORTAL_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if not m:
+            continue
+        cum_us, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        if indent == 1:  # top-level import statement of the target
+            total_us += cum_us
+        root = name.split(".")[0]
+        cumulative[root] = max(cumulative.get(root, 0), cum_us)
+    return total_us / 1e6, cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark portal cold-start import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", choices=sorted(TARGETS), action="append")
+    args = parser.parse_args()
+
+    for target in args.target or sorted(TARGETS):
+        totals = []
+        modules = {}
+        for _ in range(args.runs):
+            total, cumulative = _sample(TARGETS[target])
+            totals.append(total)
+            modules = cumulative
+
+        print(f"\n{target}: {TARGETS[target]!r} in portal/  ({args.runs} runs)")
+        print(f"  median {statistics.median(totals) * 1000:8.1f} ms   "
+              f"min {min(totals) * 1000:8.1f} ms   max {max(totals) * 1000:8.1f} ms")
+        print("  heavy modules loaded:")
+        for name in HEAVY_MODULES:
+            if name in modules:
+                print(f"    {name:<10s} {modules[name] / 1000:8.1f} ms")
+            else:
+                print(f"    {name:<10s}        -")
+
+
+if __name__ == "__main__":
+    main()
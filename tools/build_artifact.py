@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Compile schema/isaac_record_v1.json and data/vocabulary.json into the
+versioned artifact the portal loads at startup (see portal/artifact.py).
+
+Run after changing either source, and in the Docker image build. Processes
+also rebuild it themselves when they notice stale sources, so this is an
+optimisation, not a correctness requirement.
+
+Usage:
+    python tools/build_artifact.py            # build to build/isaac_snapshot.json
+    python tools/build_artifact.py --check    # exit 1 if the artifact is missing or stale
+    python tools/build_artifact.py --output /tmp/snapshot.json
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "portal"))
+
+import artifact  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the compiled schema/vocabulary artifact")
+    parser.add_argument("--output", type=Path, default=artifact.ARTIFACT_PATH)
+    parser.add_argument("--check", action="store_true", help="only verify the artifact is current")
+    args = parser.parse_args()
+
+    fresh = artifact.build()
+    if args.check:
+        existing = artifact._read(args.output)
+        if existing is None or existing.content_hash != fresh.content_hash:
+            print(f"{args.output}: stale or missing (sources are version {fresh.version})")
+            sys.exit(1)
+        print(f"{args.output}: current (version {fresh.version})")
+        return
+
+    path = artifact.write(fresh, args.output)
+    print(f"Wrote {path} (version {fresh.version}, "
+          f"{len(fresh.vocabulary_lookups)} vocabulary categories, "
+          f"{len(fresh.unit_aliases)} unit aliases, {len(fresh.product_aliases)} product aliases)")
+
+
+if __name__ == "__main__":
+    main()
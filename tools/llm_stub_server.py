@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI-compatible LLM gateway, for exercising the
+proposal draft worker (and anything else that posts chat completions)
+without network access or an API key quota.
+
+Wiki-draft prompts get a canned JSON draft built from the term/category in
+the prompt; nano ISAAC conversations get a scripted reply (AGENT_SCRIPT:
+```sql / ```tool blocks picked by a keyword in the question), then a
+summary once query results are fed back; any other prompt gets a
+short fixed reply. --latency simulates a slow gateway (time to first
+token); requests with "stream": true are answered as server-sent events,
+one word per chunk, --token-delay seconds apart.
+
+Usage:
+    python tools/llm_stub_server.py --port 8089 --latency 2 --token-delay 0.02
+    ISAAC_LLM_API_URL=http://127.0.0.1:8089/v1/chat/completions \
+    ISAAC_LLM_API_KEY=stub streamlit run portal/app.py
+"""
+
+import argparse
+import json
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+AGENT_SQL = "SELECT record_type, COUNT(*) AS n FROM records GROUP BY record_type"
+
+# nano ISAAC script: first keyword found in the question picks the reply
+# (one or more ```sql / ```tool blocks); otherwise AGENT_SQL
+AGENT_SCRIPT = [
+    ("technique", [("tool", '{"tool": "facet_counts", "args": {"facet": "system.technique"}}')]),
+    ("faradaic", [("tool", '{"tool": "descriptor_stats", "args": {"name": "faradaic_efficiency."}}')]),
+    ("material", [("sql", "SELECT data->'sample'->'material'->>'name' AS material, COUNT(*) AS n\n"
+                          "FROM records GROUP BY 1 ORDER BY n DESC")]),
+    ("channel", [("sql", "SELECT ch->>'name' AS channel, COUNT(*) AS n\n"
+                         "FROM records,\n"
+                         "     jsonb_array_elements(data->'measurement'->'series') AS s,\n"
+                         "     jsonb_array_elements(s->'channels') AS ch\n"
+                         "GROUP BY 1 ORDER BY n DESC")]),
+    ("list", [("sql", "SELECT record_id, record_type, record_domain, data FROM records "
+                      "ORDER BY created_at DESC")]),
+    ("overview", [("sql", AGENT_SQL),
+                  ("tool", '{"tool": "facet_counts", "args": {"facet": "record_domain"}}')]),
+]
+
+
+def _agent_reply(question: str) -> str:
+    lowered = question.lower()
+    blocks = next((b for word, b in AGENT_SCRIPT if word in lowered), [("sql", AGENT_SQL)])
+    return "Let me check the database.\n\n" + "\n\n".join(
+        f"```{kind}\n{body}\n```" for kind, body in blocks) + "\n"
+
+
+def _reply_for(prompt: str, system: str = "") -> str:
+    if "nano ISAAC" in system:
+        if prompt.startswith(("Query:", "Query error:", "Query rejected", "Tool:", "Tool error:")):
+            blocks = prompt.count("\n\n---\n\n") + 1
+            return f"Stub summary of {blocks} query result block(s)."
+        return _agent_reply(prompt)
+    if "wiki_prose" in prompt and "yaml_description" in prompt:
+        term = re.search(r"A new term `([^`]+)`", prompt)
+        category = re.search(r"(?:enum|category) `([^`]+)`", prompt)
+        if term:
+            prose = f"*   `{term.group(1)}`: Stub definition of {term.group(1)}."
+        else:
+            name = category.group(1) if category else "new_category"
+            prose = f"### `{name}`\n\nStub description of {name}."
+        return json.dumps({
+            "yaml_description": f"Stub description for {category.group(1) if category else 'category'}",
+            "wiki_prose": prose,
+        })
+    return "This is a stub LLM response."
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    token_delay = 0.0
+    model = "stub"
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_error(400, "invalid JSON")
+            return
+
+        prompt = system = ""
+        for message in body.get("messages", []):
+            if message.get("role") == "user":
+                prompt = message.get("content") or ""
+            elif message.get("role") == "system":
+                system += message.get("content") or ""
+        if self.latency:
+            time.sleep(self.latency)
+
+        reply = _reply_for(prompt, system)
+        if body.get("stream"):
+            self._stream(reply, body.get("model", self.model))
+            return
+
+        payload = json.dumps({
+            "id": "stub-completion",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", self.model),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop",
+            }],
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, reply: str, model: str):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for i, piece in enumerate(re.findall(r"\s*\S+", reply) or [reply]):
+            if i and self.token_delay:
+                time.sleep(self.token_delay)
+            chunk = {
+                "id": "stub-completion",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub OpenAI-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before replying")
+    parser.add_argument("--token-delay", type=float, default=0.0,
+                        help="seconds between streamed chunks")
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    StubHandler.token_delay = args.token_delay
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"Stub LLM listening on http://{args.host}:{args.port}/v1/chat/completions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
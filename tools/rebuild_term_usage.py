@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Rebuild the vocabulary term usage index (record_terms and
+vocabulary_term_usage) from every stored record.
+
+save_record()/delete_record() keep the index current; run this after adding
+a vocabulary category so older records are indexed for it, or to repair.
+Takes a SHARE lock on records (writes wait) for the duration.
+
+Usage:
+    PGHOST=... python tools/rebuild_term_usage.py
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "portal"))
+
+import database  # noqa: E402
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    if not database.is_db_configured():
+        print("Database not configured (set PGHOST etc.)")
+        sys.exit(1)
+    counts = database.rebuild_term_usage()
+    print(f"Indexed {counts['terms']} terms from {counts['records']} records "
+          f"({counts['usage']} distinct category/term pairs)")
+
+
+if __name__ == "__main__":
+    main()
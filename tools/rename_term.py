@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Rename a controlled vocabulary term across all stored records.
+
+Without --apply, prints the impact (affected record count and samples from
+the term usage index) and exits. With --apply, rewrites the records in
+batches through the normal validation chokepoint; an interrupted run
+resumes from its checkpoint when repeated with the same arguments.
+
+Add the new term to the vocabulary (proposal workflow) first, or the
+rewritten records will fail validation and keep the old term.
+
+Usage:
+    python tools/rename_term.py --category links.basis --from same_electrode --to same_sample_id
+    python tools/rename_term.py --category links.basis --from same_electrode --to same_sample_id \
+        --apply --batch-size 200 --workers 4
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "portal"))
+
+import database  # noqa: E402
+import vocab_rewrite  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rename a vocabulary term in stored records")
+    parser.add_argument("--category", required=True, help="vocabulary category key, e.g. links.basis")
+    parser.add_argument("--from", dest="old", required=True, help="term to replace")
+    parser.add_argument("--to", dest="new", required=True, help="replacement term")
+    parser.add_argument("--apply", action="store_true", help="rewrite records (default: preview only)")
+    parser.add_argument("--batch-size", type=int, default=vocab_rewrite.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=vocab_rewrite.DEFAULT_WORKERS)
+    parser.add_argument("--restart", action="store_true", help="ignore a previous run's checkpoint")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    if not database.is_db_configured():
+        print("Database not configured (set PGHOST etc.)")
+        sys.exit(1)
+
+    preview = vocab_rewrite.preview_rename(args.category, args.old, args.new)
+    print(f"{args.category}: '{args.old}' → '{args.new}'")
+    print(f"  affected records: {preview['affected_records']}")
+    if preview["sample_record_ids"]:
+        print(f"  e.g. {', '.join(preview['sample_record_ids'])}")
+    if not preview["new_in_vocabulary"]:
+        print(f"  WARNING: '{args.new}' is not in the {args.category} vocabulary; "
+              "rewritten records will fail validation")
+    if preview["resume_after"] and not args.restart:
+        print(f"  resuming after record {preview['resume_after']}")
+
+    if not args.apply:
+        print("Preview only — pass --apply to rewrite.")
+        return
+
+    def report(summary):
+        done = sum(summary[k] for k in ("rewritten", "unchanged", "missing", "invalid", "error"))
+        print(f"  ... {done} processed ({summary['rewritten']} rewritten, "
+              f"{summary['invalid'] + summary['error']} failed)")
+
+    summary = vocab_rewrite.rename_term(
+        args.category, args.old, args.new,
+        batch_size=args.batch_size, workers=args.workers,
+        restart=args.restart, progress=report,
+    )
+    print(f"Done: {summary['rewritten']} rewritten, {summary['unchanged']} unchanged, "
+          f"{summary['missing']} missing, {summary['invalid']} invalid, {summary['error']} errors")
+    for record_id, status, detail in summary["failures"][:20]:
+        print(f"  {record_id}: {status} — {detail}")
+    sys.exit(1 if summary["failures"] else 0)
+
+
+if __name__ == "__main__":
+    main()